@@ -43,6 +43,12 @@ def parse_args():
         metavar="PROTOCOL",
         help="通信协议：mqtt 或 websocket（默认 websocket；须写 --protocol mqtt）",
     )
+    parser.add_argument(
+        "--loop",
+        choices=["asyncio", "uvloop"],
+        default=None,
+        help="事件循环后端（CLI/TUI/GPIO 有效；默认读 SYSTEM_OPTIONS.EVENT_LOOP）",
+    )
     parser.add_argument(
         "--skip-activation",
         action="store_true",
@@ -66,7 +72,6 @@ setup_logging(
     config=load_logging_config(),
 )
 
-from src.bootstrap.container import ServiceContainer  # noqa: E402
 from src.constants.system import SystemConstants  # noqa: E402
 from src.logging import get_logger  # noqa: E402
 
@@ -119,7 +124,9 @@ async def start_app(mode: str, protocol: str, skip_activation: bool) -> int:
     else:
         logger.warning("跳过激活流程（调试模式）")
 
-    # 创建并启动应用程序
+    # 创建并启动应用程序（服务容器依赖图在激活之后才导入）
+    from src.bootstrap.container import ServiceContainer
+
     _container = ServiceContainer()
     return await _container.run(mode=mode, protocol=protocol)
 
@@ -250,6 +257,14 @@ if __name__ == "__main__":
                     pass
 
             signal.signal(signal.SIGINT, handle_sigint_cli)
+
+            from src.core.event_loop import install_loop_backend
+            from src.utils.config_manager import get_config
+
+            install_loop_backend(
+                args.loop
+                or get_config().get_config("SYSTEM_OPTIONS.EVENT_LOOP", "asyncio")
+            )
             exit_code = asyncio.run(
                 start_app(args.mode, args.protocol, args.skip_activation)
             )
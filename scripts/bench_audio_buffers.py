@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""AudioConverter 凑帧缓冲微基准：deque 逐样本 vs PcmRingBuffer.
+
+模拟输出回调：每次写入一段重采样结果（长度随采样率比抖动），
+再取出一个设备块。报告每次回调的平均耗时（µs）。
+
+用法: python scripts/bench_audio_buffers.py [--rate 44100] [--block-ms 20] [--iters 5000]
+"""
+
+import argparse
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.audio_codecs.audio_buffer import PcmRingBuffer  # noqa: E402
+
+
+def _chunks(rate: int, block: int, iters: int) -> list[np.ndarray]:
+    """生成长度在 block 附近抖动的重采样块（模拟非整除采样率比）."""
+    rng = np.random.default_rng(0)
+    sizes = block + rng.integers(-3, 4, size=iters)
+    return [rng.standard_normal(int(n)).astype(np.float32) for n in sizes]
+
+
+def bench_deque(chunks: list[np.ndarray], block: int) -> float:
+    buf: deque = deque()
+    start = time.perf_counter()
+    for chunk in chunks:
+        buf.extend(chunk)
+        if len(buf) >= block:
+            frame = [buf.popleft() for _ in range(block)]
+            np.array(frame, dtype=np.float32)
+    return time.perf_counter() - start
+
+
+def bench_ring(chunks: list[np.ndarray], block: int) -> float:
+    buf = PcmRingBuffer(block * 50)
+    start = time.perf_counter()
+    for chunk in chunks:
+        buf.write(chunk)
+        buf.read(block)
+    return time.perf_counter() - start
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="凑帧缓冲微基准")
+    parser.add_argument("--rate", type=int, default=48000, help="设备采样率")
+    parser.add_argument("--block-ms", type=int, default=20, help="回调块时长(ms)")
+    parser.add_argument("--iters", type=int, default=5000, help="回调次数")
+    args = parser.parse_args(argv)
+
+    block = args.rate * args.block_ms // 1000
+    chunks = _chunks(args.rate, block, args.iters)
+
+    t_deque = bench_deque(chunks, block)
+    t_ring = bench_ring(chunks, block)
+
+    per = 1e6 / args.iters
+    print(f"采样率 {args.rate}Hz, 块 {block} 帧, {args.iters} 次回调")
+    print(f"  deque 逐样本 : {t_deque * per:8.1f} µs/回调")
+    print(f"  PcmRingBuffer: {t_ring * per:8.1f} µs/回调")
+    print(f"  加速比       : {t_deque / t_ring:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
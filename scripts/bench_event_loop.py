@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""事件循环后端基准：启动耗时与跨线程投递延迟（asyncio vs uvloop）.
+
+每个后端在独立子进程中测量（事件循环策略为进程级全局状态）：
+- startup : 安装策略 + 创建循环 + 运行首个协程的耗时（ms）
+- dispatch: 生产线程每 20ms 经 call_soon_threadsafe 投递一帧（模拟音频回调），
+            循环内回调实际执行时刻相对投递时刻的延迟 p50/p99/max（µs）
+- lag     : 同时运行 LoopLagMonitor，报告其 p50/p99/max（ms）
+
+--busy-ms 可在循环内周期性插入同步阻塞，模拟事件循环被占用的情况。
+
+用法: python scripts/bench_event_loop.py [--backends asyncio,uvloop]
+      [--seconds 5] [--busy-ms 0]
+"""
+
+import argparse
+import multiprocessing as mp
+import sys
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+_FRAME_S = 0.02
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def _bench(backend: str, seconds: float, busy_ms: float, result_q):
+    try:
+        import asyncio
+
+        from src.core.event_loop import LoopLagMonitor, install_loop_backend
+
+        t0 = time.perf_counter()
+        actual = install_loop_backend(backend)
+
+        async def first():
+            return time.perf_counter()
+
+        startup_ms = (asyncio.run(first()) - t0) * 1000
+        if actual != backend:
+            result_q.put({"error": f"不可用（回退 {actual}）"})
+            return
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            delays = []
+            stop = threading.Event()
+
+            def on_frame(sent):
+                delays.append(time.perf_counter() - sent)
+
+            def producer():
+                while not stop.is_set():
+                    loop.call_soon_threadsafe(on_frame, time.perf_counter())
+                    time.sleep(_FRAME_S)
+
+            monitor = LoopLagMonitor(interval=0.05, report_interval=3600)
+            lag_task = asyncio.create_task(monitor.run())
+            thread = threading.Thread(target=producer, daemon=True)
+            thread.start()
+            deadline = loop.time() + seconds
+            while loop.time() < deadline:
+                await asyncio.sleep(0.1)
+                if busy_ms > 0:
+                    time.sleep(busy_ms / 1000)
+            stop.set()
+            thread.join()
+            snap = monitor.snapshot()
+            lag_task.cancel()
+            return delays, snap
+
+        delays, snap = asyncio.run(run())
+        result_q.put(
+            {
+                "startup_ms": startup_ms,
+                "frames": len(delays),
+                "p50_us": _pct(delays, 0.5) * 1e6,
+                "p99_us": _pct(delays, 0.99) * 1e6,
+                "max_us": max(delays) * 1e6,
+                "lag": snap,
+            }
+        )
+    except Exception as e:
+        result_q.put({"error": str(e)})
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="事件循环后端基准")
+    parser.add_argument("--backends", default="asyncio,uvloop", help="逗号分隔的后端")
+    parser.add_argument("--seconds", type=float, default=5.0, help="每个后端的测量时长(s)")
+    parser.add_argument(
+        "--busy-ms", type=float, default=0.0, help="每 100ms 插入的同步阻塞(ms)"
+    )
+    args = parser.parse_args(argv)
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    print(f"测量 {args.seconds:.1f}s/后端，帧间隔 {_FRAME_S * 1000:.0f}ms，阻塞 {args.busy_ms}ms")
+    print(
+        f"{'后端':<10}{'启动(ms)':>10}{'帧':>6}{'投递p50(µs)':>13}{'p99(µs)':>10}"
+        f"{'max(µs)':>10}{'lag p50/p99/max(ms)':>24}"
+    )
+    ctx = mp.get_context("spawn")
+    for backend in backends:
+        result_q = ctx.Queue()
+        proc = ctx.Process(
+            target=_bench, args=(backend, args.seconds, args.busy_ms, result_q)
+        )
+        proc.start()
+        res = result_q.get()
+        proc.join()
+        if "error" in res:
+            print(f"{backend:<10}  {res['error']}")
+            continue
+        lag = res["lag"]
+        print(
+            f"{backend:<10}{res['startup_ms']:>10.2f}{res['frames']:>6}"
+            f"{res['p50_us']:>13.1f}{res['p99_us']:>10.1f}{res['max_us']:>10.1f}"
+            f"{lag['p50_ms']:>10.2f}/{lag['p99_ms']:.2f}/{lag['max_ms']:.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
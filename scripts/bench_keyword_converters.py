@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""关键词转换基准：trie 贪心分词 vs 逐长度前缀扫描，单条循环 vs 批量转换.
+
+英文短语由 BPE 词表拼成的随机单词组成（models/en/tokens.txt），
+中文短语由常用字随机组合；两者都混入一定比例的重复短语（模拟设置页/脚本
+反复转换同一批唤醒词）。报告总耗时与每条平均耗时（µs）。
+
+用法: python scripts/bench_keyword_converters.py [--phrases 2000] [--dup 0.3]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.audio_processing.keyword_converters import (  # noqa: E402
+    BpeConverter,
+    PinyinConverter,
+)
+
+_HANZI = "你好小智米爱同学贾维斯开始工作助手天气音乐播放暂停打开关闭灯光空调电视明暗"
+
+
+class LegacyBpeConverter(BpeConverter):
+    """改造前的分词：每个位置从 20 字符起逐长度查字典，无单词缓存."""
+
+    def _greedy_tokenize(self, text):
+        tokens = []
+        i = 0
+        while i < len(text):
+            for length in range(min(20, len(text) - i), 0, -1):
+                if text[i : i + length] in self._token_to_id:
+                    tokens.append(text[i : i + length])
+                    i += length
+                    break
+            else:
+                tokens.append("<unk>")
+                i += 1
+        return tokens
+
+    def _tokenize_word(self, word):
+        return tuple(self._greedy_tokenize(f"▁{word}"))
+
+
+def _phrases(rng, make, n, dup):
+    unique = [make() for _ in range(max(1, int(n * (1 - dup))))]
+    return [rng.choice(unique) if i >= len(unique) else unique[i] for i in range(n)]
+
+
+def _time(fn, n):
+    t0 = time.perf_counter()
+    out = fn()
+    elapsed = time.perf_counter() - t0
+    return elapsed, elapsed / n * 1e6, out
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="关键词转换基准")
+    parser.add_argument("--phrases", type=int, default=2000, help="每种语言的短语数")
+    parser.add_argument("--dup", type=float, default=0.3, help="重复短语比例")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    tokens_path = project_root / "models" / "en" / "tokens.txt"
+    vocab = [
+        line.split()[0].lstrip("▁")
+        for line in tokens_path.read_text(encoding="utf-8").splitlines()
+        if line.strip() and not line.startswith("<")
+    ]
+    vocab = [v for v in vocab if v.isalpha()]
+
+    def en_phrase():
+        words = [
+            "".join(rng.choice(vocab) for _ in range(rng.randint(1, 4)))
+            for _ in range(rng.randint(1, 3))
+        ]
+        return " ".join(words).lower()
+
+    def zh_phrase():
+        return "".join(rng.choice(_HANZI) for _ in range(rng.randint(2, 6)))
+
+    en = _phrases(rng, en_phrase, args.phrases, args.dup)
+    zh = _phrases(rng, zh_phrase, args.phrases, args.dup)
+    print(f"英文 {len(en)} 条 / 中文 {len(zh)} 条，重复比例 {args.dup:.0%}")
+
+    legacy = LegacyBpeConverter(str(tokens_path))
+    legacy._load_tokens()
+    bpe = BpeConverter(str(tokens_path))
+    bpe._load_tokens()
+
+    t_old, us_old, out_old = _time(lambda: [legacy.convert(t) for t in en], len(en))
+    t_new, us_new, out_new = _time(lambda: bpe.convert_batch(en), len(en))
+    print("BPE（英文）")
+    print(f"  前缀扫描逐条: {t_old * 1e3:8.1f} ms  {us_old:7.1f} µs/条")
+    print(f"  trie 批量    : {t_new * 1e3:8.1f} ms  {us_new:7.1f} µs/条")
+    print(f"  加速比       : {t_old / t_new:8.2f}x，结果一致: {out_old == out_new}")
+
+    pinyin = PinyinConverter()
+    pinyin.convert("预热")  # 排除 pypinyin 词典加载
+    t_old, us_old, out_old = _time(lambda: [pinyin.convert(t) for t in zh], len(zh))
+    t_new, us_new, out_new = _time(lambda: pinyin.convert_batch(zh), len(zh))
+    print("拼音（中文）")
+    print(f"  逐条转换     : {t_old * 1e3:8.1f} ms  {us_old:7.1f} µs/条")
+    print(f"  批量去重     : {t_new * 1e3:8.1f} ms  {us_new:7.1f} µs/条")
+    print(f"  加速比       : {t_old / t_new:8.2f}x，结果一致: {out_old == out_new}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""唤醒词前置能量门基准：CPU 占用（安静 vs 说话）与检测召回率.
+
+对比「无门」与「能量门」两种模式：
+- 安静段：--idle 录音（默认合成 -60dBFS 底噪），报告 KWS 推理 CPU%
+  （进程 CPU 时间 / 音频时长，含 sherpa-onnx 内部线程）；
+- 说话段：--positives 目录下每条含唤醒词的录音（16-bit PCM WAV），
+  前后各垫一段安静音频逐 20ms 帧送入，报告 CPU% 与召回率。
+
+模型不可用时仅报告能量门放行比例（可据此估算推理 CPU 节省）。
+
+用法: python scripts/bench_kws_gate.py --positives recordings/ [--idle room.wav]
+      [--model-dir models/zh] [--keywords models/zh/keywords.txt]
+"""
+
+import argparse
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.audio_processing.kws_gate import EnergyGate  # noqa: E402
+
+_RATE = 16000
+_FRAME = _RATE // 50  # 20ms
+
+
+def _read_wav(path: Path) -> np.ndarray:
+    with wave.open(str(path), "rb") as w:
+        if w.getsampwidth() != 2:
+            raise ValueError(f"{path}: 仅支持 16-bit PCM")
+        data = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+        data = data.reshape(-1, w.getnchannels()).mean(axis=1)
+        src_rate = w.getframerate()
+    pcm = (data / 32768.0).astype(np.float32)
+    if src_rate != _RATE:
+        import soxr
+
+        pcm = soxr.resample(pcm, src_rate, _RATE).astype(np.float32)
+    return pcm
+
+
+def _idle_noise(seconds: float, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (0.001 * rng.standard_normal(int(_RATE * seconds))).astype(np.float32)
+
+
+def _load_spotter(model_dir: Path, keywords: Path, threads: int):
+    try:
+        import sherpa_onnx
+
+        return sherpa_onnx.KeywordSpotter(
+            tokens=str(model_dir / "tokens.txt"),
+            encoder=str(model_dir / "encoder.onnx"),
+            decoder=str(model_dir / "decoder.onnx"),
+            joiner=str(model_dir / "joiner.onnx"),
+            keywords_file=str(keywords),
+            num_threads=threads,
+            sample_rate=_RATE,
+            feature_dim=80,
+            max_active_paths=2,
+            keywords_score=1.8,
+            keywords_threshold=0.2,
+            num_trailing_blanks=1,
+            provider="cpu",
+        )
+    except Exception as e:
+        print(f"模型不可用（{e}），仅报告能量门放行比例")
+        return None
+
+
+def _run(spotter, pcm: np.ndarray, gate: EnergyGate | None) -> tuple[float, bool]:
+    """逐帧送入，返回 (CPU 秒, 是否检测到)."""
+    stream = spotter.create_stream() if spotter is not None else None
+    detected = False
+    cpu = 0.0
+    for off in range(0, len(pcm) - _FRAME + 1, _FRAME):
+        frame = pcm[off : off + _FRAME]
+        t0 = time.process_time()
+        chunk = gate.filter(frame) if gate is not None else frame
+        if chunk is not None and stream is not None:
+            stream.accept_waveform(sample_rate=_RATE, waveform=chunk)
+            while spotter.is_ready(stream):
+                spotter.decode_stream(stream)
+                if spotter.get_result(stream):
+                    detected = True
+                    spotter.reset_stream(stream)
+        cpu += time.process_time() - t0
+    return cpu, detected
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="唤醒词能量门基准")
+    parser.add_argument("--model-dir", default=str(project_root / "models" / "zh"))
+    parser.add_argument("--keywords", help="keywords 文件（默认模型目录下 keywords.txt）")
+    parser.add_argument("--positives", help="含唤醒词的录音目录（*.wav）")
+    parser.add_argument("--idle", help="安静环境录音 WAV（默认合成底噪）")
+    parser.add_argument("--idle-seconds", type=float, default=30.0)
+    parser.add_argument("--threads", type=int, default=4, help="NUM_THREADS")
+    parser.add_argument("--open-db", type=float, default=-45.0)
+    parser.add_argument("--close-db", type=float, default=-52.0)
+    args = parser.parse_args(argv)
+
+    model_dir = Path(args.model_dir)
+    keywords = Path(args.keywords) if args.keywords else model_dir / "keywords.txt"
+    spotter = _load_spotter(model_dir, keywords, args.threads)
+
+    idle = _read_wav(Path(args.idle)) if args.idle else _idle_noise(args.idle_seconds)
+    positives = sorted(Path(args.positives).glob("*.wav")) if args.positives else []
+    pad = _idle_noise(1.0, seed=1)
+    samples = [np.concatenate((pad, _read_wav(p), pad[: _RATE // 2])) for p in positives]
+
+    def make_gate():
+        return EnergyGate(_RATE, open_db=args.open_db, close_db=args.close_db)
+
+    print(f"安静段 {len(idle) / _RATE:.1f}s，说话样本 {len(samples)} 条，线程 {args.threads}")
+    for name, gate_factory in (("无门  ", lambda: None), ("能量门", make_gate)):
+        gate = gate_factory()
+        cpu_idle, _ = _run(spotter, idle, gate)
+        line = f"  {name}: 安静 CPU {cpu_idle / (len(idle) / _RATE) * 100:6.2f}%"
+        if gate is not None:
+            line += f"（放行 {gate.passed_samples / max(1, len(idle)) * 100:.1f}%）"
+
+        if samples:
+            cpu_speech, hits, total = 0.0, 0, 0
+            for pcm in samples:
+                g = gate_factory()
+                c, detected = _run(spotter, pcm, g)
+                cpu_speech += c
+                hits += int(detected)
+                total += len(pcm)
+            line += f" | 说话 CPU {cpu_speech / (total / _RATE) * 100:6.2f}%"
+            if spotter is not None:
+                line += f" | 召回 {hits}/{len(samples)}"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
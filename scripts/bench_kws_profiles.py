@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""KWS 模型档位选型基准：各档位 × 线程数的实时率、加载耗时与常驻内存.
+
+每个组合在独立子进程中加载 KeywordSpotter（内存互不干扰），
+把 WAV 录音按 20ms 帧回放（默认合成 10s 类语音信号），报告：
+- load: 模型加载耗时（s）
+- RTF : 推理耗时 / 音频时长（越小越好，接近 1 说明算力不足）
+- RSS : 加载并回放后的进程常驻内存，及相对加载前的增量（MB）
+
+档位文件命名见 WakeWordDetector：fp32 为 encoder.onnx 等，其他档位为
+encoder.<profile>.onnx 等（缺失回退 fp32）。
+
+用法: python scripts/bench_kws_profiles.py [--model-dir models/zh]
+      [--profiles fp32,int8] [--threads 1,2,4] [--wav a.wav --wav b.wav]
+"""
+
+import argparse
+import multiprocessing as mp
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+_RATE = 16000
+_FRAME = _RATE // 50  # 20ms
+
+
+def _read_wav(path: str) -> np.ndarray:
+    with wave.open(path, "rb") as w:
+        if w.getsampwidth() != 2:
+            raise ValueError(f"{path}: 仅支持 16-bit PCM")
+        data = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+        data = data.reshape(-1, w.getnchannels()).mean(axis=1)
+        src_rate = w.getframerate()
+    pcm = (data / 32768.0).astype(np.float32)
+    if src_rate != _RATE:
+        import soxr
+
+        pcm = soxr.resample(pcm, src_rate, _RATE).astype(np.float32)
+    return pcm
+
+
+def _synthetic(seconds: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(_RATE * seconds)) / _RATE
+    x = sum((0.1 / k) * np.sin(2 * np.pi * 140 * k * t) for k in range(1, 8))
+    x *= 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t) ** 2
+    x += 0.003 * rng.standard_normal(len(t))
+    return x.astype(np.float32)
+
+
+def _bench(model_dir: str, keywords: str, profile: str, threads: int, pcm, result_q):
+    """子进程：加载 + 回放，结果放入队列."""
+    try:
+        import psutil
+        import sherpa_onnx
+
+        from src.audio_processing.wake_word_detect import resolve_model_files
+
+        proc = psutil.Process()
+        rss0 = proc.memory_info().rss
+        files = resolve_model_files(Path(model_dir), profile)
+
+        t0 = time.perf_counter()
+        spotter = sherpa_onnx.KeywordSpotter(
+            tokens=str(Path(model_dir) / "tokens.txt"),
+            encoder=str(files["encoder"]),
+            decoder=str(files["decoder"]),
+            joiner=str(files["joiner"]),
+            keywords_file=keywords,
+            num_threads=threads,
+            sample_rate=_RATE,
+            feature_dim=80,
+            max_active_paths=2,
+            keywords_score=1.8,
+            keywords_threshold=0.2,
+            num_trailing_blanks=1,
+            provider="cpu",
+        )
+        load_s = time.perf_counter() - t0
+
+        stream = spotter.create_stream()
+        busy = 0.0
+        for off in range(0, len(pcm) - _FRAME + 1, _FRAME):
+            t0 = time.perf_counter()
+            stream.accept_waveform(sample_rate=_RATE, waveform=pcm[off : off + _FRAME])
+            while spotter.is_ready(stream):
+                spotter.decode_stream(stream)
+                if spotter.get_result(stream):
+                    spotter.reset_stream(stream)
+            busy += time.perf_counter() - t0
+
+        rss = proc.memory_info().rss
+        result_q.put(
+            {
+                "files": ", ".join(p.name for p in files.values()),
+                "load_s": load_s,
+                "rtf": busy / (len(pcm) / _RATE),
+                "rss_mb": rss / 2**20,
+                "delta_mb": (rss - rss0) / 2**20,
+            }
+        )
+    except Exception as e:
+        result_q.put({"error": str(e)})
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="KWS 模型档位选型基准")
+    parser.add_argument("--model-dir", default=str(project_root / "models" / "zh"))
+    parser.add_argument("--keywords", help="keywords 文件（默认模型目录下 keywords.txt）")
+    parser.add_argument("--profiles", default="fp32,int8", help="逗号分隔的档位")
+    parser.add_argument("--threads", default="1,2,4", help="逗号分隔的线程数")
+    parser.add_argument("--wav", action="append", help="回放录音（可多次指定）")
+    parser.add_argument("--seconds", type=float, default=10.0, help="合成信号时长(s)")
+    args = parser.parse_args(argv)
+
+    model_dir = args.model_dir
+    keywords = args.keywords or str(Path(model_dir) / "keywords.txt")
+    pcm = (
+        np.concatenate([_read_wav(p) for p in args.wav])
+        if args.wav
+        else _synthetic(args.seconds)
+    )
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    threads = [int(t) for t in args.threads.split(",") if t.strip()]
+
+    print(f"模型目录: {model_dir}，音频 {len(pcm) / _RATE:.1f}s")
+    print(f"{'档位':<8}{'线程':>4}{'load(s)':>10}{'RTF':>8}{'RSS(MB)':>10}{'增量(MB)':>10}  文件")
+    ctx = mp.get_context("spawn")
+    for profile in profiles:
+        for n in threads:
+            result_q = ctx.Queue()
+            proc = ctx.Process(
+                target=_bench, args=(model_dir, keywords, profile, n, pcm, result_q)
+            )
+            proc.start()
+            res = result_q.get()
+            proc.join()
+            if "error" in res:
+                print(f"{profile:<8}{n:>4}  失败: {res['error']}")
+                continue
+            print(
+                f"{profile:<8}{n:>4}{res['load_s']:>10.2f}{res['rtf']:>8.3f}"
+                f"{res['rss_mb']:>10.1f}{res['delta_mb']:>10.1f}  {res['files']}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""上行 Opus 编码微基准：不同 OPUS_OPTIONS 下的编码耗时与码率.
+
+输入为「语音段 + 静音段」交替的合成信号（模拟对话中的停顿），
+按协议帧长逐帧编码。报告每帧平均耗时（µs）、实际上送字节率（B/s，
+DTX 静音帧按 AudioCodec 的逻辑丢弃不计）以及被丢弃的 DTX 帧比例。
+
+用法: python scripts/bench_opus_encoder.py [--rate 16000] [--frame-ms 60] [--seconds 20]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.audio_codecs.opus_codec import OpusCodec  # noqa: E402
+
+# (名称, OPUS_OPTIONS)
+_SETTINGS = [
+    ("默认", {}),
+    ("COMPLEXITY=10", {"COMPLEXITY": 10}),
+    ("COMPLEXITY=5", {"COMPLEXITY": 5}),
+    ("COMPLEXITY=2", {"COMPLEXITY": 2}),
+    ("COMPLEXITY=0", {"COMPLEXITY": 0}),
+    ("24kbps CBR", {"BITRATE": 24000, "VBR": False}),
+    ("DTX", {"DTX": True}),
+    ("DTX+C5", {"DTX": True, "COMPLEXITY": 5}),
+    ("FEC 10%", {"INBAND_FEC": True, "PACKET_LOSS_PERC": 10}),
+]
+
+
+def _signal(rate: int, seconds: float) -> np.ndarray:
+    """1.5s 类语音（基频+谐波+噪声，幅度调制）与 1s 静音交替."""
+    rng = np.random.default_rng(0)
+    n = int(rate * seconds)
+    t = np.arange(n) / rate
+    voiced = sum(
+        (0.25 / k) * np.sin(2 * np.pi * 140 * k * t + rng.uniform(0, np.pi))
+        for k in range(1, 8)
+    )
+    voiced *= 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t) ** 2
+    voiced += 0.01 * rng.standard_normal(n)
+    gate = (t % 2.5) < 1.5
+    return (voiced * gate).astype(np.float32)
+
+
+def bench(options: dict, pcm: np.ndarray, rate: int, frame: int) -> tuple[float, float, float]:
+    codec = OpusCodec(rate, rate, encoder_options=options)
+    codec.initialize()
+    try:
+        frames = [pcm[i : i + frame] for i in range(0, len(pcm) - frame + 1, frame)]
+        sent = 0
+        skipped = 0
+        start = time.perf_counter()
+        for f in frames:
+            data = codec.encode(f, frame)
+            if codec.dtx and codec.is_dtx_frame(data):
+                skipped += 1
+            else:
+                sent += len(data)
+        elapsed = time.perf_counter() - start
+    finally:
+        codec.close()
+
+    seconds = len(frames) * frame / rate
+    return elapsed * 1e6 / len(frames), sent / seconds, skipped / len(frames)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Opus 编码参数微基准")
+    parser.add_argument("--rate", type=int, default=16000, help="编码采样率")
+    parser.add_argument("--frame-ms", type=int, default=60, help="帧时长(ms)")
+    parser.add_argument("--seconds", type=float, default=20.0, help="信号时长(s)")
+    args = parser.parse_args(argv)
+
+    frame = args.rate * args.frame_ms // 1000
+    pcm = _signal(args.rate, args.seconds)
+
+    print(f"采样率 {args.rate}Hz, 帧 {args.frame_ms}ms, 信号 {args.seconds:.0f}s（语音/静音交替）")
+    print(f"  {'设置':<16}{'µs/帧':>10}{'B/s':>10}{'DTX 丢弃':>10}")
+    for name, options in _SETTINGS:
+        us, bps, skipped = bench(options, pcm, args.rate, frame)
+        print(f"  {name:<16}{us:>10.1f}{bps:>10.0f}{skipped:>9.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
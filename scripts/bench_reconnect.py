@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""断线重连基准：掐断连接后到音频通道重新可用（收到服务端 hello）的耗时.
+
+本地起一个回应 hello 的 wss 替身服务端（自签名证书），前面挂一个可注入
+往返时延的 TCP 中继。每轮先让当前连接停滞（模拟链路劣化），再由中继掐断，
+对比三种客户端：
+- 原策略：等待 2×attempt 秒后重连，完整 TLS 握手，无备用连接
+- 无预热：首次立即重连并复用 TLS 会话（断线前无劣化征兆的情形）
+- 新策略：在此基础上，劣化期间预热的备用连接直接接管
+
+用法: python scripts/bench_reconnect.py [--rounds 5] [--rtt-ms 80]
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import ssl
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import websockets  # noqa: E402
+
+from src.protocols import websocket_protocol  # noqa: E402
+from src.protocols.websocket_protocol import WebsocketProtocol  # noqa: E402
+
+
+def _server_ssl_context(workdir: Path) -> ssl.SSLContext:
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    cert_file, key_file = workdir / "cert.pem", workdir / "key.pem"
+    cert_file.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_file.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_file, key_file)
+    return context
+
+
+async def _hello_handler(ws):
+    async for message in ws:
+        if isinstance(message, str) and json.loads(message)["type"] == "hello":
+            await ws.send(json.dumps({"type": "hello", "transport": "websocket"}))
+
+
+class _DelayRelay:
+    """TCP 中继：每个方向延迟 rtt/2 转发；可让某条连接停滞或直接掐断."""
+
+    def __init__(self, upstream_port: int, rtt: float):
+        self.upstream_port = upstream_port
+        self.half_rtt = rtt / 2
+        self.connections = []  # [(client_writer, upstream_writer, state)]
+        self.server = None
+        self.port = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._accept, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def _accept(self, reader, writer):
+        up_reader, up_writer = await asyncio.open_connection(
+            "127.0.0.1", self.upstream_port
+        )
+        state = {"stalled": False}
+        self.connections.append((writer, up_writer, state))
+        await asyncio.gather(
+            self._pump(reader, up_writer, state),
+            self._pump(up_reader, writer, state),
+            return_exceptions=True,
+        )
+
+    async def _pump(self, reader, writer, state):
+        loop = asyncio.get_running_loop()
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            if state["stalled"]:
+                continue
+            loop.call_later(self.half_rtt, self._forward, writer, data)
+        self._forward(writer, None)
+
+    @staticmethod
+    def _forward(writer, data):
+        if writer.is_closing():
+            return
+        if data is None:
+            writer.close()
+        else:
+            writer.write(data)
+
+    def stall_latest(self):
+        self.connections[-1][2]["stalled"] = True
+
+    def kill(self, stalled_only: bool = True):
+        keep = []
+        for client, upstream, state in self.connections:
+            if stalled_only and not state["stalled"]:
+                keep.append((client, upstream, state))
+                continue
+            client.transport.abort()
+            upstream.transport.abort()
+        self.connections = keep
+
+    async def close(self):
+        self.kill(stalled_only=False)
+        self.server.close()
+        await self.server.wait_closed()
+
+
+class _LegacyProtocol(WebsocketProtocol):
+    """原重连策略：固定退避、每次完整握手、不预热."""
+
+    def _reconnect_delay(self, attempt: int) -> float:
+        return min(attempt * 2, 30)
+
+    async def _on_monitor_tick(self):
+        return None
+
+    async def connect(self) -> bool:
+        if self._tls_context:
+            self._tls_context.forget()
+        return await super().connect()
+
+
+class _NoStandbyProtocol(WebsocketProtocol):
+    """新策略但无预热（断线前无劣化征兆）：立即重连 + TLS 会话复用."""
+
+    async def _on_monitor_tick(self):
+        return None
+
+
+class _Config:
+    def __init__(self, url):
+        self.values = {
+            "SYSTEM_OPTIONS.NETWORK.WEBSOCKET_URL": url,
+            "SYSTEM_OPTIONS.NETWORK.WEBSOCKET_ACCESS_TOKEN": "token",
+            "SYSTEM_OPTIONS.DEVICE_ID": "bench",
+            "SYSTEM_OPTIONS.CLIENT_ID": "bench",
+        }
+
+    def get_config(self, path, default=None):
+        return self.values.get(path, default)
+
+
+async def _measure(protocol_cls, relay, rounds: int, rtt: float) -> tuple:
+    protocol = protocol_cls()
+    protocol.enable_auto_reconnect(True, max_attempts=5)
+    opened = asyncio.Event()
+
+    async def on_opened():
+        opened.set()
+
+    protocol.on_audio_channel_opened(on_opened)
+    if not await protocol.connect():
+        raise RuntimeError("首次连接失败")
+
+    results = []
+    for _ in range(rounds):
+        # 当前连接停滞（劣化），keepalive 测得时延达到阈值，经一次监控后被掐断
+        relay.stall_latest()
+        if protocol.websocket is not None:
+            protocol.websocket.latency = websocket_protocol._DEGRADED_LATENCY_S
+        await protocol._on_monitor_tick()
+        await asyncio.sleep(max(0.2, rtt * 6))
+
+        opened.clear()
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+        relay.kill()
+        await asyncio.wait_for(opened.wait(), timeout=60)
+        results.append((loop.time() - t0) * 1000)
+        await asyncio.sleep(0.1)
+
+    info = protocol.get_connection_info()
+    await protocol.close_audio_channel()
+    return results, info
+
+
+async def _run(args) -> int:
+    rtt = args.rtt_ms / 1000
+    websocket_protocol._DEGRADED_LATENCY_S = max(0.1, rtt * 3)
+    with tempfile.TemporaryDirectory() as tmp:
+        server = await websockets.serve(
+            _hello_handler, "127.0.0.1", 0, ssl=_server_ssl_context(Path(tmp))
+        )
+        relay = _DelayRelay(server.sockets[0].getsockname()[1], rtt)
+        await relay.start()
+        config = _Config(f"wss://127.0.0.1:{relay.port}")
+        websocket_protocol.get_config = lambda: config
+
+        print(f"轮数 {args.rounds}，模拟往返时延 {args.rtt_ms}ms，单位: 毫秒")
+        print(f"{'策略':<6}{'中位':>10}{'最小':>10}{'最大':>10}  TLS复用/握手  备用接管")
+        for label, cls in (
+            ("原策略", _LegacyProtocol),
+            ("无预热", _NoStandbyProtocol),
+            ("新策略", WebsocketProtocol),
+        ):
+            results, info = await _measure(cls, relay, args.rounds, rtt)
+            tls = info["tls"]
+            print(
+                f"{label:<6}{statistics.median(results):>10.1f}"
+                f"{min(results):>10.1f}{max(results):>10.1f}"
+                f"  {tls['resumed']:>5}/{tls['handshakes']:<7}"
+                f"  {info['standby']['used']}"
+            )
+
+        await relay.close()
+        server.close()
+        await server.wait_closed()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="断线重连到音频就绪耗时基准")
+    parser.add_argument("--rounds", type=int, default=5, help="掐断次数")
+    parser.add_argument("--rtt-ms", type=float, default=80.0, help="模拟往返时延")
+    args = parser.parse_args(argv)
+    # 断线过程中的连接日志会淹没结果表
+    logging.disable(logging.CRITICAL)
+    return asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""UDP 音频包加解密吞吐基准：逐包 Cipher(CTR) vs 会话级 AudioPacketCipher.
+
+按典型 Opus 包长（16kHz 单声道 20/40/60ms 帧约 40~320 字节）分别测量
+加密组包与解包解密的每秒包数（packets/s），并校验两种实现输出一致。
+
+用法: python scripts/bench_udp_crypto.py [--sizes 40,80,120,160,320] [--packets 50000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.protocols.mqtt_crypto import (  # noqa: E402
+    AudioPacketCipher,
+    aes_ctr_decrypt,
+    aes_ctr_encrypt,
+    build_audio_nonce,
+)
+
+
+def _legacy_encrypt(key_hex, nonce_hex, audio, sequence):
+    """改造前的 send_audio 组包."""
+    new_nonce = build_audio_nonce(nonce_hex, len(audio), sequence)
+    encrypted = aes_ctr_encrypt(
+        bytes.fromhex(key_hex), bytes.fromhex(new_nonce), bytes(audio)
+    )
+    return bytes.fromhex(new_nonce) + encrypted
+
+
+def _legacy_decrypt(key_hex, packet):
+    """改造前的 _receive_loop 解包."""
+    plain = aes_ctr_decrypt(bytes.fromhex(key_hex), packet[:16], packet[16:])
+    return plain, int.from_bytes(packet[12:16], "big")
+
+
+def _rate(fn, items) -> float:
+    t0 = time.perf_counter()
+    for item in items:
+        fn(item)
+    return len(items) / (time.perf_counter() - t0)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="UDP 音频包加解密吞吐基准")
+    parser.add_argument("--sizes", default="40,80,120,160,320", help="逗号分隔的包长")
+    parser.add_argument("--packets", type=int, default=50000, help="每项测量包数")
+    args = parser.parse_args(argv)
+
+    key_hex, nonce_hex = os.urandom(16).hex(), os.urandom(16).hex()
+    tx = AudioPacketCipher(key_hex, nonce_hex)
+    rx = AudioPacketCipher(key_hex, nonce_hex)
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    print(f"每项 {args.packets} 包，单位: 包/秒")
+    print(
+        f"{'包长(B)':>8}{'加密-原':>12}{'加密-新':>12}{'加速':>7}"
+        f"{'解密-原':>12}{'解密-新':>12}{'加速':>7}  一致"
+    )
+    for size in sizes:
+        payloads = [os.urandom(size) for _ in range(64)]
+        items = [(payloads[i % 64], i + 1) for i in range(args.packets)]
+
+        enc_old = _rate(lambda it: _legacy_encrypt(key_hex, nonce_hex, *it), items)
+        enc_new = _rate(lambda it: tx.encrypt(*it), items)
+
+        packets = [tx.encrypt(p, i + 1) for i, p in enumerate(payloads)]
+        pkt_items = [packets[i % 64] for i in range(args.packets)]
+        dec_old = _rate(lambda p: _legacy_decrypt(key_hex, p), pkt_items)
+        dec_new = _rate(rx.decrypt, pkt_items)
+
+        same = all(
+            _legacy_encrypt(key_hex, nonce_hex, p, i + 1) == packets[i]
+            and rx.decrypt(packets[i]) == _legacy_decrypt(key_hex, packets[i])
+            for i, p in enumerate(payloads)
+        )
+        print(
+            f"{size:>8}{enc_old:>12,.0f}{enc_new:>12,.0f}{enc_new / enc_old:>6.2f}x"
+            f"{dec_old:>12,.0f}{dec_new:>12,.0f}{dec_new / dec_old:>6.2f}x  {same}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""冷启动报告：CLI 模式（websocket，唤醒词关闭）从进程启动到音频通道就绪.
+
+子进程按 main.py --mode cli 的顺序走一遍启动路径中不依赖硬件的部分：
+配置/日志初始化、激活模块、服务容器、协议、共享服务与 MCP/UI/唤醒词插件、
+Opus 编解码器，最后连接本地 websocket 替身服务端并完成 hello。
+父进程记录拉起子进程的时刻，得到含解释器启动的端到端耗时。
+
+--importtime 改用 python -X importtime 运行子进程（不连接），
+列出累计耗时最高的顶层导入，以及本应按需加载却被导入的重依赖。
+
+对比改造前后：把旧版本检出到另一目录（git worktree add /tmp/old <commit>），
+用 --root /tmp/old 指向它运行同一脚本。
+
+用法: python scripts/cold_start_report.py [--runs 5] [--root PATH] [--importtime]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# CLI 模式、唤醒词关闭时直到首次使用前都不应导入的重依赖
+DEFERRED_MODULES = (
+    "sherpa_onnx",
+    "cv2",
+    "PIL",
+    "mutagen",
+    "PySide6",
+    "qasync",
+    "cryptography",
+    "openai",
+    "httpx",
+    "textual",
+)
+
+_RESULT_PREFIX = "COLD_START "
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """解析 -X importtime 输出为 [(模块, 自身us, 累计us, 嵌套深度)]."""
+    rows = []
+    for line in stderr.splitlines():
+        # "import time:   self |   cumulative | <缩进>模块"，缩进每层两个空格
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        module = name.lstrip(" ")
+        depth = (len(name) - len(module) - 1) // 2
+        rows.append((module.rstrip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+# ============ 子进程：模拟 CLI 启动路径 ============
+
+
+async def _child(url: str, connect: bool) -> dict:
+    skipped = []
+
+    from src.utils.config_manager import initialize_config
+
+    config = initialize_config()
+    config.update_config("WAKE_WORD_OPTIONS.USE_WAKE_WORD", False, save=False)
+    config.update_config("SYSTEM_OPTIONS.NETWORK.WEBSOCKET_URL", url, save=False)
+
+    from src.logging import load_logging_config, setup_logging
+
+    setup_logging(enable_console=False, config=load_logging_config())
+
+    import src.activation  # noqa: F401  main.handle_activation
+    from src.bootstrap.container import ServiceContainer
+    from src.bootstrap.plugin_wiring import bind_shared_services
+    from src.plugins.mcp import McpPlugin
+    from src.plugins.ui import UIPlugin
+    from src.plugins.wake_word import WakeWordPlugin
+
+    container = ServiceContainer()
+    container.tasks.initialize()
+    container.protocol.set_task_manager(container.tasks)
+    container.protocol.set_protocol("websocket")
+    ctx = container.create_plugin_context()
+    cmd = container.create_plugin_commands()
+
+    bind_shared_services(container)
+    wake_word = WakeWordPlugin()
+    for plugin in (
+        McpPlugin(server=container.mcp_server, music_player=container.music_player),
+        UIPlugin(mode="cli", task_manager=container.tasks),
+        wake_word,
+    ):
+        await plugin.setup(ctx, cmd)
+    await wake_word.start()
+
+    # 音频插件依赖声卡（sounddevice/PortAudio）；无声卡环境只记录跳过
+    try:
+        import src.plugins.audio  # noqa: F401
+    except (ImportError, OSError) as e:
+        skipped.append(f"audio: {e}")
+    from src.audio_codecs.opus_codec import OpusCodec
+
+    OpusCodec(16000, 24000).initialize()
+
+    connected = connect and await container.protocol.connect()
+    ready_at = time.time()
+    if connected:
+        await container.protocol.disconnect()
+
+    return {
+        "ready_at": ready_at,
+        "connected": connected,
+        "skipped": skipped,
+        "deferred_loaded": [m for m in DEFERRED_MODULES if m in sys.modules],
+    }
+
+
+def _child_main(args) -> int:
+    sys.path.insert(0, str(Path(args.root).resolve()))
+    result = asyncio.run(_child(args.url, not args.no_connect))
+    print(_RESULT_PREFIX + json.dumps(result), flush=True)
+    return 0
+
+
+# ============ 父进程 ============
+
+
+def _child_command(root: str, url: str | None, importtime: bool) -> list[str]:
+    """url 为空时子进程不连接，只走到编解码器初始化."""
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += [str(Path(__file__).resolve()), "--child", "--root", root]
+    cmd += ["--url", url] if url else ["--no-connect"]
+    return cmd
+
+
+def _parse_result(stdout: str) -> dict:
+    for line in stdout.splitlines():
+        if line.startswith(_RESULT_PREFIX):
+            return json.loads(line[len(_RESULT_PREFIX) :])
+    raise RuntimeError("子进程未输出结果")
+
+
+def run_child(root: str, data_dir: str, url=None, importtime=False):
+    """同步运行一次子进程，返回 (结果, stderr)."""
+    env = dict(os.environ, XIAOZHI_DATA_DIR=data_dir)
+    proc = subprocess.run(
+        _child_command(root, url, importtime),
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=root,
+        timeout=120,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"子进程失败:\n{proc.stderr[-2000:]}")
+    return _parse_result(proc.stdout), proc.stderr
+
+
+async def _measure(args, data_dir: str) -> int:
+    import websockets
+
+    async def handler(ws):
+        async for message in ws:
+            if isinstance(message, str) and json.loads(message)["type"] == "hello":
+                await ws.send(json.dumps({"type": "hello", "transport": "websocket"}))
+
+    server = await websockets.serve(handler, "127.0.0.1", 0)
+    url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    env = dict(os.environ, XIAOZHI_DATA_DIR=data_dir)
+
+    samples = []
+    result = {}
+    # 首轮生成配置/日志目录，不计入
+    for i in range(args.runs + 1):
+        t0 = time.time()
+        proc = await asyncio.create_subprocess_exec(
+            *_child_command(args.root, url, False),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=env,
+            cwd=args.root,
+        )
+        stdout, _ = await proc.communicate()
+        result = _parse_result(stdout.decode())
+        if not result["connected"]:
+            raise RuntimeError("子进程未能连接替身服务端")
+        if i:
+            samples.append((result["ready_at"] - t0) * 1000)
+
+    server.close()
+    await server.wait_closed()
+
+    print(f"代码目录: {Path(args.root).resolve()}")
+    print(f"进程启动 → 音频通道就绪（{args.runs} 次，毫秒）")
+    print(
+        f"  中位 {statistics.median(samples):.0f}  最小 {min(samples):.0f}"
+        f"  最大 {max(samples):.0f}"
+    )
+    print(f"  已加载的重依赖: {', '.join(result['deferred_loaded']) or '无'}")
+    for item in result["skipped"]:
+        print(f"  跳过: {item}")
+    return 0
+
+
+def _importtime_report(args, data_dir: str) -> int:
+    result, stderr = run_child(args.root, data_dir, importtime=True)
+    rows = parse_importtime(stderr)
+    top_level = [r for r in rows if r[3] == 0]
+    total_ms = sum(r[2] for r in top_level) / 1000
+
+    print(f"代码目录: {Path(args.root).resolve()}")
+    print(f"顶层导入累计 {total_ms:.0f} ms，共 {len(rows)} 个模块")
+    print(f"{'累计(ms)':>10}{'自身(ms)':>10}  模块")
+    for name, self_us, cumulative_us, _ in sorted(
+        top_level, key=lambda r: r[2], reverse=True
+    )[: args.top]:
+        print(f"{cumulative_us / 1000:>10.1f}{self_us / 1000:>10.1f}  {name}")
+    print(f"已加载的重依赖: {', '.join(result['deferred_loaded']) or '无'}")
+    for item in result["skipped"]:
+        print(f"跳过: {item}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="CLI 模式冷启动耗时与导入报告")
+    parser.add_argument("--runs", type=int, default=5, help="测量次数")
+    parser.add_argument("--root", default=str(project_root), help="被测代码目录")
+    parser.add_argument("--importtime", action="store_true", help="输出导入耗时排行")
+    parser.add_argument("--top", type=int, default=15, help="导入排行条数")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--url", default="ws://127.0.0.1:9", help=argparse.SUPPRESS)
+    parser.add_argument("--no-connect", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return _child_main(args)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        if args.importtime:
+            return _importtime_report(args, data_dir)
+        return asyncio.run(_measure(args, data_dir))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,12 +13,17 @@ import sys
 from pathlib import Path
 
 try:
-    from pypinyin import Style, lazy_pinyin
+    import pypinyin  # noqa: F401
 except ImportError:
     print("❌ 缺少依赖: pypinyin")
     print("请安装: pip install pypinyin")
     sys.exit(1)
 
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.audio_processing.keyword_converters import PinyinConverter  # noqa: E402
+
 
 class KeywordGenerator:
     def __init__(self, model_dir: Path):
@@ -34,32 +39,8 @@ class KeywordGenerator:
         # 加载已有的tokens
         self.available_tokens = self._load_tokens()
 
-        # 声母表（需要分离的）
-        self.initials = [
-            "b",
-            "p",
-            "m",
-            "f",
-            "d",
-            "t",
-            "n",
-            "l",
-            "g",
-            "k",
-            "h",
-            "j",
-            "q",
-            "x",
-            "zh",
-            "ch",
-            "sh",
-            "r",
-            "z",
-            "c",
-            "s",
-            "y",
-            "w",
-        ]
+        # 与应用内设置页共用转换器（音节拆分带缓存，批量转换去重）
+        self._converter = PinyinConverter()
 
     def _load_tokens(self) -> set:
         """
@@ -82,25 +63,15 @@ class KeywordGenerator:
         print(f"✅ 加载了 {len(tokens)} 个可用tokens")
         return tokens
 
-    def _split_pinyin(self, pinyin: str) -> list:
-        """将拼音按声母韵母分隔.
-
-        例如: "xiǎo" -> ["x", "iǎo"]       "mǐ" -> ["m", "ǐ"]       "ài" -> ["ài"]  (零声母)
-        """
-        if not pinyin:
-            return []
-
-        # 按长度优先尝试匹配声母（zh, ch, sh优先）
-        for initial in sorted(self.initials, key=len, reverse=True):
-            if pinyin.startswith(initial):
-                final = pinyin[len(initial) :]
-                if final:
-                    return [initial, final]
-                else:
-                    return [initial]
-
-        # 没有声母（零声母）
-        return [pinyin]
+    def _check_tokens(self, keyword_line: str) -> None:
+        """校验 keyword 行的拼音 token 是否都在 tokens.txt 中，缺失时警告."""
+        pinyin_part = keyword_line.split("@", 1)[0]
+        missing_tokens = {
+            part for part in pinyin_part.split() if part not in self.available_tokens
+        }
+        if missing_tokens:
+            print(f"⚠️  警告: 以下token不在tokens.txt中: {', '.join(missing_tokens)}")
+            print("   生成的关键词可能无法正常工作")
 
     def chinese_to_keyword_format(self, chinese_text: str) -> str:
         """将中文转换为keyword格式.
@@ -111,33 +82,8 @@ class KeywordGenerator:
         Returns:
             keyword格式，如"x iǎo m ǐ x iǎo m ǐ @小米小米"
         """
-        # 转换为带声调拼音
-        pinyin_list = lazy_pinyin(chinese_text, style=Style.TONE)
-
-        # 分割每个拼音
-        split_parts = []
-        missing_tokens = []
-
-        for pinyin in pinyin_list:
-            parts = self._split_pinyin(pinyin)
-
-            # 验证每个part是否在tokens中
-            for part in parts:
-                if part not in self.available_tokens:
-                    missing_tokens.append(part)
-                split_parts.append(part)
-
-        # 拼接结果
-        pinyin_str = " ".join(split_parts)
-        keyword_line = f"{pinyin_str} @{chinese_text}"
-
-        # 如果有缺失的token，给出警告
-        if missing_tokens:
-            print(
-                f"⚠️  警告: 以下token不在tokens.txt中: {', '.join(set(missing_tokens))}"
-            )
-            print(f"   生成的关键词可能无法正常工作")
-
+        keyword_line = self._converter.convert(chinese_text)
+        self._check_tokens(keyword_line)
         return keyword_line
 
     def add_keyword(self, chinese_text: str, append: bool = True) -> bool:
@@ -175,7 +121,7 @@ class KeywordGenerator:
             return False
 
     def batch_add_keywords(self, chinese_texts: list, overwrite: bool = False):
-        """批量添加唤醒词.
+        """批量添加唤醒词（一次转换、一次读写文件）.
 
         Args:
             chinese_texts: 中文列表
@@ -184,19 +130,33 @@ class KeywordGenerator:
         if overwrite:
             print("⚠️  将覆盖现有keywords.txt")
 
-        success_count = 0
-        for text in chinese_texts:
-            text = text.strip()
-            if not text:
-                continue
+        texts = [t.strip() for t in chinese_texts if t.strip()]
 
-            if self.add_keyword(text, append=not overwrite):
-                success_count += 1
+        existing = ""
+        if not overwrite and self.keywords_file.exists():
+            with open(self.keywords_file, encoding="utf-8") as f:
+                existing = f.read()
 
-            # 第一个后都追加
-            overwrite = False
+        new_lines = []
+        seen = set()
+        for text, keyword_line in zip(texts, self._converter.convert_batch(texts), strict=True):
+            if text in seen or f"@{text}" in existing:
+                print(f"⚠️  关键词 '{text}' 已存在")
+                continue
+            seen.add(text)
+            self._check_tokens(keyword_line)
+            new_lines.append(keyword_line)
+            print(f"✅ 成功添加: {keyword_line}")
+
+        try:
+            mode = "w" if overwrite else "a"
+            with open(self.keywords_file, mode, encoding="utf-8") as f:
+                f.writelines(line + "\n" for line in new_lines)
+        except Exception as e:
+            print(f"❌ 写入失败: {e}")
+            return
 
-        print(f"\n📊 完成: 成功添加 {success_count}/{len(chinese_texts)} 个关键词")
+        print(f"\n📊 完成: 成功添加 {len(new_lines)}/{len(chinese_texts)} 个关键词")
 
     def list_keywords(self):
         """
@@ -1,6 +1,9 @@
 """采样级 PCM 缓冲.
 
-输出回调混音使用的线程安全 FIFO
+- PcmFifo：输出回调混音使用的线程安全 FIFO
+- SpscPcmFifo：同语义的无锁单生产者/单消费者变体
+- PcmRingBuffer：格式转换凑帧用的预分配环形缓冲（回调线程内单线程使用）
+- PcmFrame / PcmFramePool：采集帧池，监听器共享只读帧，引用计数归零回池
 """
 
 import threading
@@ -51,12 +54,21 @@ class PcmFifo:
                     self._chunks.popleft()
                     self._offset = 0
 
-    def pull(self, n: int) -> np.ndarray | None:
-        """取 n 个样本；无数据返回 None，不足补零."""
+    def pull(self, n: int, out: np.ndarray | None = None) -> np.ndarray | None:
+        """取 n 个样本；无数据返回 None，不足补零.
+
+        Args:
+            n: 样本数
+            out: 可选的预分配 float32 缓冲（长度 ≥ n）；给出时原地写入
+                并返回 out[:n]，输出回调稳态下不再分配
+        """
         with self._lock:
             if self._size == 0:
                 return None
-            out = np.zeros(n, dtype=np.float32)
+            if out is None:
+                out = np.empty(n, dtype=np.float32)
+            elif out.shape[0] != n:
+                out = out[:n]
             filled = 0
             while filled < n and self._chunks:
                 head = self._chunks[0]
@@ -71,6 +83,8 @@ class PcmFifo:
                 if self._offset >= len(head):
                     self._chunks.popleft()
                     self._offset = 0
+            if filled < n:
+                out[filled:] = 0.0
             return out
 
     def clear(self) -> int:
@@ -81,3 +95,287 @@ class PcmFifo:
             self._offset = 0
             self._size = 0
             return count
+
+
+class SpscPcmFifo:
+    """无锁单生产者/单消费者 PCM FIFO（float32 单声道，固定容量环）.
+
+    语义与 PcmFifo 一致（丢最旧计 dropped、不足补零、空返回 None），
+    但 push/pull 不取锁：读写位置为单调递增的帧序号，
+    生产者只写 _write/_floor，消费者只写 _read，依赖 GIL 下整数赋值原子。
+
+    约束：
+    - 仅允许一个线程 push/clear（asyncio 线程）、一个线程 pull（音频回调）
+    - 溢出时生产者上抬 _floor，消费者跳过被覆盖的旧数据；
+      恰逢消费者正在读被覆盖区间时可能读到新旧混合样本（仅溢出时），
+      dropped 在该竞态下可能略多计
+    """
+
+    def __init__(self, max_samples: int):
+        self._max = max(1, int(max_samples))
+        self._ring = np.zeros(self._max, dtype=np.float32)
+        self._write = 0  # 生产者：已写入总样本数
+        self._floor = 0  # 生产者：最早仍有效的样本序号（溢出/清空时上抬）
+        self._read = 0  # 消费者：已读取总样本数
+        self.dropped = 0
+
+    @property
+    def size(self) -> int:
+        return max(0, self._write - max(self._read, self._floor))
+
+    def push(self, pcm: np.ndarray) -> None:
+        """追加 float32 单声道数据；容量超限时丢最旧."""
+        if pcm.ndim > 1:
+            pcm = pcm.reshape(-1)
+        if pcm.dtype != np.float32:
+            pcm = pcm.astype(np.float32)
+        n = len(pcm)
+        if n == 0:
+            return
+        if n > self._max:
+            self.dropped += n - self._max
+            pcm = pcm[n - self._max :]
+            n = self._max
+
+        w = self._write
+        pos = w % self._max
+        first = min(n, self._max - pos)
+        self._ring[pos : pos + first] = pcm[:first]
+        if first < n:
+            self._ring[: n - first] = pcm[first:]
+
+        new_write = w + n
+        start = max(self._read, self._floor)
+        lapped = new_write - self._max
+        if lapped > start:
+            self.dropped += lapped - start
+            self._floor = lapped
+        # 先发布数据与 floor，再发布写位置
+        self._write = new_write
+
+    def pull(self, n: int, out: np.ndarray | None = None) -> np.ndarray | None:
+        """取 n 个样本；无数据返回 None，不足补零（out 语义同 PcmFifo）."""
+        w = self._write
+        start = max(self._read, self._floor)
+        avail = w - start
+        if avail <= 0:
+            return None
+        if out is None:
+            out = np.empty(n, dtype=np.float32)
+        elif out.shape[0] != n:
+            out = out[:n]
+
+        take = min(n, avail)
+        pos = start % self._max
+        first = min(take, self._max - pos)
+        out[:first] = self._ring[pos : pos + first]
+        if first < take:
+            out[first:take] = self._ring[: take - first]
+        if take < n:
+            out[take:] = 0.0
+        self._read = start + take
+        return out
+
+    def clear(self) -> int:
+        """清空（生产者线程调用），返回丢弃的样本数."""
+        count = self.size
+        self._floor = self._write
+        return count
+
+
+class PcmRingBuffer:
+    """预分配 float32 环形缓冲（按帧索引，支持多声道）.
+
+    供 AudioConverter 在 PortAudio 回调线程里凑帧使用，单线程读写、不加锁。
+    替代 deque 逐样本 extend/popleft：写入至多两段切片拷贝，
+    读取在数据连续时直接返回视图，跨越环尾时一次拷贝进内部 scratch。
+
+    - write：超出容量丢最旧（记入 dropped）
+    - read：返回 (n, channels) 视图；不足 n 帧返回 None。
+      视图仅在下一次 write/read 之前有效，需长期持有须自行 copy
+    """
+
+    def __init__(self, capacity_frames: int, channels: int = 1):
+        self._cap = max(1, int(capacity_frames))
+        self._channels = max(1, int(channels))
+        self._buf = np.zeros((self._cap, self._channels), dtype=np.float32)
+        self._scratch = np.empty((self._cap, self._channels), dtype=np.float32)
+        self._head = 0  # 读位置（帧）
+        self._size = 0  # 可读帧数
+        self.dropped = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._cap
+
+    @property
+    def channels(self) -> int:
+        return self._channels
+
+    def write(self, pcm: np.ndarray) -> None:
+        """追加 (N,) 或 (N, channels) 的数据；容量超限时丢最旧."""
+        n = pcm.shape[0]
+        if n == 0:
+            return
+        frames = pcm.reshape(n, self._channels)
+
+        # 单次写入超过容量：只保留最新 cap 帧
+        if n >= self._cap:
+            self.dropped += self._size + n - self._cap
+            self._buf[:] = frames[n - self._cap :]
+            self._head = 0
+            self._size = self._cap
+            return
+
+        overflow = self._size + n - self._cap
+        if overflow > 0:
+            self._head = (self._head + overflow) % self._cap
+            self._size -= overflow
+            self.dropped += overflow
+
+        tail = (self._head + self._size) % self._cap
+        first = min(n, self._cap - tail)
+        self._buf[tail : tail + first] = frames[:first]
+        if first < n:
+            self._buf[: n - first] = frames[first:]
+        self._size += n
+
+    def read(self, n: int) -> np.ndarray | None:
+        """取 n 帧；不足返回 None（不消费）."""
+        if n <= 0 or self._size < n:
+            return None
+        return self._take(n)
+
+    def read_available(self, max_frames: int) -> np.ndarray | None:
+        """取至多 max_frames 帧（排空余量用）；无数据返回 None."""
+        n = min(self._size, int(max_frames))
+        if n <= 0:
+            return None
+        return self._take(n)
+
+    def _take(self, n: int) -> np.ndarray:
+        start = self._head
+        end = start + n
+        if end <= self._cap:
+            out = self._buf[start:end]
+        else:
+            first = self._cap - start
+            out = self._scratch[:n]
+            out[:first] = self._buf[start:]
+            out[first:] = self._buf[: n - first]
+        self._head = end % self._cap
+        self._size -= n
+        if self._size == 0:
+            self._head = 0  # 读空后回到起点，后续读取更可能连续
+        return out
+
+    def clear(self) -> int:
+        """清空，返回丢弃的帧数."""
+        count = self._size
+        self._head = 0
+        self._size = 0
+        return count
+
+
+class PcmFrame:
+    """引用计数的只读 PCM 帧（由 PcmFramePool 发放，多个监听器共享）.
+
+    - data：只读视图（writeable=False），仅在持有引用期间有效
+    - retain/release：跨调用持有（如入队异步处理）须 retain，用完 release；
+      引用归零后底层缓冲回池复用
+    - copy()：需要修改数据的消费者显式取一份可写拷贝
+    """
+
+    __slots__ = ("_pool", "_buf", "_refs", "data")
+
+    def __init__(self, pool: "PcmFramePool | None", size: int):
+        self._pool = pool
+        self._buf = np.empty(size, dtype=np.float32)
+        self._refs = 0
+        self.data = self._buf
+        self._set_len(size)
+
+    def _set_len(self, n: int) -> None:
+        view = self._buf[:n]
+        view.flags.writeable = False
+        self.data = view
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is not None and dtype != self.data.dtype:
+            return self.data.astype(dtype)
+        return self.data
+
+    def retain(self) -> "PcmFrame":
+        pool = self._pool
+        if pool is None:
+            self._refs += 1
+            return self
+        with pool._lock:
+            self._refs += 1
+        return self
+
+    def release(self) -> None:
+        pool = self._pool
+        if pool is None:
+            self._refs -= 1
+            return
+        pool._release(self)
+
+    def copy(self) -> np.ndarray:
+        return self.data.copy()
+
+
+class PcmFramePool:
+    """PcmFrame 池（采集线程 acquire，任意线程 release）.
+
+    池空时新建帧；空闲帧超过 max_free 时多余的直接丢弃（不回池），
+    避免突发积压后长期占用内存。
+    """
+
+    def __init__(self, max_free: int = 128):
+        self._free: list[PcmFrame] = []
+        self._max_free = int(max_free)
+        self._lock = threading.Lock()
+        self.allocated = 0
+
+    def acquire(self, pcm: np.ndarray) -> PcmFrame:
+        """拷贝 pcm（单声道 float32）进池化帧，返回引用计数为 1 的帧."""
+        pcm = pcm.reshape(-1)
+        n = len(pcm)
+        with self._lock:
+            frame = None
+            while self._free:
+                candidate = self._free.pop()
+                if candidate._buf.size >= n:
+                    frame = candidate
+                    break
+            if frame is None:
+                frame = PcmFrame(self, n)
+                self.allocated += 1
+            frame._refs = 1
+
+        np.copyto(frame._buf[:n], pcm, casting="same_kind")
+        if len(frame.data) != n:
+            frame._set_len(n)
+        return frame
+
+    def _release(self, frame: PcmFrame) -> None:
+        with self._lock:
+            frame._refs -= 1
+            if frame._refs > 0:
+                return
+            if frame._refs < 0:
+                raise RuntimeError("PcmFrame 重复 release")
+            if len(self._free) < self._max_free:
+                self._free.append(frame)
+
+    @property
+    def free_count(self) -> int:
+        return len(self._free)
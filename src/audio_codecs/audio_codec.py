@@ -6,9 +6,21 @@ from typing import Protocol
 
 import numpy as np
 
-from src.audio_codecs.audio_buffer import PcmFifo
+from src.audio_codecs.audio_buffer import (
+    PcmFifo,
+    PcmFrame,
+    PcmFramePool,
+    SpscPcmFifo,
+)
 from src.audio_codecs.audio_converter import AudioConverter
-from src.audio_codecs.opus_codec import OpusCodec, parse_opus_toc
+from src.audio_codecs.capture_pipeline import CapturePipeline
+from src.audio_codecs.jitter_buffer import FEC, JitterBuffer
+from src.audio_codecs.opus_codec import OpusCodec
+from src.audio_codecs.opus_packet import (
+    InboundAudioPacket,
+    packet_duration_ms,
+    parse_opus_toc,
+)
 from src.audio_codecs.stream_manager import AudioStreamManager
 from src.constants.constants import AudioConfig
 from src.logging import get_logger
@@ -25,16 +37,21 @@ _MUSIC_BACKLOG_TARGET_S = 0.30
 # TTS / 音乐 FIFO 容量（秒），超限丢最旧
 _TTS_FIFO_MAX_S = 10.0
 _MUSIC_FIFO_MAX_S = 2.0
+# FIFO 实现：locked=加锁 PcmFifo（默认），spsc=无锁单生产单消费 SpscPcmFifo
+_FIFO_IMPLS = {"locked": PcmFifo, "spsc": SpscPcmFifo}
 
 
 class AudioListener(Protocol):
     """音频监听器协议"""
 
-    def on_audio_data(self, audio_data: np.ndarray) -> None:
-        """接收音频数据
+    def on_audio_data(self, audio_data: PcmFrame) -> None:
+        """接收音频数据（所有监听器共享同一只读帧）
+
+        调用返回后帧即可能回池复用：需异步处理须先 audio_data.retain()，
+        处理完 release()；需修改数据请用 audio_data.copy()。
 
         Args:
-            audio_data: float32 音频数据
+            audio_data: 只读 float32 帧（.data 为 ndarray 视图）
         """
         ...
 
@@ -65,19 +82,25 @@ class AudioCodec:
         self.stream_manager = None
 
         # TTS 与音乐分流：各自 FIFO，输出回调里混音（互不排队阻塞）
-        self._tts_fifo = PcmFifo(
-            int(AudioConfig.OUTPUT_SAMPLE_RATE * _TTS_FIFO_MAX_S)
-        )
-        self._music_fifo = PcmFifo(
-            int(AudioConfig.OUTPUT_SAMPLE_RATE * _MUSIC_FIFO_MAX_S)
-        )
+        self._tts_fifo = self._create_fifo("tts_fifo", _TTS_FIFO_MAX_S)
+        self._music_fifo = self._create_fifo("music_fifo", _MUSIC_FIFO_MAX_S)
         self._mix_chunk = int(AudioConfig.OUTPUT_SAMPLE_RATE * 0.02)  # 20ms
         self._duck_hold = 0
+        self._alloc_mix_scratch(self._mix_chunk)
+        # 批量解码缓冲（按需增长，见 write_audio_batch）
+        self._batch_buf = np.empty(0, dtype=np.float32)
+        # 入站抖动缓冲（仅带序列号的 MQTT/UDP 音频经过）
+        self._jitter = JitterBuffer()
+        self._jitter_timer: asyncio.TimerHandle | None = None
 
         # 监听器（线程安全）
         self._encoded_callback: Callable | None = None
+        self.dtx_skipped = 0
+        # 采集线程（输入回调只拷贝，处理在线程内）
+        self._capture = CapturePipeline(self._process_capture)
         self._audio_listeners: list[AudioListener] = []
         self._listeners_lock = threading.Lock()
+        self._frame_pool = PcmFramePool()
 
         # 设备配置（初始化后填充）
         self.device_config: DeviceConfig | None = None
@@ -112,6 +135,7 @@ class AudioCodec:
                 input_sample_rate=AudioConfig.INPUT_SAMPLE_RATE,
                 output_sample_rate=AudioConfig.OUTPUT_SAMPLE_RATE,
                 channels=AudioConfig.CHANNELS,
+                encoder_options=get_config().get_config("OPUS_OPTIONS", {}),
             )
             self.opus_codec.initialize()
 
@@ -121,6 +145,9 @@ class AudioCodec:
             # 4. 按配置创建 AEC（Self far），失败自动旁路
             self._setup_aec()
 
+            # 4.5 启动采集线程（须在输入流启动前）
+            self._start_capture()
+
             # 5. 创建音频流
             self.stream_manager = AudioStreamManager(self.device_config)
             self.stream_manager.create_streams(
@@ -139,9 +166,10 @@ class AudioCodec:
             raise
 
     def _input_callback(self, indata, frames, time_info, status):
-        """输入回调：设备 → 编码 → 发送
+        """输入回调：只把设备块拷入无锁环，处理交给采集线程
 
-        数据流：多声道/高采样率 → 下混 → 重采样 → Opus编码 → 网络
+        下混/重采样/AEC/编码均在 _process_capture（采集线程）执行，
+        慢处理只造成环内积压（满则丢最旧并计数），不阻塞设备回调。
 
         Args:
             indata: float32 音频数据，shape (frames, channels)
@@ -149,45 +177,82 @@ class AudioCodec:
             time_info: 时间信息
             status: 状态标志
         """
-        if status and "overflow" not in str(status).lower():
-            logger.warning(f"输入流状态: {status}")
+        t0 = time.perf_counter()
+        if status:
+            if "overflow" in str(status).lower():
+                self._capture.device_overflows += 1
+            else:
+                logger.warning(f"输入流状态: {status}")
 
         if self._is_closing:
             return
 
         try:
-            # 1. 格式转换（下混 + 重采样）
-            # 保留 indata 的 (frames, channels) 形状，让 downmix_to_mono 正确下混
-            audio_converted = self.converter.convert_input(
-                indata, AudioConfig.INPUT_FRAME_SIZE
-            )
-            if audio_converted is None:
-                return  # 数据不足，等待下一帧
+            self._capture.push(indata)
+        except Exception as e:
+            logger.error(f"输入回调错误: {e}", exc_info=True)
+        self._capture.stats.record("callback", time.perf_counter() - t0)
 
-            # 1.5 AEC：以播放回调抽取的 far 参考消回声（旁路时原样返回）
-            if self._aec is not None and self._aec.active:
-                audio_converted = self._aec.process_near(audio_converted)
+    def _process_capture(self, block: np.ndarray) -> None:
+        """采集线程：设备块 → 下混+重采样 → AEC → Opus 编码 → 发送/监听器
 
-            # 2. Opus 编码（float32 输入）
-            if self._encoded_callback:
-                try:
-                    opus_data = self.opus_codec.encode(
-                        audio_converted, AudioConfig.INPUT_FRAME_SIZE
-                    )
+        Args:
+            block: float32 设备块，shape (frames, channels)，仅本次调用内有效
+        """
+        record = self._capture.stats.record
+
+        # 1. 格式转换（下混 + 重采样）
+        t0 = time.perf_counter()
+        audio_converted = self.converter.convert_input(
+            block, AudioConfig.INPUT_FRAME_SIZE
+        )
+        t1 = time.perf_counter()
+        record("convert", t1 - t0)
+        if audio_converted is None:
+            return  # 数据不足，等待下一块
+
+        # 1.5 AEC：以播放回调抽取的 far 参考消回声（旁路时原样返回）
+        if self._aec is not None and self._aec.active:
+            audio_converted = self._aec.process_near(audio_converted)
+            t2 = time.perf_counter()
+            record("aec", t2 - t1)
+            t1 = t2
+
+        # 2. Opus 编码（float32 输入）
+        if self._encoded_callback:
+            try:
+                opus_data = self.opus_codec.encode(
+                    audio_converted, AudioConfig.INPUT_FRAME_SIZE
+                )
+                if self.opus_codec.dtx and self.opus_codec.is_dtx_frame(opus_data):
+                    # DTX 静音帧不上送
+                    self.dtx_skipped += 1
+                else:
                     self._encoded_callback(opus_data)
-                except Exception as e:
-                    logger.warning(f"编码失败: {e}", exc_info=True)
+            except Exception as e:
+                logger.warning(f"编码失败: {e}", exc_info=True)
+            t2 = time.perf_counter()
+            record("encode", t2 - t1)
+            t1 = t2
 
-            # 3. 通知监听器（线程安全）
-            with self._listeners_lock:
-                for listener in self._audio_listeners:
-                    try:
-                        listener.on_audio_data(audio_converted.copy())
-                    except Exception as e:
-                        logger.warning(f"监听器处理失败: {e}", exc_info=True)
+        # 3. 通知监听器（线程安全；共享一份池化只读帧，不再逐监听器拷贝）
+        with self._listeners_lock:
+            if self._audio_listeners:
+                frame = self._frame_pool.acquire(audio_converted)
+                try:
+                    for listener in self._audio_listeners:
+                        try:
+                            listener.on_audio_data(frame)
+                        except Exception as e:
+                            logger.warning(f"监听器处理失败: {e}", exc_info=True)
+                finally:
+                    frame.release()
+        record("listeners", time.perf_counter() - t1)
 
-        except Exception as e:
-            logger.error(f"输入回调错误: {e}", exc_info=True)
+    @property
+    def capture_stats(self) -> dict:
+        """采集管线统计：回调/各阶段耗时（µs）、环溢出块数、设备 overflow 次数."""
+        return self._capture.snapshot()
 
     def _output_callback(self, outdata, frames, time_info, status):
         """输出回调：解码 → 转换 → 播放
@@ -212,23 +277,26 @@ class AudioCodec:
                 logger.warning(f"输出流状态: {status}")
 
         try:
+            # 混音/转换全部写入预分配缓冲，上混直接广播进 outdata，
+            # 稳态回放每次回调不分配 PCM 数组（重采样输出由 soxr 分配）
             audio_converted = None
 
             while audio_converted is None:
                 audio_data = self._pull_mixed(self._mix_chunk)
                 if audio_data is None:
                     break
-                audio_converted = self.converter.convert_output(audio_data, frames)
+                audio_converted = self.converter.convert_output(
+                    audio_data, frames, out=outdata
+                )
 
             if audio_converted is None:
-                audio_converted = self.converter.drain_output_buffer(frames)
+                audio_converted = self.converter.drain_output_buffer(
+                    frames, out=outdata
+                )
 
-            if audio_converted is None or len(audio_converted) < frames:
-                outdata.fill(0.0)
-                if audio_converted is not None and len(audio_converted) > 0:
-                    outdata[: len(audio_converted)] = audio_converted
-            else:
-                outdata[:] = audio_converted[:frames]
+            written = 0 if audio_converted is None else len(audio_converted)
+            if written < frames:
+                outdata[written:] = 0.0
 
             # AEC far：设备实际写出的最终 PCM（TTS+音乐混合，含静音保持连续）
             if self._aec is not None and self._aec.active:
@@ -238,6 +306,12 @@ class AudioCodec:
             logger.error(f"输出回调错误: {e}", exc_info=True)
             outdata.fill(0.0)
 
+    def _start_capture(self) -> None:
+        self._capture.start(
+            block_frames=self.device_config.input_frame_size,
+            channels=self.device_config.input_channels,
+        )
+
     def _configure_pipeline(self):
         """配置格式转换管线（设备 ↔ 协议）。
 
@@ -260,14 +334,30 @@ class AudioCodec:
 
         # 协议输出采样率可能随配置热重载变化，FIFO/混音块随之重建
         # （此时音频流已停止，无并发读取）
-        self._tts_fifo = PcmFifo(
-            int(AudioConfig.OUTPUT_SAMPLE_RATE * _TTS_FIFO_MAX_S)
-        )
-        self._music_fifo = PcmFifo(
-            int(AudioConfig.OUTPUT_SAMPLE_RATE * _MUSIC_FIFO_MAX_S)
-        )
+        self._tts_fifo = self._create_fifo("tts_fifo", _TTS_FIFO_MAX_S)
+        self._music_fifo = self._create_fifo("music_fifo", _MUSIC_FIFO_MAX_S)
         self._mix_chunk = int(AudioConfig.OUTPUT_SAMPLE_RATE * 0.02)
         self._duck_hold = 0
+        self._alloc_mix_scratch(self._mix_chunk)
+
+    @staticmethod
+    def _create_fifo(key: str, max_seconds: float):
+        """按 AUDIO_DEVICES.<key> 创建 FIFO（locked / spsc），未知值回退 locked."""
+        impl = "locked"
+        try:
+            impl = str(get_config().get_config(f"AUDIO_DEVICES.{key}", "locked"))
+        except Exception:
+            pass
+        fifo_cls = _FIFO_IMPLS.get(impl)
+        if fifo_cls is None:
+            logger.warning(f"未知 FIFO 实现 {key}={impl}，使用 locked")
+            fifo_cls = PcmFifo
+        return fifo_cls(int(AudioConfig.OUTPUT_SAMPLE_RATE * max_seconds))
+
+    def _alloc_mix_scratch(self, n: int) -> None:
+        """分配混音 scratch（TTS/音乐各一块，长度 n），供输出回调复用."""
+        self._tts_scratch = np.zeros(n, dtype=np.float32)
+        self._music_scratch = np.zeros(n, dtype=np.float32)
 
     def _pull_mixed(self, n: int) -> np.ndarray | None:
         """输出回调线程：从 TTS/音乐 FIFO 各取 n 样本并混音.
@@ -276,9 +366,14 @@ class AudioCodec:
         - 两路都空 → None（上层进入静音/欠载路径）
         - TTS 在场时音乐按 _MUSIC_DUCK_GAIN 闪避，并在 TTS
           帧间隙保持若干块（避免闪避增益抖动）
+
+        返回值是编解码器持有的 scratch，下一次调用前有效。
         """
-        tts = self._tts_fifo.pull(n)
-        music = self._music_fifo.pull(n)
+        if self._tts_scratch.shape[0] != n:
+            self._alloc_mix_scratch(n)
+
+        tts = self._tts_fifo.pull(n, out=self._tts_scratch)
+        music = self._music_fifo.pull(n, out=self._music_scratch)
 
         if tts is None and music is None:
             return None
@@ -292,9 +387,12 @@ class AudioCodec:
             return tts
         if tts is None:
             if self._duck_hold > 0:
-                music *= _MUSIC_DUCK_GAIN
+                np.multiply(music, _MUSIC_DUCK_GAIN, out=music)
             return music
-        return np.clip(tts + music * _MUSIC_DUCK_GAIN, -1.0, 1.0)
+        np.multiply(music, _MUSIC_DUCK_GAIN, out=music)
+        np.add(tts, music, out=tts)
+        np.clip(tts, -1.0, 1.0, out=tts)
+        return tts
 
     def _setup_aec(self):
         """按 AEC_OPTIONS.ENABLED 创建/重建 AEC 引擎（Self far）。
@@ -323,6 +421,8 @@ class AudioCodec:
                 enable_preprocess=bool(
                     config.get_config("AEC_OPTIONS.ENABLE_PREPROCESS", True)
                 ),
+                # 在线估计延迟，FRAME_DELAY 换算值仅作初始值
+                auto_delay=bool(config.get_config("AEC_OPTIONS.AUTO_DELAY", True)),
             )
         except Exception as e:
             logger.warning(f"创建 AEC 引擎失败，已旁路: {e}", exc_info=True)
@@ -336,6 +436,14 @@ class AudioCodec:
         aec = self._aec
         return bool(aec is not None and aec.active)
 
+    @property
+    def aec_metrics(self) -> dict:
+        """AEC 延迟估计与 ERLE 指标；引擎未在位时为空字典."""
+        aec = self._aec
+        if aec is None or not aec.active:
+            return {}
+        return aec.metrics
+
     def set_encoded_callback(self, callback: Callable[[bytes], None]):
         """设置编码回调
 
@@ -379,22 +487,10 @@ class AudioCodec:
             opus_data: Opus 编码数据
         """
         try:
-            toc_info = parse_opus_toc(opus_data)
-            if toc_info is None:
+            frame_size = self._opus_frame_size(opus_data)
+            if frame_size is None:
                 return
 
-            if not self._server_opus_logged:
-                self._server_opus_logged = True
-                logger.info(
-                    f"服务端 Opus 参数: "
-                    f"{toc_info['mode']} {toc_info['bandwidth_hz']} | "
-                    f"帧时长 {toc_info['duration_ms']}ms "
-                    f"({toc_info['frame_ms']}ms×{toc_info['num_frames']})"
-                )
-
-            frame_size = int(
-                AudioConfig.OUTPUT_SAMPLE_RATE * toc_info["duration_ms"] / 1000
-            )
             audio_float32 = self.opus_codec.decode(opus_data, frame_size)
 
             self._tts_fifo.push(audio_float32)
@@ -402,6 +498,129 @@ class AudioCodec:
         except Exception as e:
             logger.warning(f"音频写入失败: {e}", exc_info=True)
 
+    async def write_audio_batch(
+        self, packets: list[bytes], sequences: list[int] | None = None
+    ):
+        """批量解码并播放原始 Opus 包（包装为 InboundAudioPacket 后走 write_packets）.
+
+        Args:
+            packets: 按到达顺序排列的 Opus 包
+            sequences: 与 packets 一一对应的传输序列号；None 表示无序号（WebSocket）
+        """
+        if sequences is None:
+            records = [InboundAudioPacket(p) for p in packets]
+        else:
+            records = [
+                InboundAudioPacket(p, s)
+                for p, s in zip(packets, sequences, strict=True)
+            ]
+        await self.write_packets(records)
+
+    async def write_packets(self, packets: list[InboundAudioPacket]):
+        """批量解码并播放（TTS 突发：服务端快于实时下发时）
+
+        逐包背靠背解码进同一块连续缓冲，最后一次性 push 进 FIFO，
+        相比逐包 write_audio 少了 N-1 次取锁和中间数组分配。
+        单包解码失败只跳过该包，不影响同批其它包。
+        包时长已在协议层入队时查表得出，这里不再解析 TOC。
+
+        带序列号（MQTT/UDP）时先经抖动缓冲重排，缺包用 FEC/PLC 补偿。
+
+        Args:
+            packets: 按到达顺序排列的入站包记录
+        """
+        if not packets:
+            return
+        if not self._server_opus_logged:
+            self._log_server_opus(packets[0].data)
+
+        rate = AudioConfig.OUTPUT_SAMPLE_RATE
+        if packets[0].sequence is not None:
+            for packet in packets:
+                if packet.duration_ms and packet.sequence is not None:
+                    self._jitter.put(packet.sequence, packet.data, packet.duration_ms)
+            self._drain_jitter()
+            return
+
+        jobs = [
+            (packet.data, int(rate * packet.duration_ms / 1000), False)
+            for packet in packets
+            if packet.duration_ms
+        ]
+        self._decode_to_fifo(jobs)
+
+    def _decode_to_fifo(self, jobs: list[tuple[bytes | None, int, bool]]) -> None:
+        """按 (packet, frame_size, fec) 顺序解码进 _batch_buf 并一次性入 FIFO."""
+        total = sum(frame_size for _p, frame_size, _f in jobs) * self.opus_codec.channels
+        if total == 0:
+            return
+        if self._batch_buf.size < total:
+            self._batch_buf = np.empty(total, dtype=np.float32)
+
+        buf = self._batch_buf
+        pos = 0
+        for opus_data, frame_size, fec in jobs:
+            try:
+                pos += self.opus_codec.decode_into(
+                    opus_data, frame_size, buf[pos:], decode_fec=fec
+                )
+            except Exception as e:
+                logger.warning(f"音频批量解码失败（跳过 1 包）: {e}")
+
+        if pos:
+            # FIFO.push 内部拷贝，复用 _batch_buf 安全
+            self._tts_fifo.push(buf[:pos])
+
+    def _drain_jitter(self) -> None:
+        """取出抖动缓冲可播放项解码入 FIFO；仍有缺口则定时再取（event loop 线程）."""
+        if self._jitter_timer is not None:
+            self._jitter_timer.cancel()
+            self._jitter_timer = None
+
+        rate = AudioConfig.OUTPUT_SAMPLE_RATE
+        jobs = [
+            (opus_data, int(rate * duration_ms / 1000), kind == FEC)
+            for kind, opus_data, duration_ms in self._jitter.pop_ready()
+        ]
+        self._decode_to_fifo(jobs)
+
+        delay = self._jitter.next_deadline()
+        if delay is not None and not self._is_closing:
+            loop = asyncio.get_running_loop()
+            self._jitter_timer = loop.call_later(delay + 0.002, self._drain_jitter)
+
+    @property
+    def jitter_stats(self) -> dict:
+        """入站抖动缓冲统计（目标/实际深度、抖动、FEC/PLC 补偿次数等）."""
+        return self._jitter.stats
+
+    def _reset_jitter(self) -> None:
+        if self._jitter_timer is not None:
+            self._jitter_timer.cancel()
+            self._jitter_timer = None
+        self._jitter.reset()
+
+    def _opus_frame_size(self, opus_data: bytes) -> int | None:
+        """由 TOC 推出每声道解码样本数；首包记录服务端 Opus 参数."""
+        duration_ms = packet_duration_ms(opus_data)
+        if duration_ms is None:
+            return None
+        if not self._server_opus_logged:
+            self._log_server_opus(opus_data)
+        return int(AudioConfig.OUTPUT_SAMPLE_RATE * duration_ms / 1000)
+
+    def _log_server_opus(self, opus_data: bytes) -> None:
+        toc_info = parse_opus_toc(opus_data)
+        if toc_info is None:
+            return
+        self._server_opus_logged = True
+        logger.info(
+            f"服务端 Opus 参数: "
+            f"{toc_info['mode']} {toc_info['bandwidth_hz']} | "
+            f"帧时长 {toc_info['duration_ms']}ms "
+            f"({toc_info['frame_ms']}ms×{toc_info['num_frames']})"
+        )
+
     async def write_pcm_direct(self, pcm_float32: np.ndarray):
         """写入音乐 PCM（float32，供 MusicPlayer 使用），带水位背压.
 
@@ -420,6 +639,7 @@ class AudioCodec:
     async def clear_audio_queue(self):
         """清空 TTS 播放队列（打断/中止时用；音乐队列不受影响）."""
         self._server_opus_logged = False
+        self._reset_jitter()
         self.converter.clear_output_buffer()
         count = self._tts_fifo.clear()
         if count > 0:
@@ -484,6 +704,8 @@ class AudioCodec:
             if self.stream_manager:
                 self.stream_manager.stop()
                 logger.debug("AudioCodec: 已停止当前音频流")
+            # 采集线程可能仍在处理积压块：先停，再改转换器/编码器/AEC
+            self._capture.stop()
 
             # 2. 热插拔：重建 PortAudio 上下文后再按名称匹配
             if reenumerate:
@@ -507,6 +729,7 @@ class AudioCodec:
                 input_sample_rate=AudioConfig.INPUT_SAMPLE_RATE,
                 output_sample_rate=AudioConfig.OUTPUT_SAMPLE_RATE,
                 channels=AudioConfig.CHANNELS,
+                encoder_options=get_config().get_config("OPUS_OPTIONS", {}),
             )
             self.opus_codec.initialize()
 
@@ -516,6 +739,7 @@ class AudioCodec:
 
             # 5.5 重建 AEC（far 采样率跟随新输出设备，滤波器状态清零）
             self._setup_aec()
+            self._start_capture()
 
             # 6. 重新创建音频流
             self.stream_manager = AudioStreamManager(self.device_config)
@@ -539,9 +763,10 @@ class AudioCodec:
         self._is_closing = True
 
         try:
-            # 1. 停止音频流
+            # 1. 停止音频流与采集线程
             if self.stream_manager:
                 self.stream_manager.stop()
+            self._capture.stop()
 
             # 2. 清空队列
             await self.clear_audio_queue()
@@ -582,6 +807,7 @@ class AudioCodec:
             # 1. 停止音频流（同步）
             if self.stream_manager:
                 self.stream_manager.stop()
+            self._capture.stop()
 
             # 2. 清空队列（同步版本）
             count = self._tts_fifo.clear() + self._music_fifo.clear()
@@ -1,26 +1,32 @@
-from collections import deque
-
 import numpy as np
 import soxr
 
+from src.audio_codecs.audio_buffer import PcmRingBuffer
 from src.logging import get_logger
 from src.utils.audio_utils import downmix_to_mono, upmix_mono_to_channels
 
 logger = get_logger()
 
+# 重采样余量环形缓冲容量（秒）；正常余量不足一帧，超限丢最旧
+_RING_BUFFER_S = 1.0
+
 
 class AudioConverter:
     """音频格式转换器
 
     负责采样率转换和声道转换，内部维护缓冲区以凑够目标帧大小。
+    缓冲区为预分配的 PcmRingBuffer（回调线程内读写），
+    取帧时返回连续视图或至多一次切片拷贝，不再逐样本搬运。
     """
 
     def __init__(self):
         """初始化转换器"""
         self.input_resampler = None
         self.output_resampler = None
-        self._input_buffer = deque()
-        self._output_buffer = deque()
+        self._input_buffer = PcmRingBuffer(48000)
+        self._output_buffer = PcmRingBuffer(48000)
+        # TTS 打断时由 asyncio 线程置位，输出回调线程下次取数前执行清空
+        self._output_clear_pending = False
         self.needs_input_downmix = False
         self.needs_output_upmix = False
         self.input_channels = 1
@@ -43,6 +49,10 @@ class AudioConverter:
         if self.needs_input_downmix:
             logger.info(f"输入声道下混: {from_channels}ch → {to_channels}ch")
 
+        self._input_buffer = PcmRingBuffer(
+            int(to_rate * _RING_BUFFER_S), channels=to_channels
+        )
+
         if from_rate != to_rate:
             self.input_resampler = soxr.ResampleStream(
                 from_rate,
@@ -66,6 +76,11 @@ class AudioConverter:
         """
         self.output_channels = to_channels
         self.needs_output_upmix = to_channels > from_channels
+        # 上混前缓冲（协议声道数），按设备采样率计容量
+        self._output_buffer = PcmRingBuffer(
+            int(to_rate * _RING_BUFFER_S), channels=from_channels
+        )
+        self._output_clear_pending = False
 
         if from_rate != to_rate:
             self.output_resampler = soxr.ResampleStream(
@@ -102,78 +117,95 @@ class AudioConverter:
         if self.input_resampler:
             resampled = self.input_resampler.resample_chunk(audio, last=False)
             if len(resampled) > 0:
-                self._input_buffer.extend(resampled)
+                self._input_buffer.write(resampled)
 
-            # 累积到目标大小
-            if len(self._input_buffer) < target_size:
+            # 累积到目标大小后取出一帧（环形缓冲视图，下次写入前有效）
+            frame = self._input_buffer.read(target_size)
+            if frame is None:
                 return None
-
-            # 取出一帧
-            frame_data = [self._input_buffer.popleft() for _ in range(target_size)]
-            return np.array(frame_data, dtype=np.float32)
+            return frame.reshape(-1)
 
         return audio
 
     def convert_output(
-        self, audio: np.ndarray, target_frames: int
+        self,
+        audio: np.ndarray,
+        target_frames: int,
+        out: np.ndarray | None = None,
     ) -> np.ndarray | None:
         """输出转换：单声道/24kHz → 多声道/高采样率
 
         Args:
             audio: float32 音频数据
             target_frames: 目标帧数
+            out: 可选的 (frames, channels) 目标缓冲（通常即 outdata）；
+                给出时上混直接广播写入，不再分配中间数组
 
         Returns:
-            转换后的 float32 数据
+            转换后的 float32 数据（给出 out 时为 out 的前缀视图）
         """
         # 1. 重采样
         if self.output_resampler:
+            self._apply_pending_output_clear()
             resampled = self.output_resampler.resample_chunk(audio, last=False)
             if len(resampled) > 0:
-                self._output_buffer.extend(resampled)
+                self._output_buffer.write(resampled)
 
             # 取出目标帧数
-            if len(self._output_buffer) < target_frames:
+            frame = self._output_buffer.read(target_frames)
+            if frame is None:
                 return None
+            audio = frame.reshape(-1)
 
-            frame_data = [self._output_buffer.popleft() for _ in range(target_frames)]
-            audio = np.array(frame_data, dtype=np.float32)
-
-        # 2. 上混（使用 audio_utils）
-        if self.needs_output_upmix:
-            audio = upmix_mono_to_channels(audio, self.output_channels)
-        else:
-            audio = audio.reshape(-1, 1)
-
-        return audio
+        # 2. 上混
+        return self._emit_output(audio, out)
 
-    def drain_output_buffer(self, target_frames: int) -> np.ndarray | None:
+    def drain_output_buffer(
+        self, target_frames: int, out: np.ndarray | None = None
+    ) -> np.ndarray | None:
         """排出 resampler 缓冲区中的剩余数据（带上混）。
 
         用于队列耗尽但缓冲区差少量样本时，避免整帧静音。
+        out 语义同 convert_output。
         """
-        available = min(len(self._output_buffer), target_frames)
-        if available == 0:
+        self._apply_pending_output_clear()
+        frame = self._output_buffer.read_available(target_frames)
+        if frame is None:
             return None
-
-        frame_data = [self._output_buffer.popleft() for _ in range(available)]
-        audio = np.array(frame_data, dtype=np.float32)
-
+        return self._emit_output(frame.reshape(-1), out)
+
+    def _emit_output(
+        self, audio: np.ndarray, out: np.ndarray | None
+    ) -> np.ndarray:
+        """单声道 → 设备声道；有 out 时原地广播写入（各声道同值）."""
+        if out is not None:
+            n = min(audio.shape[0], out.shape[0])
+            out[:n] = audio[:n, None]
+            return out[:n]
+
+        # 无目标缓冲：分配新数组（使用 audio_utils）
         if self.needs_output_upmix:
-            audio = upmix_mono_to_channels(audio, self.output_channels)
-        else:
-            audio = audio.reshape(-1, 1)
+            return upmix_mono_to_channels(audio, self.output_channels)
+        return audio.reshape(-1, 1)
 
-        return audio
+    def _apply_pending_output_clear(self):
+        if self._output_clear_pending:
+            self._output_clear_pending = False
+            self._output_buffer.clear()
 
     def clear_output_buffer(self):
-        """只清空输出缓冲区（用于 TTS 停止时防回声，不影响输入管线）"""
-        self._output_buffer.clear()
+        """只清空输出缓冲区（用于 TTS 停止时防回声，不影响输入管线）
+
+        可从非回调线程调用：仅置位，由输出回调线程在下次取数前执行，
+        环形缓冲读写索引始终只在回调线程内修改。
+        """
+        self._output_clear_pending = True
 
     def clear_buffers(self):
         """清空缓冲区"""
         self._input_buffer.clear()
         self._output_buffer.clear()
+        self._output_clear_pending = False
         logger.debug("音频转换器缓冲区已清空")
 
     def close(self):
@@ -0,0 +1,204 @@
+"""采集处理线程：把下混/重采样/AEC/编码移出 PortAudio 输入回调.
+
+输入回调只把设备块拷进无锁 SpscPcmFifo（交错多声道）并唤醒采集线程；
+采集线程按设备块大小取出后调用处理函数。AEC 偶发变慢只会让环内积压，
+不再拖慢回调导致设备丢输入；环满丢最旧并计入溢出。
+
+计时分开统计：callback（回调内耗时）与各处理阶段（由处理函数 record）。
+"""
+
+import threading
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+from src.audio_codecs.audio_buffer import SpscPcmFifo
+from src.logging import get_logger
+
+logger = get_logger()
+
+# 环容量（设备块数）：20ms 块约 0.5s 缓冲
+_RING_BLOCKS = 25
+# 唤醒等待超时（秒），仅用于检查退出标志
+_WAKE_TIMEOUT_S = 0.1
+# stop 等待采集线程退出的上限（秒）
+_STOP_JOIN_TIMEOUT_S = 1.0
+# 周期性统计日志间隔（秒）
+_REPORT_INTERVAL_S = 60.0
+
+
+class _StageStat:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class CaptureStats:
+    """各阶段耗时统计（每个阶段只由一个线程写入，无需加锁）."""
+
+    def __init__(self):
+        self._stages: dict[str, _StageStat] = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        stat = self._stages.get(stage)
+        if stat is None:
+            stat = self._stages[stage] = _StageStat()
+        stat.count += 1
+        stat.total += seconds
+        if seconds > stat.max:
+            stat.max = seconds
+
+    def snapshot(self) -> dict:
+        return {
+            name: {
+                "count": s.count,
+                "avg_us": round(s.total / s.count * 1e6, 1) if s.count else 0.0,
+                "max_us": round(s.max * 1e6, 1),
+            }
+            for name, s in list(self._stages.items())
+        }
+
+    def reset(self) -> None:
+        self._stages = {}
+
+
+class CapturePipeline:
+    """输入回调 → 无锁环 → 采集线程.
+
+    - push：输入回调线程调用，只做拷贝
+    - process(block)：采集线程调用，block 为 (frames, channels) float32，
+      仅在本次调用内有效（底层缓冲复用）
+    """
+
+    def __init__(self, process: Callable[[np.ndarray], None], name: str = "audio-capture"):
+        self._process = process
+        self._name = name
+        self._ring: SpscPcmFifo | None = None
+        self._block_frames = 0
+        self._channels = 1
+        self._block_buf = np.empty(0, dtype=np.float32)
+
+        # 唤醒/停止事件每个采集线程各持一份：旧线程不会被新一轮 start 复活，
+        # 也不会清掉新线程的唤醒
+        self._wake = threading.Event()
+        self._halt: threading.Event | None = None
+        self._thread: threading.Thread | None = None
+        # stop 时未在超时内退出的旧线程（已置停止，只差处理完手头这一块）
+        self._retired: list[threading.Thread] = []
+        self._running = False
+
+        self.stats = CaptureStats()
+        self.device_overflows = 0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def overflow_blocks(self) -> int:
+        """环满丢弃的设备块数."""
+        ring = self._ring
+        if ring is None or not self._block_frames:
+            return 0
+        return ring.dropped // (self._block_frames * self._channels)
+
+    @property
+    def backlog_blocks(self) -> int:
+        ring = self._ring
+        if ring is None or not self._block_frames:
+            return 0
+        return ring.size // (self._block_frames * self._channels)
+
+    def snapshot(self) -> dict:
+        return {
+            "stages": self.stats.snapshot(),
+            "overflow_blocks": self.overflow_blocks,
+            "device_overflows": self.device_overflows,
+            "backlog_blocks": self.backlog_blocks,
+        }
+
+    def start(self, block_frames: int, channels: int) -> None:
+        """按设备块参数建环并启动采集线程（会先 stop 旧线程）."""
+        self.stop()
+        self._block_frames = int(block_frames)
+        self._channels = int(channels)
+        block_samples = self._block_frames * self._channels
+        self._ring = SpscPcmFifo(block_samples * _RING_BLOCKS)
+        self._block_buf = np.empty(block_samples, dtype=np.float32)
+
+        self._wake = threading.Event()
+        self._halt = threading.Event()
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._worker_loop,
+            args=(
+                self._ring,
+                self._block_buf,
+                (self._block_frames, self._channels),
+                self._wake,
+                self._halt,
+            ),
+            name=self._name,
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止采集线程（丢弃环内残留）."""
+        self._running = False
+        if self._halt is not None:
+            self._halt.set()
+        self._wake.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            if thread.is_alive() and thread is not threading.current_thread():
+                thread.join(_STOP_JOIN_TIMEOUT_S)
+            self._retired.append(thread)
+        self._retired = [t for t in self._retired if t.is_alive()]
+        if self._retired:
+            logger.warning(f"采集线程未在超时内退出（{len(self._retired)} 个），已置停止")
+        if self._ring is not None:
+            self._ring.clear()
+
+    def push(self, indata: np.ndarray) -> None:
+        """输入回调线程：拷贝设备块进环并唤醒采集线程."""
+        ring = self._ring
+        if ring is None or not self._running:
+            return
+        ring.push(indata)
+        self._wake.set()
+
+    def _worker_loop(
+        self,
+        ring: SpscPcmFifo,
+        block_buf: np.ndarray,
+        shape: tuple[int, int],
+        wake: threading.Event,
+        halt: threading.Event,
+    ) -> None:
+        """采集线程：环、块缓冲与事件都属于本线程这一轮，不读共享的当前值."""
+        block_samples = block_buf.shape[0]
+        next_report = time.monotonic() + _REPORT_INTERVAL_S
+
+        while not halt.is_set():
+            wake.wait(_WAKE_TIMEOUT_S)
+            # 先清标志再取：清之后到达的块会重新置位，不会漏唤醒
+            wake.clear()
+
+            while not halt.is_set() and ring.size >= block_samples:
+                flat = ring.pull(block_samples, out=block_buf)
+                t0 = time.perf_counter()
+                try:
+                    self._process(flat.reshape(shape))
+                except Exception as e:
+                    logger.error(f"采集处理错误: {e}", exc_info=True)
+                self.stats.record("worker", time.perf_counter() - t0)
+
+            now = time.monotonic()
+            if now >= next_report:
+                next_report = now + _REPORT_INTERVAL_S
+                logger.debug(f"采集管线统计: {self.snapshot()}")
@@ -0,0 +1,245 @@
+"""入站 Opus 自适应抖动缓冲.
+
+按 UDP nonce 序列号重排；缺包等待至目标时延后补洞：
+- 下一包已到：用其带内 FEC 恢复丢失帧（"fec"）
+- 否则：解码器 PLC 生成补偿帧（"plc"）
+
+流起始（首包/重同步/重置后）先滞留目标时延再确定起始序号，
+期间更早的包到达则前移起点，开头的乱序同样被吸收。
+
+目标时延随到达抖动自适应：以语段内「到达时刻 − 媒体时间」的最小值为基准，
+统计迟于基准的部分。TTS 快于实时下发（包提前到）不计为抖动；
+到达间隔过长（句间停顿、服务端暂停）视为新语段，重置基准。
+纯逻辑、不做解码，时间可注入，便于测试。
+"""
+
+import time
+from collections.abc import Callable
+
+# 补洞等待时延范围（毫秒）及抖动倍数：target = min + gain × jitter
+_MIN_DELAY_MS = 40.0
+_MAX_DELAY_MS = 400.0
+_JITTER_GAIN = 3.0
+# 单次缺口超过该帧数不再逐帧补偿，直接跳过（避免长时间 PLC 嗡鸣）
+_MAX_CONCEAL_FRAMES = 5
+# 序列号跳变超过该值视为新流（会话重建/服务端重置），直接重同步
+_RESYNC_DISTANCE = 64
+# 到达间隔超过该值（毫秒）视为新语段：抖动基准重置，该间隔本身不计入
+_TALKSPURT_GAP_MS = 300.0
+
+_SEQ_MOD = 1 << 32
+
+# 输出项类型
+NORMAL = "normal"
+FEC = "fec"
+PLC = "plc"
+
+
+def _seq_diff(a: int, b: int) -> int:
+    """a - b（32 位序列号回绕意义下的有符号差）."""
+    return ((a - b + (_SEQ_MOD >> 1)) % _SEQ_MOD) - (_SEQ_MOD >> 1)
+
+
+class JitterBuffer:
+    """Opus 包抖动缓冲（event loop 单线程使用）.
+
+    - put：按序列号收包（迟到/重复包计数后丢弃）
+    - pop_ready：取出可播放项 (kind, packet, duration_ms)，
+      kind 为 NORMAL / FEC（packet 为下一包，需 decode_fec）/ PLC（packet 为 None）
+    - next_deadline：距下一次需要补洞的秒数，供调用方定时 pop_ready
+    """
+
+    def __init__(
+        self,
+        min_delay_ms: float = _MIN_DELAY_MS,
+        max_delay_ms: float = _MAX_DELAY_MS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._min_delay_ms = float(min_delay_ms)
+        self._max_delay_ms = float(max(max_delay_ms, min_delay_ms))
+        self._clock = clock
+
+        self._held: dict[int, tuple[bytes, float, float]] = {}
+        self._ready: list[tuple[str, bytes | None, float]] = []
+        self._next: int | None = None
+        # 起始序号是否已确定（流起始滞留目标时延后确定）
+        self._anchored = False
+
+        # 抖动估计（毫秒）：语段内相对时延 = 到达时刻 − 媒体时间，以最小值为基准
+        self._jitter_ms = 0.0
+        self._last_seq: int | None = None
+        self._last_arrival = 0.0
+        self._media_ms = 0.0
+        self._base_ms: float | None = None
+
+        # 统计
+        self.received = 0
+        self.late = 0
+        self.duplicate = 0
+        self.reordered = 0
+        self.fec_recovered = 0
+        self.plc_concealed = 0
+        self.skipped = 0
+        self.resyncs = 0
+
+    # ---- 属性 ----
+
+    @property
+    def jitter_ms(self) -> float:
+        return self._jitter_ms
+
+    @property
+    def target_delay_ms(self) -> float:
+        target = self._min_delay_ms + _JITTER_GAIN * self._jitter_ms
+        return min(self._max_delay_ms, target)
+
+    @property
+    def depth_ms(self) -> float:
+        """当前滞留在缓冲中的音频时长."""
+        return sum(d for _p, _t, d in self._held.values())
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "target_depth_ms": round(self.target_delay_ms, 1),
+            "actual_depth_ms": round(self.depth_ms, 1),
+            "jitter_ms": round(self._jitter_ms, 1),
+            "held_packets": len(self._held),
+            "received": self.received,
+            "late": self.late,
+            "duplicate": self.duplicate,
+            "reordered": self.reordered,
+            "fec_recovered": self.fec_recovered,
+            "plc_concealed": self.plc_concealed,
+            "skipped": self.skipped,
+            "resyncs": self.resyncs,
+        }
+
+    # ---- 写入 ----
+
+    def put(
+        self,
+        seq: int,
+        packet: bytes,
+        duration_ms: float,
+        now: float | None = None,
+    ) -> None:
+        now = self._clock() if now is None else now
+        seq &= _SEQ_MOD - 1
+        self.received += 1
+
+        if self._next is None:
+            self._next = seq
+
+        diff = _seq_diff(seq, self._next)
+        if abs(diff) > _RESYNC_DISTANCE:
+            self._resync(seq)
+            diff = 0
+        elif diff < 0:
+            if self._anchored:
+                self.late += 1
+                return
+            # 起始滞留期内更早的包：前移起点而非按迟到丢弃
+            self._next = seq
+        if seq in self._held:
+            self.duplicate += 1
+            return
+
+        self._update_jitter(seq, duration_ms, now)
+        if any(_seq_diff(s, seq) > 0 for s in self._held):
+            # 序号更大的包先到：乱序
+            self.reordered += 1
+        self._held[seq] = (packet, now, float(duration_ms))
+
+    def _update_jitter(self, seq: int, duration_ms: float, now: float) -> None:
+        """按序推进的包更新抖动；乱序补到的旧包不参与."""
+        now_ms = now * 1000.0
+        if self._last_seq is not None:
+            step = _seq_diff(seq, self._last_seq)
+            if step <= 0:
+                return
+            if now_ms - self._last_arrival * 1000.0 > _TALKSPURT_GAP_MS:
+                self._base_ms = None
+            self._media_ms += step * duration_ms
+        self._last_seq = seq
+        self._last_arrival = now
+
+        relative = now_ms - self._media_ms
+        if self._base_ms is None or relative < self._base_ms:
+            # 新语段或包比基准更早到（快于实时下发）：更新基准，不计抖动样本
+            self._base_ms = relative
+            return
+        self._jitter_ms += (relative - self._base_ms - self._jitter_ms) / 16.0
+
+    def _resync(self, seq: int) -> None:
+        """新流：旧流滞留包按序直接放出，期望序号跳到 seq."""
+        self.resyncs += 1
+        for s in sorted(self._held, key=lambda s: _seq_diff(s, self._next)):
+            packet, _t, duration = self._held[s]
+            self._ready.append((NORMAL, packet, duration))
+        self._held.clear()
+        self._next = seq
+        self._anchored = False
+        self._last_seq = None
+        self._base_ms = None
+
+    # ---- 读出 ----
+
+    def pop_ready(self, now: float | None = None) -> list[tuple[str, bytes | None, float]]:
+        now = self._clock() if now is None else now
+        out, self._ready = self._ready, []
+
+        if not self._anchored:
+            # 流起始：最早滞留包等够目标时延再确定起点，吸收开头的乱序
+            if not self._held or self._held_age_ms(now) < self.target_delay_ms:
+                return out
+            self._anchored = True
+
+        while self._held:
+            entry = self._held.pop(self._next, None)
+            if entry is not None:
+                out.append((NORMAL, entry[0], entry[2]))
+                self._next = (self._next + 1) % _SEQ_MOD
+                continue
+
+            # 缺口：最早滞留包等够目标时延才补洞
+            if self._held_age_ms(now) < self.target_delay_ms:
+                break
+
+            first = min(self._held, key=lambda s: _seq_diff(s, self._next))
+            gap = _seq_diff(first, self._next)
+            packet, _t, duration = self._held[first]
+            if gap > _MAX_CONCEAL_FRAMES:
+                self.skipped += gap
+            else:
+                for i in range(gap):
+                    if i == gap - 1:
+                        out.append((FEC, packet, duration))
+                        self.fec_recovered += 1
+                    else:
+                        out.append((PLC, None, duration))
+                        self.plc_concealed += 1
+            self._next = first
+
+        return out
+
+    def _held_age_ms(self, now: float) -> float:
+        """最早滞留包已等待的毫秒数."""
+        return (now - min(t for _p, t, _d in self._held.values())) * 1000.0
+
+    def next_deadline(self, now: float | None = None) -> float | None:
+        """距下一次补洞（或结束起始滞留）的秒数；无需等待时返回 None."""
+        if not self._held or (self._anchored and self._next in self._held):
+            return None
+        now = self._clock() if now is None else now
+        oldest = min(t for _p, t, _d in self._held.values())
+        return max(0.0, oldest + self.target_delay_ms / 1000.0 - now)
+
+    def reset(self) -> None:
+        """丢弃滞留包并重置序号（打断/会话切换）；统计与抖动估计保留."""
+        self._held.clear()
+        self._ready.clear()
+        self._next = None
+        self._anchored = False
+        self._last_seq = None
+        self._base_ms = None
@@ -1,76 +1,39 @@
 import numpy as np
 
+from src.audio_codecs.opus_packet import parse_opus_toc  # noqa: F401
+from src.logging import get_logger
+
 # ============================================================
-# Opus 库加载（必须在导入 opuslib 之前）
+# Opus 库按需加载：opuslib 导入时即加载动态库，必须先 setup_opus()。
+# 推迟到首个编解码器 initialize()，导入本模块不加载 libopus。
 # ============================================================
-from src.utils.opus_loader import setup_opus
-
-setup_opus()
+opuslib = None
+ctl_api = None
+decoder_api = None
+encoder_api = None
 
-# 必须在 setup_opus() 之后导入
-import opuslib  # noqa: E402
-import opuslib.api.decoder as decoder_api  # noqa: E402
-import opuslib.api.encoder as encoder_api  # noqa: E402
 
-from src.logging import get_logger  # noqa: E402
+def _load_opuslib() -> None:
+    global opuslib, ctl_api, decoder_api, encoder_api
+    if opuslib is not None:
+        return
 
-logger = get_logger()
+    from src.utils.opus_loader import setup_opus
 
+    setup_opus()
 
-_OPUS_BANDWIDTHS = {
-    "NB": "8kHz", "MB": "12kHz", "WB": "16kHz",
-    "SWB": "24kHz", "FB": "48kHz",
-}
+    # 必须在 setup_opus() 之后导入
+    import opuslib
+    import opuslib.api.ctl as ctl_api
+    import opuslib.api.decoder as decoder_api
+    import opuslib.api.encoder as encoder_api
 
 
-def parse_opus_toc(opus_data: bytes) -> dict:
-    """从 Opus 包的 TOC 字节解析编码参数。
+logger = get_logger()
 
-    根据 RFC 6716 Section 3.1 解析：
-    - TOC 高 5 位 = config（决定模式/带宽/单帧时长）
-    - TOC 低 2 位 = code（决定帧数量）
 
-    Returns:
-        dict with keys: duration_ms, frame_ms, num_frames, bandwidth, mode
-        空包返回 None
-    """
-    if not opus_data:
-        return None
-
-    toc = opus_data[0]
-    config = (toc >> 3) & 0x1F
-    code = toc & 0x03
-
-    # config → 模式 + 带宽 + 单帧时长
-    if config < 12:
-        mode = "SILK"
-        bandwidth = ("NB", "MB", "WB")[config // 4]
-        frame_ms = (10, 20, 40, 60)[config % 4]
-    elif config < 16:
-        mode = "Hybrid"
-        bandwidth = ("SWB", "FB")[(config - 12) // 2]
-        frame_ms = (10, 20)[config % 2]
-    else:
-        mode = "CELT"
-        bandwidth = ("NB", "WB", "SWB", "FB")[(config - 16) // 4]
-        frame_ms = (2.5, 5, 10, 20)[config % 4]
-
-    # code → 帧数量
-    if code == 0:
-        num_frames = 1
-    elif code <= 2:
-        num_frames = 2
-    else:
-        num_frames = (opus_data[1] & 0x3F) if len(opus_data) >= 2 else 1
-
-    return {
-        "duration_ms": frame_ms * num_frames,
-        "frame_ms": frame_ms,
-        "num_frames": num_frames,
-        "bandwidth": bandwidth,
-        "bandwidth_hz": _OPUS_BANDWIDTHS[bandwidth],
-        "mode": mode,
-    }
+# DTX 开启时静音帧只剩 TOC（≤2 字节），无需上送
+_DTX_FRAME_MAX_BYTES = 2
 
 
 class OpusCodec:
@@ -84,6 +47,7 @@ class OpusCodec:
         input_sample_rate: int,
         output_sample_rate: int,
         channels: int = 1,
+        encoder_options: dict | None = None,
     ):
         """初始化Opus编解码器
 
@@ -91,10 +55,14 @@ class OpusCodec:
             input_sample_rate: 输入采样率（编码），如 16000
             output_sample_rate: 输出采样率（解码），如 24000
             channels: 声道数，默认 1
+            encoder_options: OPUS_OPTIONS 配置（COMPLEXITY/BITRATE/VBR/DTX/
+                INBAND_FEC/PACKET_LOSS_PERC），None 值保持 libopus 默认
         """
         self.input_sample_rate = input_sample_rate
         self.output_sample_rate = output_sample_rate
         self.channels = channels
+        self.encoder_options = dict(encoder_options or {})
+        self.dtx = bool(self.encoder_options.get("DTX", False))
         self.encoder = None
         self.decoder = None
 
@@ -105,6 +73,8 @@ class OpusCodec:
             Exception: 创建失败
         """
         try:
+            _load_opuslib()
+
             # 输入编码器：16kHz单声道
             self.encoder = opuslib.Encoder(
                 self.input_sample_rate,
@@ -112,6 +82,8 @@ class OpusCodec:
                 opuslib.APPLICATION_VOIP,
             )
 
+            self._apply_encoder_options()
+
             # 输出解码器：24kHz单声道
             self.decoder = opuslib.Decoder(self.output_sample_rate, self.channels)
 
@@ -124,6 +96,44 @@ class OpusCodec:
             logger.error(f"创建Opus编解码器失败: {e}", exc_info=True)
             raise
 
+    def _apply_encoder_options(self) -> None:
+        """按 OPUS_OPTIONS 设置编码器 CTL.
+
+        直接调用 encoder_ctl：opuslib 的 inband_fec/dtx 属性 setter 有缺陷
+        （漏传参数 / 误用 GET 请求）。单项失败只告警，不影响其它项。
+        """
+        opts = self.encoder_options
+        state = self.encoder.encoder_state
+        ctls = [
+            ("COMPLEXITY", ctl_api.set_complexity, lambda v: max(0, min(10, int(v)))),
+            ("BITRATE", ctl_api.set_bitrate, int),
+            ("VBR", ctl_api.set_vbr, lambda v: int(bool(v))),
+            ("DTX", ctl_api.set_dtx, lambda v: int(bool(v))),
+            ("INBAND_FEC", ctl_api.set_inband_fec, lambda v: int(bool(v))),
+            (
+                "PACKET_LOSS_PERC",
+                ctl_api.set_packet_loss_perc,
+                lambda v: max(0, min(100, int(v))),
+            ),
+        ]
+        applied = []
+        for key, request, convert in ctls:
+            value = opts.get(key)
+            if value is None:
+                continue
+            try:
+                encoder_api.encoder_ctl(state, request, convert(value))
+                applied.append(f"{key}={convert(value)}")
+            except Exception as e:
+                logger.warning(f"设置 Opus 编码参数 {key}={value} 失败: {e}")
+        if applied:
+            logger.info(f"Opus 编码参数: {', '.join(applied)}")
+
+    @staticmethod
+    def is_dtx_frame(opus_data: bytes) -> bool:
+        """DTX 静音帧（仅 TOC，无负载）."""
+        return len(opus_data) <= _DTX_FRAME_MAX_BYTES
+
     def encode(self, pcm_float32: np.ndarray, frame_size: int) -> bytes:
         """编码 float32 PCM → Opus
 
@@ -171,6 +181,53 @@ class OpusCodec:
         # 转换为 numpy 数组
         return np.frombuffer(pcm_bytes, dtype=np.float32)
 
+    def decode_into(
+        self,
+        opus_data: bytes | None,
+        frame_size: int,
+        out: np.ndarray,
+        decode_fec: bool = False,
+    ) -> int:
+        """解码 Opus 直接写入调用方提供的 float32 缓冲（批量解码/抖动缓冲用）
+
+        绕过 opuslib.decode_float 的 ctypes 数组 + array + bytes 三次拷贝，
+        libopus 直接写进 out 的内存。
+
+        Args:
+            opus_data: Opus 编码数据；None 表示丢包，由解码器 PLC 生成补偿帧
+            frame_size: 期望的单声道样本数（每声道）；FEC/PLC 时须等于丢失帧时长
+            out: C 连续 float32 数组，长度 >= frame_size * channels
+            decode_fec: True 时从 opus_data（丢失帧的下一包）取带内 FEC 恢复丢失帧
+
+        Returns:
+            实际写入的样本数（含所有声道）
+
+        Raises:
+            RuntimeError: 解码器未初始化
+            ValueError: out 不满足要求
+            opuslib.OpusError: 解码失败
+        """
+        if self.decoder is None:
+            raise RuntimeError("解码器未初始化")
+        if (
+            out.dtype != np.float32
+            or not out.flags.c_contiguous
+            or out.size < frame_size * self.channels
+        ):
+            raise ValueError("out 必须是长度足够的 C 连续 float32 数组")
+
+        result = decoder_api.libopus_decode_float(
+            self.decoder.decoder_state,
+            opus_data,
+            len(opus_data) if opus_data else 0,
+            out.ctypes.data_as(opuslib.api.c_float_pointer),
+            frame_size,
+            int(decode_fec),
+        )
+        if result < 0:
+            raise opuslib.OpusError(result)
+        return result * self.channels
+
     def close(self):
         """释放资源，显式销毁 C 层编解码器状态.
 
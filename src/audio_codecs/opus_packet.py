@@ -0,0 +1,104 @@
+"""入站 Opus 包记录与 TOC 查表.
+
+TOC 字节（RFC 6716 Section 3.1）只有 256 种取值：
+- 高 5 位 config 决定模式/带宽/单帧时长（32 种，预先建表）
+- 低 2 位 code 决定帧数；code 0~2 时包时长只由 TOC 字节决定（预先建表），
+  code 3 才需要读第二字节的帧数
+
+协议层收到的每个音频包包装为 InboundAudioPacket（__slots__，不建 dict），
+入队时查表得到时长，经队列、抖动缓冲直达解码器，中途不再解析或切片。
+本模块不依赖 libopus，协议层可直接导入。
+"""
+
+_OPUS_BANDWIDTHS = {
+    "NB": "8kHz", "MB": "12kHz", "WB": "16kHz",
+    "SWB": "24kHz", "FB": "48kHz",
+}
+
+
+def _config_entry(config: int) -> tuple[str, str, float]:
+    """config → (模式, 带宽, 单帧时长 ms)."""
+    if config < 12:
+        return "SILK", ("NB", "MB", "WB")[config // 4], (10, 20, 40, 60)[config % 4]
+    if config < 16:
+        return "Hybrid", ("SWB", "FB")[(config - 12) // 2], (10, 20)[config % 2]
+    return "CELT", ("NB", "WB", "SWB", "FB")[(config - 16) // 4], (
+        2.5, 5, 10, 20
+    )[config % 4]
+
+
+# config(0~31) → (mode, bandwidth, frame_ms)
+TOC_CONFIGS: tuple = tuple(_config_entry(c) for c in range(32))
+
+# TOC 字节 → 包时长 ms；code 3（帧数在第二字节）为 None
+_TOC_DURATIONS: tuple = tuple(
+    None
+    if toc & 0x03 == 3
+    else TOC_CONFIGS[toc >> 3][2] * (1 if toc & 0x03 == 0 else 2)
+    for toc in range(256)
+)
+
+
+def packet_duration_ms(opus_data) -> float | None:
+    """Opus 包时长（ms）；空包返回 None."""
+    if not opus_data:
+        return None
+    toc = opus_data[0]
+    duration = _TOC_DURATIONS[toc]
+    if duration is not None:
+        return duration
+    num_frames = (opus_data[1] & 0x3F) if len(opus_data) >= 2 else 1
+    return TOC_CONFIGS[toc >> 3][2] * num_frames
+
+
+def parse_opus_toc(opus_data: bytes) -> dict | None:
+    """从 Opus 包的 TOC 字节解析编码参数（日志/诊断用，热路径请用 packet_duration_ms）.
+
+    Returns:
+        dict with keys: duration_ms, frame_ms, num_frames, bandwidth, mode
+        空包返回 None
+    """
+    if not opus_data:
+        return None
+
+    toc = opus_data[0]
+    mode, bandwidth, frame_ms = TOC_CONFIGS[toc >> 3]
+    code = toc & 0x03
+    if code == 0:
+        num_frames = 1
+    elif code <= 2:
+        num_frames = 2
+    else:
+        num_frames = (opus_data[1] & 0x3F) if len(opus_data) >= 2 else 1
+
+    return {
+        "duration_ms": frame_ms * num_frames,
+        "frame_ms": frame_ms,
+        "num_frames": num_frames,
+        "bandwidth": bandwidth,
+        "bandwidth_hz": _OPUS_BANDWIDTHS[bandwidth],
+        "mode": mode,
+    }
+
+
+class InboundAudioPacket:
+    """入站音频包：原始负载 + 传输序列号 + 查表所得时长.
+
+    Attributes:
+        data: Opus 包（协议层原样引用，不拷贝）
+        sequence: 传输序列号，仅 MQTT/UDP 提供；WebSocket 为 None
+        duration_ms: 包时长，空包为 None
+    """
+
+    __slots__ = ("data", "sequence", "duration_ms")
+
+    def __init__(self, data: bytes, sequence: int | None = None):
+        self.data = data
+        self.sequence = sequence
+        self.duration_ms = packet_duration_ms(data)
+
+    def __repr__(self) -> str:
+        return (
+            f"InboundAudioPacket({len(self.data)}B, seq={self.sequence}, "
+            f"{self.duration_ms}ms)"
+        )
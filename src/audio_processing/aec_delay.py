@@ -0,0 +1,126 @@
+"""AEC 播放→采集延迟在线估计.
+
+far（扬声器参考）与 near（麦克风原始采集）各保留一段历史，
+每隔 interval 用 FFT 做 GCC-PHAT 互相关，峰值位置即回声延迟。
+连续几次估计落在容差内才视为稳定，交给 AecEngine 更新 set_stream_delay_ms。
+
+为降低开销先 4 倍抽取（16kHz → 4kHz，块均值），1ms 级分辨率足够 APM 使用。
+仅在采集线程调用，不加锁。
+"""
+
+from collections import deque
+
+import numpy as np
+
+# 抽取倍数（16kHz → 4kHz）
+_DECIMATION = 4
+# 参与互相关的近端窗口、可搜索的最大延迟、估计间隔（秒）
+_WINDOW_S = 1.0
+_MAX_DELAY_S = 0.5
+_INTERVAL_S = 0.5
+# 能量门限（RMS）：far 静音或 near 无回声时不估计
+_MIN_FAR_RMS = 1e-3
+_MIN_NEAR_RMS = 1e-4
+# GCC-PHAT 峰值 / 平均幅度的最小比值
+_MIN_CONFIDENCE = 6.0
+# 稳定判定：最近 N 次估计的极差（毫秒）
+_STABLE_COUNT = 3
+_STABLE_SPREAD_MS = 8.0
+
+
+class _History:
+    """定长历史（双写环：最近 cap 个样本始终连续，取窗口零拷贝）."""
+
+    def __init__(self, cap: int):
+        self._cap = cap
+        self._buf = np.zeros(2 * cap, dtype=np.float32)
+        self._pos = 0
+        self.filled = 0
+
+    def write(self, x: np.ndarray) -> None:
+        n = len(x)
+        if n >= self._cap:
+            x = x[n - self._cap :]
+            n = self._cap
+        pos = self._pos
+        first = min(n, self._cap - pos)
+        for base in (0, self._cap):
+            self._buf[base + pos : base + pos + first] = x[:first]
+            if first < n:
+                self._buf[base : base + n - first] = x[first:]
+        self._pos = (pos + n) % self._cap
+        self.filled = min(self._cap, self.filled + n)
+
+    def last(self, n: int) -> np.ndarray:
+        end = self._pos + self._cap
+        return self._buf[end - n : end]
+
+
+class DelayEstimator:
+    """GCC-PHAT 延迟估计器（16kHz 单声道输入）."""
+
+    def __init__(self, rate: int = 16000):
+        self._rate = int(rate) // _DECIMATION
+        self._window = int(self._rate * _WINDOW_S)
+        self._max_lag = int(self._rate * _MAX_DELAY_S)
+        self._interval = int(self._rate * _INTERVAL_S)
+        self._near = _History(self._window)
+        self._far = _History(self._window + self._max_lag)
+        self._since = 0
+        self._nfft = 1 << int(np.ceil(np.log2(2 * self._window + self._max_lag)))
+        self._recent: deque = deque(maxlen=_STABLE_COUNT)
+
+        self.estimate_ms: float | None = None
+        self.confidence = 0.0
+        self.estimates = 0
+
+    @staticmethod
+    def _decimate(x: np.ndarray) -> np.ndarray:
+        n = len(x) - len(x) % _DECIMATION
+        return x[:n].reshape(-1, _DECIMATION).mean(axis=1, dtype=np.float32)
+
+    def feed_far(self, x: np.ndarray) -> None:
+        self._far.write(self._decimate(x))
+
+    def feed_near(self, x: np.ndarray) -> float | None:
+        """追加近端样本；到达估计间隔时计算，稳定时返回延迟（毫秒）."""
+        d = self._decimate(x)
+        self._near.write(d)
+        self._since += len(d)
+        if self._since < self._interval:
+            return None
+        self._since = 0
+        return self._estimate()
+
+    def _estimate(self) -> float | None:
+        if self._near.filled < self._window or self._far.filled < self._window + self._max_lag:
+            return None
+
+        near = self._near.last(self._window)
+        far = self._far.last(self._window + self._max_lag)
+        if (
+            np.sqrt(np.mean(far * far)) < _MIN_FAR_RMS
+            or np.sqrt(np.mean(near * near)) < _MIN_NEAR_RMS
+        ):
+            return None
+
+        # r[k] = Σ far[t + k] · near[t]；延迟 = max_lag - k
+        cross = np.fft.rfft(far, self._nfft) * np.conj(np.fft.rfft(near, self._nfft))
+        cross /= np.abs(cross) + 1e-12
+        r = np.fft.irfft(cross, self._nfft)[: self._max_lag + 1]
+
+        k = int(np.argmax(r))
+        self.confidence = float(r[k] / (np.mean(np.abs(r)) + 1e-12))
+        if self.confidence < _MIN_CONFIDENCE:
+            return None
+
+        self.estimates += 1
+        delay_ms = (self._max_lag - k) * 1000.0 / self._rate
+        self._recent.append(delay_ms)
+        if len(self._recent) < _STABLE_COUNT:
+            return None
+        if max(self._recent) - min(self._recent) > _STABLE_SPREAD_MS:
+            return None
+
+        self.estimate_ms = float(np.median(self._recent))
+        return self.estimate_ms
@@ -13,6 +13,10 @@
 设计约束：
 - 库加载/处理失败一律旁路（active=False），不影响通话主链路
 - WebRTC APM 按 10ms 帧处理；协议帧 20/40/60ms 均为其整数倍
+- 原生库只有单帧接口：每 10ms 帧仍各做一次 memmove + APM 调用；
+  float↔int16 按整块各转换一次，结果写入复用缓冲
+- auto_delay 时以 DelayEstimator 在线估计播放→采集延迟，稳定后替换初始值；
+  同时统计 far 活跃期间的 ERLE，经 metrics 对外发布
 """
 
 import ctypes
@@ -22,6 +26,8 @@ from collections import deque
 
 import numpy as np
 
+from src.audio_codecs.audio_buffer import PcmRingBuffer
+from src.audio_processing.aec_delay import DelayEstimator
 from src.logging import get_logger
 
 logger = get_logger()
@@ -31,6 +37,16 @@ _MAX_CONSECUTIVE_FAILURES = 5
 # far 待处理队列上限（输出回调块数，约 20ms/块 → 0.5s）；
 # 采集线程停转时防堆积，超限丢最旧
 _FAR_PENDING_MAX_BLOCKS = 25
+# 16k far 余量环容量（秒）
+_FAR_BUFFER_S = 1.0
+
+# 自动延迟：与当前值相差超过该值（毫秒）才更新，避免来回抖动
+_DELAY_UPDATE_MIN_MS = 5
+# ERLE 统计：far 活跃门限（RMS）与能量平滑系数
+_ERLE_FAR_RMS = 1e-3
+_ERLE_SMOOTHING = 0.95
+
+_I16_INV = 1.0 / 32768.0
 
 
 def _import_webrtc_apm():
@@ -59,6 +75,7 @@ class AecEngine:
         far_rate: int = 48000,
         delay_ms: int = 60,
         enable_preprocess: bool = True,
+        auto_delay: bool = False,
     ):
         """初始化并加载 APM；失败时 active=False（旁路）.
 
@@ -67,6 +84,7 @@ class AecEngine:
             far_rate: 设备输出采样率（far 侧重采样源）
             delay_ms: 播放到采集的估计延迟
             enable_preprocess: 是否同时开高通+噪声抑制
+            auto_delay: 是否在线估计延迟（delay_ms 作为初始值）
         """
         self._near_rate = int(near_rate)
         self._far_rate = int(far_rate)
@@ -83,7 +101,7 @@ class AecEngine:
         # far 两级缓冲：pending 由输出回调写入（仅拷贝），
         # buffer 为采集线程重采样后的 16k 样本余量
         self._far_pending: deque = deque()
-        self._far_buffer = np.empty(0, dtype=np.float32)
+        self._far_buffer = PcmRingBuffer(int(self._near_rate * _FAR_BUFFER_S))
         self._far_resampler = None
         self._far_dropped = 0
 
@@ -92,6 +110,16 @@ class AecEngine:
         self._near_out = (ctypes.c_short * self._frame)()
         self._far_in = (ctypes.c_short * self._frame)()
         self._far_out = (ctypes.c_short * self._frame)()
+        # 整块 int16 输出与 float32 结果（按需扩容复用）
+        self._near_out_block = np.empty(0, dtype=np.int16)
+        self._near_result = np.empty(0, dtype=np.float32)
+
+        # 在线延迟估计与 ERLE（仅采集线程读写）
+        self._delay_estimator = DelayEstimator(self._near_rate) if auto_delay else None
+        self._delay_updates = 0
+        self._far_rms = 0.0
+        self._erle_near = 0.0
+        self._erle_out = 0.0
 
         try:
             self._init_apm(enable_preprocess)
@@ -109,7 +137,8 @@ class AecEngine:
             logger.info(
                 f"AEC 引擎已启用 | near {self._near_rate}Hz, "
                 f"far {self._far_rate}Hz→{self._near_rate}Hz, "
-                f"delay {self._delay_ms}ms, preprocess={enable_preprocess}"
+                f"delay {self._delay_ms}ms (auto={auto_delay}), "
+                f"preprocess={enable_preprocess}"
             )
         except Exception as e:
             logger.warning(f"AEC 引擎初始化失败，已旁路: {e}")
@@ -141,10 +170,31 @@ class AecEngine:
     def active(self) -> bool:
         return self._active
 
+    @property
+    def metrics(self) -> dict:
+        """延迟与回声抑制指标快照.
+
+        delay_ms 为当前生效值；estimated_delay_ms 为最近一次稳定估计（未估出为 None）；
+        erle_db 为 far 活跃期间近端输入/输出能量比的平滑值。
+        """
+        est = self._delay_estimator
+        erle = None
+        if self._erle_near > 0.0 and self._erle_out > 0.0:
+            erle = round(float(10.0 * np.log10(self._erle_near / self._erle_out)), 1)
+        return {
+            "delay_ms": self._delay_ms,
+            "auto_delay": est is not None,
+            "estimated_delay_ms": est.estimate_ms if est is not None else None,
+            "delay_confidence": round(est.confidence, 1) if est is not None else None,
+            "delay_updates": self._delay_updates,
+            "erle_db": erle,
+        }
+
     def process_near(self, block: np.ndarray) -> np.ndarray:
         """处理采集帧（16kHz 单声道 float32），返回消回声后的同长数据.
 
-        任何失败都返回原始数据；连续失败自动旁路。
+        返回值为内部复用缓冲的视图，仅在下一次调用前有效（调用方在同一
+        采集周期内用完或自行拷贝）。任何失败都返回原始数据；连续失败自动旁路。
         """
         if not self._active:
             return block
@@ -158,7 +208,10 @@ class AecEngine:
 
         try:
             i16 = self._float_to_i16(block)
-            out = np.empty(n, dtype=np.float32)
+            if self._near_out_block.size < n:
+                self._near_out_block = np.empty(n, dtype=np.int16)
+                self._near_result = np.empty(n, dtype=np.float32)
+            out_i16 = self._near_out_block[:n]
 
             with self._lock:
                 if not self._active:
@@ -177,11 +230,16 @@ class AecEngine:
                     )
                     if ret != 0:
                         raise RuntimeError(f"process_stream 返回 {ret}")
-                    out[off : off + self._frame] = (
-                        np.frombuffer(self._near_out, dtype=np.int16).astype(np.float32)
-                        / 32768.0
+                    ctypes.memmove(
+                        out_i16[off : off + self._frame].ctypes.data,
+                        self._near_out,
+                        self._frame * 2,
                     )
 
+            out = self._near_result[:n]
+            np.multiply(out_i16, _I16_INV, out=out)
+
+            self._update_metrics(block, out)
             self._fail_count = 0
             return out
         except Exception as e:
@@ -213,20 +271,24 @@ class AecEngine:
 
     def _drain_far_locked(self) -> None:
         """采集线程（已持锁）：重采样 far 队列并喂给 ProcessReverseStream."""
+        far_buffer = self._far_buffer
         while self._far_pending:
             mono = self._far_pending.popleft()
             if self._far_resampler is not None:
                 mono = self._far_resampler.resample_chunk(mono, last=False)
             if len(mono):
-                self._far_buffer = np.concatenate((self._far_buffer, mono))
+                far_buffer.write(mono)
 
-        n_frames = len(self._far_buffer) // self._frame
+        n_frames = far_buffer.size // self._frame
         if n_frames == 0:
             return
 
         usable = n_frames * self._frame
-        i16 = self._float_to_i16(self._far_buffer[:usable])
-        self._far_buffer = self._far_buffer[usable:]
+        far = far_buffer.read(usable).reshape(-1)
+        i16 = self._float_to_i16(far)
+        self._far_rms = float(np.sqrt(np.dot(far, far) / usable))
+        if self._delay_estimator is not None:
+            self._delay_estimator.feed_far(far)
 
         for off in range(0, usable, self._frame):
             ctypes.memmove(
@@ -238,6 +300,21 @@ class AecEngine:
             if ret != 0:
                 raise RuntimeError(f"process_reverse_stream 返回 {ret}")
 
+    def _update_metrics(self, near: np.ndarray, out: np.ndarray) -> None:
+        """采集线程：推进延迟估计，far 活跃时累计 ERLE 能量."""
+        est = self._delay_estimator
+        if est is not None:
+            delay = est.feed_near(near)
+            if delay is not None and abs(delay - self._delay_ms) >= _DELAY_UPDATE_MIN_MS:
+                logger.info(f"AEC 延迟估计稳定: {self._delay_ms}ms → {delay:.0f}ms")
+                self._delay_ms = int(round(delay))
+                self._delay_updates += 1
+
+        if self._far_rms >= _ERLE_FAR_RMS:
+            a = _ERLE_SMOOTHING
+            self._erle_near = a * self._erle_near + (1 - a) * float(np.dot(near, near))
+            self._erle_out = a * self._erle_out + (1 - a) * float(np.dot(out, out))
+
     def set_delay_ms(self, delay_ms: int) -> None:
         self._delay_ms = int(delay_ms)
 
@@ -262,7 +339,7 @@ class AecEngine:
         self._apm = None
         self._far_resampler = None
         self._far_pending.clear()
-        self._far_buffer = np.empty(0, dtype=np.float32)
+        self._far_buffer.clear()
         if self._far_dropped:
             logger.debug(f"AEC far 累计丢弃 {self._far_dropped} 块")
 
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import re
-from typing import Optional, Tuple
 
 from .base import KeywordConverter
 from .bpe_converter import BpeConverter
@@ -15,9 +14,11 @@ __all__ = [
     "convert_wake_word",
 ]
 
+_CHINESE_PATTERN = re.compile(r"[\u4e00-\u9fff]")
+
 # Singleton converters
-_pinyin_converter: Optional[PinyinConverter] = None
-_bpe_converter: Optional[BpeConverter] = None
+_pinyin_converter: PinyinConverter | None = None
+_bpe_converter: BpeConverter | None = None
 
 
 def _get_pinyin_converter() -> PinyinConverter:
@@ -38,8 +39,7 @@ def _get_bpe_converter() -> BpeConverter:
 
 def detect_language(text: str) -> str:
     # Check for Chinese characters
-    chinese_pattern = re.compile(r"[\u4e00-\u9fff]")
-    if chinese_pattern.search(text):
+    if _CHINESE_PATTERN.search(text):
         return "zh"
     return "en"
 
@@ -53,7 +53,8 @@ def get_converter(language: str) -> KeywordConverter:
         raise ValueError(f"Unsupported language: {language}")
 
 
-def convert_wake_word(text: str) -> Tuple[str, str, str]:
+def convert_wake_word(text: str) -> tuple[str, str, str]:
+    """Convert one wake word (converters memoize per word/syllable)."""
     language = detect_language(text)
     converter = get_converter(language)
     keyword_line = converter.convert(text)
@@ -2,6 +2,7 @@
 """Abstract base class for keyword converters."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 
 
 class KeywordConverter(ABC):
@@ -23,5 +24,16 @@ class KeywordConverter(ABC):
     def model_path(self) -> str:
         pass
 
+    def convert_batch(self, texts: Iterable[str]) -> list[str]:
+        """Convert many phrases in one pass; duplicates are converted once."""
+        done = {}
+        lines = []
+        for text in texts:
+            line = done.get(text)
+            if line is None:
+                line = done[text] = self.convert(text)
+            lines.append(line)
+        return lines
+
     def to_keywords_file_content(self, text: str) -> str:
         return self.convert(text) + "\n"
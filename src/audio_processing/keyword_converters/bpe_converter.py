@@ -2,17 +2,46 @@
 """BPE converter for English wake words."""
 
 import re
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
 
 from .base import KeywordConverter
 
+# Longest token considered by the greedy tokenizer
+_MAX_TOKEN_LEN = 20
+# Trie node key marking the end of a vocabulary token
+_END = ""
+# Upper bound of the per-instance word memo
+_WORD_CACHE_MAX = 4096
+
+# Parsed vocabularies shared across instances: path -> (mtime, token_to_id, trie)
+_VOCAB_CACHE: dict[str, tuple[float, dict[str, int], dict]] = {}
+_VOCAB_LOCK = threading.Lock()
+
+
+def _build_trie(tokens) -> dict:
+    """Character trie over the vocabulary; ``_END`` marks a complete token."""
+    root: dict = {}
+    for token in tokens:
+        if len(token) > _MAX_TOKEN_LEN:
+            continue
+        node = root
+        for ch in token:
+            node = node.setdefault(ch, {})
+        node[_END] = token
+    return root
+
 
 class BpeConverter(KeywordConverter):
 
-    def __init__(self, tokens_path: Optional[str] = None):
+    def __init__(self, tokens_path: str | None = None):
         self._tokens_path = tokens_path
-        self._token_to_id: Optional[Dict[str, int]] = None
+        self._token_to_id: dict[str, int] | None = None
+        self._trie: dict | None = None
+        # mtime of the loaded tokens.txt; a change reloads and drops the word memo
+        self._vocab_mtime: float | None = None
+        # Per-word tokenization memo (words repeat across phrases)
+        self._word_cache: dict[str, tuple[str, ...]] = {}
 
     def _get_tokens_path(self) -> Path:
         if self._tokens_path:
@@ -23,26 +52,36 @@ class BpeConverter(KeywordConverter):
         return get_app_root() / "models" / "en" / "tokens.txt"
 
     def _load_tokens(self):
-        """Load tokens from tokens.txt file."""
-        if self._token_to_id is not None:
-            return
-
+        """Load tokens from tokens.txt file (parsed once per path and mtime)."""
         tokens_path = self._get_tokens_path()
         if not tokens_path.exists():
             raise FileNotFoundError(f"BPE tokens file not found: {tokens_path}")
 
-        self._token_to_id = {}
+        key = str(tokens_path)
+        mtime = tokens_path.stat().st_mtime
+        if self._token_to_id is not None and mtime == self._vocab_mtime:
+            return
 
-        with open(tokens_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                parts = line.split()
-                if len(parts) >= 2:
-                    token = parts[0]
-                    token_id = int(parts[-1])
-                    self._token_to_id[token] = token_id
+        with _VOCAB_LOCK:
+            cached = _VOCAB_CACHE.get(key)
+            if cached is None or cached[0] != mtime:
+                token_to_id = {}
+                with open(tokens_path, encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        parts = line.split()
+                        if len(parts) >= 2:
+                            token = parts[0]
+                            token_id = int(parts[-1])
+                            token_to_id[token] = token_id
+                cached = (mtime, token_to_id, _build_trie(token_to_id))
+                _VOCAB_CACHE[key] = cached
+
+        self._vocab_mtime, self._token_to_id, self._trie = cached
+        # Memoized tokenizations belong to the previous vocabulary
+        self._word_cache.clear()
 
     @property
     def language(self) -> str:
@@ -58,45 +97,55 @@ class BpeConverter(KeywordConverter):
         has_letters = bool(re.search(r"[a-zA-Z]", text))
         return not has_chinese and has_letters
 
-    def _greedy_tokenize(self, text: str) -> List[str]:
+    def _greedy_tokenize(self, text: str) -> list[str]:
+        """Longest-match tokenization: one trie walk per emitted token."""
+        trie = self._trie
         tokens = []
         i = 0
-
-        while i < len(text):
-            matched = False
-
-            max_len = min(20, len(text) - i)
-            for length in range(max_len, 0, -1):
-                substr = text[i:i + length]
-
-                if substr in self._token_to_id:
-                    tokens.append(substr)
-                    i += length
-                    matched = True
+        n = len(text)
+
+        while i < n:
+            node = trie
+            match = None
+            match_end = i
+            j = i
+            limit = min(n, i + _MAX_TOKEN_LEN)
+            while j < limit:
+                node = node.get(text[j])
+                if node is None:
                     break
+                j += 1
+                if _END in node:
+                    match = node[_END]
+                    match_end = j
 
-            if not matched:
-                char = text[i]
-                if char in self._token_to_id:
-                    tokens.append(char)
-                else:
-                    tokens.append("<unk>")
+            if match is None:
+                tokens.append("<unk>")
                 i += 1
+            else:
+                tokens.append(match)
+                i = match_end
 
         return tokens
 
+    def _tokenize_word(self, word: str) -> tuple[str, ...]:
+        tokens = self._word_cache.get(word)
+        if tokens is None:
+            tokens = tuple(self._greedy_tokenize(f"▁{word}"))
+            if len(self._word_cache) >= _WORD_CACHE_MAX:
+                self._word_cache.clear()
+            self._word_cache[word] = tokens
+        return tokens
+
     def convert(self, text: str) -> str:
         self._load_tokens()
 
         normalized = text.strip().upper()
         words = normalized.split()
 
-        processed_words = [f"▁{word}" for word in words]
-
         all_tokens = []
-        for word in processed_words:
-            tokens = self._greedy_tokenize(word)
-            all_tokens.extend(tokens)
+        for word in words:
+            all_tokens.extend(self._tokenize_word(word))
 
         bpe_str = " ".join(all_tokens)
         return f"{bpe_str} @{normalized}"
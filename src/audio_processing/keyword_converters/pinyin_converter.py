@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 import re
-from typing import List
+from functools import lru_cache
 
 from .base import KeywordConverter
 
@@ -16,6 +16,25 @@ INITIALS = [
 ]
 
 
+@lru_cache(maxsize=2048)
+def _split_syllable(pinyin: str) -> tuple[str, ...]:
+    """Split one toned syllable into initial + final (memoized; few hundred distinct)."""
+    if not pinyin:
+        return ()
+
+    pinyin_lower = pinyin.lower()
+
+    for initial in INITIALS:
+        if pinyin_lower.startswith(initial):
+            final = pinyin[len(initial):]
+            if final:
+                return (initial, final)
+            else:
+                return (initial,)
+
+    return (pinyin,)
+
+
 class PinyinConverter(KeywordConverter):
     def __init__(self):
         self._pypinyin = None
@@ -45,21 +64,8 @@ class PinyinConverter(KeywordConverter):
         chinese_pattern = re.compile(r"[\u4e00-\u9fff]")
         return bool(chinese_pattern.search(text))
 
-    def _split_pinyin(self, pinyin: str) -> List[str]:
-        if not pinyin:
-            return []
-
-        pinyin_lower = pinyin.lower()
-
-        for initial in INITIALS:
-            if pinyin_lower.startswith(initial):
-                final = pinyin[len(initial):]
-                if final:
-                    return [initial, final]
-                else:
-                    return [initial]
-
-        return [pinyin]
+    def _split_pinyin(self, pinyin: str) -> list[str]:
+        return list(_split_syllable(pinyin))
 
     def convert(self, text: str) -> str:
         self._ensure_pypinyin()
@@ -68,8 +74,7 @@ class PinyinConverter(KeywordConverter):
 
         split_parts = []
         for pinyin in pinyin_list:
-            parts = self._split_pinyin(pinyin)
-            split_parts.extend(parts)
+            split_parts.extend(_split_syllable(pinyin))
 
         pinyin_str = " ".join(split_parts)
         return f"{pinyin_str} @{text}"
@@ -0,0 +1,116 @@
+"""唤醒词前置能量门（RMS + 迟滞 + 预录环）.
+
+安静环境下跳过 KWS 推理以降低常驻 CPU：
+- 关闭态：帧写入预录环（保留最近 preroll_ms），不送 spotter；
+- 帧 RMS ≥ open_db 立即打开，先吐出预录环再接当前帧，唤醒词开头不丢；
+- 打开态：RMS 连续 hangover_ms 低于 close_db 才关闭（迟滞，避免字间停顿抖动）。
+
+仅在 KWS 推理线程使用，不加锁。
+"""
+
+import numpy as np
+
+# 避免 log10(0)
+_EPS = 1e-10
+
+
+class EnergyGate:
+    """RMS 能量门，filter() 返回应送入 spotter 的样本（关闭时为 None）."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        open_db: float = -45.0,
+        close_db: float = -52.0,
+        hangover_ms: int = 600,
+        preroll_ms: int = 400,
+    ):
+        if close_db > open_db:
+            close_db = open_db
+        self._open_db = float(open_db)
+        self._close_db = float(close_db)
+        self._hangover = int(sample_rate * hangover_ms / 1000)
+        self._preroll_cap = int(sample_rate * preroll_ms / 1000)
+
+        # 预录环（关闭态写入，打开时一次性吐出）
+        self._ring = np.zeros(self._preroll_cap, dtype=np.float32)
+        self._ring_pos = 0
+        self._ring_len = 0
+
+        self.is_open = False
+        self._quiet = 0  # 打开态下连续低能量样本数
+
+        # 统计按输入时长计（预录重放不重复计入）
+        self.opened = 0
+        self.passed_samples = 0
+        self.gated_samples = 0
+
+    @staticmethod
+    def level_db(x: np.ndarray) -> float:
+        """帧 RMS（dBFS）."""
+        if len(x) == 0:
+            return -200.0
+        return 10.0 * float(np.log10(np.dot(x, x) / len(x) + _EPS))
+
+    def filter(self, x: np.ndarray) -> np.ndarray | None:
+        """送入一帧；返回本帧应送 spotter 的样本（打开瞬间含预录），关闭态返回 None."""
+        n = len(x)
+        level = self.level_db(x)
+
+        if self.is_open:
+            if level < self._close_db:
+                self._quiet += n
+                if self._quiet >= self._hangover:
+                    self.is_open = False
+                    self._quiet = 0
+            else:
+                self._quiet = 0
+            self.passed_samples += n
+            return x
+
+        if level >= self._open_db:
+            self.is_open = True
+            self._quiet = 0
+            self.opened += 1
+            self.passed_samples += n
+            return self._flush_preroll(x)
+
+        self._push_preroll(x)
+        self.gated_samples += n
+        return None
+
+    def reset(self) -> None:
+        self.is_open = False
+        self._quiet = 0
+        self._ring_pos = 0
+        self._ring_len = 0
+
+    def _push_preroll(self, x: np.ndarray) -> None:
+        cap = self._preroll_cap
+        if cap == 0:
+            return
+        if len(x) >= cap:
+            x = x[len(x) - cap :]
+        n = len(x)
+        pos = self._ring_pos
+        first = min(n, cap - pos)
+        self._ring[pos : pos + first] = x[:first]
+        if first < n:
+            self._ring[: n - first] = x[first:]
+        self._ring_pos = (pos + n) % cap
+        self._ring_len = min(cap, self._ring_len + n)
+
+    def _flush_preroll(self, x: np.ndarray) -> np.ndarray:
+        """按时间顺序拼接预录环 + 当前帧，并清空预录环（仅在打开瞬间分配）."""
+        held = self._ring_len
+        if held == 0:
+            return x
+        out = np.empty(held + len(x), dtype=np.float32)
+        start = (self._ring_pos - held) % self._preroll_cap
+        first = min(held, self._preroll_cap - start)
+        out[:first] = self._ring[start : start + first]
+        out[first:held] = self._ring[: held - first]
+        out[held:] = x
+        self._ring_pos = 0
+        self._ring_len = 0
+        return out
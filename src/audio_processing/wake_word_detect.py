@@ -1,11 +1,14 @@
 import asyncio
+import queue
 import threading
 import time
+from collections.abc import Callable
 from pathlib import Path
-from typing import Callable, Optional
 
 import numpy as np
 
+from src.audio_codecs.audio_buffer import PcmFrame
+from src.audio_processing.kws_gate import EnergyGate
 from src.constants.constants import AudioConfig
 from src.logging import get_logger
 from src.utils.config_manager import ConfigManager, get_config
@@ -14,6 +17,41 @@ from src.utils.resource_finder import get_app_root, get_user_keywords_path
 logger = get_logger()
 
 _STOP_SENTINEL = object()
+# 推理线程连续出错达到该次数后退出，并在事件循环上停止检测
+_MAX_ERRORS = 5
+# 出错后再取下一批前的退避（秒）
+_ERROR_BACKOFF_S = 1.0
+# 单批最多合并的帧数（20ms/帧 → 1s），限制单次推理延迟
+_MAX_BATCH_FRAMES = 50
+# 推理线程退出等待上限（秒）
+_JOIN_TIMEOUT_S = 1.0
+# 默认模型档位：encoder.onnx / decoder.onnx / joiner.onnx
+_DEFAULT_PROFILE = "fp32"
+_MODEL_PARTS = ("encoder", "decoder", "joiner")
+
+
+def resolve_model_files(model_dir: Path, profile: str = _DEFAULT_PROFILE) -> dict[str, Path]:
+    """按档位解析 transducer 三件套路径.
+
+    fp32 为 ``<part>.onnx``；其他档位（如 int8）为 ``<part>.<profile>.onnx``，
+    同目录缺失时回退到 fp32 文件（常见发布只量化 encoder/joiner）。
+    """
+    files = {}
+    for part in _MODEL_PARTS:
+        path = model_dir / f"{part}.onnx"
+        if profile and profile != _DEFAULT_PROFILE:
+            variant = model_dir / f"{part}.{profile}.onnx"
+            if variant.exists():
+                path = variant
+        files[part] = path
+    return files
+
+
+def _release_frame(item) -> None:
+    """释放出队/丢弃的共享帧（哨兵等非帧对象忽略）."""
+    release = getattr(item, "release", None)
+    if release is not None:
+        release()
 
 
 class WakeWordDetector:
@@ -22,18 +60,31 @@ class WakeWordDetector:
         self.audio_codec = None
         self._running = False
         self._paused = False
-        self._detection_task = None
-        self._audio_queue: Optional[asyncio.Queue] = None
+        # 推理线程阻塞在有界队列上（空闲零唤醒），检测结果投递回事件循环
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        # stop() 置位：打断推理线程的出错退避
+        self._halt = threading.Event()
+        self._audio_queue: queue.Queue | None = None
+        self._handler_tasks: set[asyncio.Task] = set()
+        self._batch_buf = np.empty(0, dtype=np.float32)
+
+        # 推理统计（推理线程写，读取方容忍不精确）
+        self._dropped_frames = 0
+        self._processed_frames = 0
+        self._batches = 0
+        self._busy_s = 0.0
+        self._audio_s = 0.0
 
         self._last_detection_time = 0
         self._detection_cooldown = 1.5
 
-        self.on_detected_callback: Optional[Callable] = None
-        self.on_error: Optional[Callable] = None
+        self.on_detected_callback: Callable | None = None
+        self.on_error: Callable | None = None
 
         self.enabled = False
         self._model_loaded = False
-        self._model_dir: Optional[Path] = None
+        self._model_dir: Path | None = None
         self._keyword_spotter = None
         self._stream = None
 
@@ -48,8 +99,17 @@ class WakeWordDetector:
         self._keywords_score = 1.8
         self._keywords_threshold = 0.2
         self._num_trailing_blanks = 1
+        self._model_profile = _DEFAULT_PROFILE
 
-    async def initialize(self, model_path: Optional[str] = None) -> bool:
+        # 可选前置能量门（安静时跳过推理）
+        self._gate_options: dict | None = None
+        self._gate: EnergyGate | None = None
+
+        # 热重载：后台构建新模型后原子替换；签名相同则跳过
+        self._reload_lock = asyncio.Lock()
+        self._loaded_signature: tuple | None = None
+
+    async def initialize(self, model_path: str | None = None) -> bool:
         try:
             # 1. 检查配置是否启用
             config = get_config()
@@ -99,6 +159,20 @@ class WakeWordDetector:
         self._keywords_score = config.get_config("WAKE_WORD_OPTIONS.KEYWORDS_SCORE", 1.8)
         self._keywords_threshold = config.get_config("WAKE_WORD_OPTIONS.KEYWORDS_THRESHOLD", 0.2)
         self._num_trailing_blanks = config.get_config("WAKE_WORD_OPTIONS.NUM_TRAILING_BLANKS", 1)
+        self._model_profile = (
+            config.get_config("WAKE_WORD_OPTIONS.MODEL_PROFILE", _DEFAULT_PROFILE)
+            or _DEFAULT_PROFILE
+        )
+
+        if config.get_config("WAKE_WORD_OPTIONS.ENERGY_GATE", False):
+            self._gate_options = {
+                "open_db": float(config.get_config("WAKE_WORD_OPTIONS.GATE_OPEN_DB", -45)),
+                "close_db": float(config.get_config("WAKE_WORD_OPTIONS.GATE_CLOSE_DB", -52)),
+                "hangover_ms": int(config.get_config("WAKE_WORD_OPTIONS.GATE_HANGOVER_MS", 600)),
+                "preroll_ms": int(config.get_config("WAKE_WORD_OPTIONS.GATE_PREROLL_MS", 400)),
+            }
+        else:
+            self._gate_options = None
 
         # Validate
         if not 0.1 <= self._keywords_threshold <= 1.0:
@@ -113,13 +187,28 @@ class WakeWordDetector:
 
     def _load_model(self) -> bool:
         """Load sherpa-onnx KeywordSpotter model."""
+        spotter = self._build_spotter(self._model_dir)
+        if spotter is None:
+            return False
+        with self._onnx_lock:
+            self._keyword_spotter = spotter
+        self._loaded_signature = self._model_signature(self._model_dir)
+        return True
+
+    def _build_spotter(self, model_dir: Path):
+        """按当前配置构建 KeywordSpotter（不触碰在用实例，可在后台线程调用）.
+
+        Returns:
+            新实例，失败返回 None
+        """
         try:
             import sherpa_onnx
 
-            encoder_path = self._model_dir / "encoder.onnx"
-            decoder_path = self._model_dir / "decoder.onnx"
-            joiner_path = self._model_dir / "joiner.onnx"
-            tokens_path = self._model_dir / "tokens.txt"
+            model_files = resolve_model_files(model_dir, self._model_profile)
+            encoder_path = model_files["encoder"]
+            decoder_path = model_files["decoder"]
+            joiner_path = model_files["joiner"]
+            tokens_path = model_dir / "tokens.txt"
 
             lang = get_config().get_config("WAKE_WORD_OPTIONS.WAKE_WORD_LANG", "zh")
             keywords_path = get_user_keywords_path(lang)
@@ -128,41 +217,69 @@ class WakeWordDetector:
             for file_path in required_files:
                 if not file_path.exists():
                     logger.error(f"模型文件不存在: {file_path}")
-                    return False
+                    return None
 
             # Windows: sherpa-onnx C++ 用 std::ifstream(narrow_char*) 读取 tokens.txt，
             # 路径含非 ASCII 字符时 GBK 代码页会吞掉反斜杠导致打开失败。
             # 将 tokens.txt 复制到 ASCII 安全路径的用户目录下。
             tokens_path = self._ensure_ascii_path(tokens_path, lang)
 
-            logger.info(f"加载 KeywordSpotter 模型: {self._model_dir}")
-
-            with self._onnx_lock:
-                self._keyword_spotter = sherpa_onnx.KeywordSpotter(
-                    tokens=str(tokens_path),
-                    encoder=str(encoder_path),
-                    decoder=str(decoder_path),
-                    joiner=str(joiner_path),
-                    keywords_file=str(keywords_path),
-                    num_threads=self._num_threads,
-                    sample_rate=self._sample_rate,
-                    feature_dim=80,
-                    max_active_paths=self._max_active_paths,
-                    keywords_score=self._keywords_score,
-                    keywords_threshold=self._keywords_threshold,
-                    num_trailing_blanks=self._num_trailing_blanks,
-                    provider=self._provider,
-                )
+            logger.info(
+                f"加载 KeywordSpotter 模型: {model_dir} | 档位 {self._model_profile} "
+                f"({', '.join(p.name for p in model_files.values())}), "
+                f"线程 {self._num_threads}"
+            )
+
+            spotter = sherpa_onnx.KeywordSpotter(
+                tokens=str(tokens_path),
+                encoder=str(encoder_path),
+                decoder=str(decoder_path),
+                joiner=str(joiner_path),
+                keywords_file=str(keywords_path),
+                num_threads=self._num_threads,
+                sample_rate=self._sample_rate,
+                feature_dim=80,
+                max_active_paths=self._max_active_paths,
+                keywords_score=self._keywords_score,
+                keywords_threshold=self._keywords_threshold,
+                num_trailing_blanks=self._num_trailing_blanks,
+                provider=self._provider,
+            )
 
             logger.info("KeywordSpotter 模型加载成功")
-            return True
+            return spotter
 
         except ImportError as e:
             logger.error(f"sherpa_onnx 导入失败: {e}", exc_info=True)
-            return False
+            return None
         except Exception as e:
             logger.error(f"加载模型失败: {e}", exc_info=True)
-            return False
+            return None
+
+    def _model_signature(self, model_dir: Path) -> tuple:
+        """影响模型实例的全部输入（含 keywords 文件内容），用于跳过无变化的重载."""
+        lang = get_config().get_config("WAKE_WORD_OPTIONS.WAKE_WORD_LANG", "zh")
+        try:
+            keywords = get_user_keywords_path(lang).read_bytes()
+        except OSError:
+            keywords = b""
+        return (
+            str(model_dir),
+            self._model_profile,
+            self._num_threads,
+            self._provider,
+            self._max_active_paths,
+            self._keywords_score,
+            self._keywords_threshold,
+            self._num_trailing_blanks,
+            lang,
+            keywords,
+        )
+
+    def _make_gate(self) -> EnergyGate | None:
+        if not self._gate_options:
+            return None
+        return EnergyGate(self._sample_rate, **self._gate_options)
 
     @staticmethod
     def _ensure_ascii_path(file_path: Path, lang: str) -> Path:
@@ -208,6 +325,7 @@ class WakeWordDetector:
                     del stream
 
                 self._model_loaded = False
+                self._loaded_signature = None
                 logger.debug("模型资源已释放")
 
             except Exception as e:
@@ -216,22 +334,26 @@ class WakeWordDetector:
     def on_detected(self, callback: Callable):
         self.on_detected_callback = callback
 
-    def on_audio_data(self, audio_data: np.ndarray):
+    def on_audio_data(self, audio_data: PcmFrame):
+        """共享只读帧：入队前 retain，出队处理/丢弃后 release（不再拷贝）."""
         if not self.enabled or not self._running or self._paused:
             return
 
         if self._audio_queue is None:
             return
 
+        audio_data.retain()
         try:
-            self._audio_queue.put_nowait(audio_data.copy())
-        except asyncio.QueueFull:
+            self._audio_queue.put_nowait(audio_data)
+        except queue.Full:
             try:
-                self._audio_queue.get_nowait()
-                self._audio_queue.put_nowait(audio_data.copy())
-            except (asyncio.QueueEmpty, asyncio.QueueFull):
-                pass
+                _release_frame(self._audio_queue.get_nowait())
+                self._dropped_frames += 1
+                self._audio_queue.put_nowait(audio_data)
+            except (queue.Empty, queue.Full):
+                audio_data.release()
         except Exception as e:
+            audio_data.release()
             logger.debug(f"音频数据入队失败: {type(e).__name__}: {e}")
 
     async def start(self, audio_codec) -> bool:
@@ -245,21 +367,30 @@ class WakeWordDetector:
 
         try:
             self.audio_codec = audio_codec
+            self._loop = asyncio.get_running_loop()
             self._running = True
             self._paused = False
+            self._halt.clear()
 
-            # Create queue in event loop
-            self._audio_queue = asyncio.Queue(maxsize=100)
+            # 线程安全有界队列：采集线程写入，推理线程阻塞读取
+            self._audio_queue = queue.Queue(maxsize=100)
 
             # Create detection stream
             self._stream = self._keyword_spotter.create_stream()
+            self._gate = self._make_gate()
+
+            # 先起推理线程再注册监听，避免首批帧无人消费
+            self._thread = threading.Thread(
+                target=self._inference_loop,
+                args=(self._audio_queue,),
+                name="kws-inference",
+                daemon=True,
+            )
+            self._thread.start()
 
             # Register as audio listener
             self.audio_codec.add_audio_listener(self)
 
-            # Start detection task
-            self._detection_task = asyncio.create_task(self._detection_loop())
-
             logger.info("唤醒词检测器已启动")
             return True
 
@@ -270,48 +401,116 @@ class WakeWordDetector:
     async def stop(self):
         self._stopping = True
         self._running = False
+        self._halt.set()
 
         # Remove audio listener
         if self.audio_codec:
             self.audio_codec.remove_audio_listener(self)
             self.audio_codec = None
 
-        # 用哨兵唤醒阻塞在 queue.get() 上的检测循环
+        # 用哨兵唤醒阻塞在 queue.get() 上的推理线程
         if self._audio_queue:
             try:
                 self._audio_queue.put_nowait(_STOP_SENTINEL)
-            except asyncio.QueueFull:
+            except queue.Full:
                 try:
-                    self._audio_queue.get_nowait()
+                    _release_frame(self._audio_queue.get_nowait())
                     self._audio_queue.put_nowait(_STOP_SENTINEL)
-                except (asyncio.QueueEmpty, asyncio.QueueFull):
+                except (queue.Empty, queue.Full):
                     pass
 
-        # 等待检测循环自然退出（由哨兵触发）
-        if self._detection_task:
-            try:
-                await asyncio.wait_for(self._detection_task, timeout=1.0)
-            except asyncio.TimeoutError:
-                self._detection_task.cancel()
-                try:
-                    await self._detection_task
-                except asyncio.CancelledError:
-                    pass
-            self._detection_task = None
+        # 等待推理线程自然退出（由哨兵触发）；解码中的帧最多再占用一次推理耗时
+        thread = self._thread
+        self._thread = None
+        if thread is not None and thread.is_alive():
+            await asyncio.to_thread(thread.join, _JOIN_TIMEOUT_S)
+            if thread.is_alive():
+                logger.warning("KWS 推理线程未在超时内退出")
+
+        # 取消未完成的检测处理（回调内部调用 stop 时不取消自身）
+        current = asyncio.current_task()
+        for task in list(self._handler_tasks):
+            if task is not current:
+                task.cancel()
 
         # Clear queue
         if self._audio_queue:
-            while not self._audio_queue.empty():
+            while True:
                 try:
-                    self._audio_queue.get_nowait()
-                except asyncio.QueueEmpty:
+                    _release_frame(self._audio_queue.get_nowait())
+                except queue.Empty:
                     break
             self._audio_queue = None
+        self._loop = None
+
+        if self._batches:
+            logger.info(f"KWS 推理统计: {self.stats}")
 
         self._stopping = False
         logger.info("唤醒词检测器已停止")
 
-    async def reload(self, model_path: Optional[str] = None) -> bool:
+    async def reload(self, model_path: str | None = None) -> bool:
+        """热重载模型/关键词.
+
+        运行中时双缓冲替换：新 KeywordSpotter 与 stream 在后台线程构建，
+        构建期间旧模型继续检测，完成后在 _onnx_lock 下原子替换再释放旧实例；
+        构建失败保留旧模型。未运行时走完整 initialize。
+        """
+        async with self._reload_lock:
+            if not (self._running and self._model_loaded):
+                return await self._reinitialize(model_path)
+
+            config = get_config()
+            if not config.get_config("WAKE_WORD_OPTIONS.USE_WAKE_WORD", False):
+                logger.info("唤醒词功能已禁用，停止检测")
+                await self.shutdown()
+                return False
+
+            old_gate_options = self._gate_options
+            self._load_config(config)
+            # 门参数未变时保留原门（迟滞/拖尾状态与预录），避免截掉进行中的唤醒词开头
+            gate_changed = self._gate_options != old_gate_options
+            if model_path is None:
+                model_path = config.get_config("WAKE_WORD_OPTIONS.MODEL_PATH", "models")
+            model_dir = get_app_root() / model_path
+            if not model_dir.exists():
+                logger.error(f"模型目录不存在: {model_dir}")
+                self._gate_options = old_gate_options
+                return False
+
+            signature = self._model_signature(model_dir)
+            if signature == self._loaded_signature:
+                if gate_changed:
+                    with self._onnx_lock:
+                        self._gate = self._make_gate()
+                    logger.info("能量门参数已更新")
+                logger.info("唤醒词模型与关键词未变化，跳过重载")
+                return True
+
+            logger.info(f"热重载唤醒词模型（后台构建）: {model_dir}")
+            spotter = await asyncio.to_thread(self._build_spotter, model_dir)
+            if spotter is None:
+                logger.warning("新模型构建失败，继续使用旧模型")
+                self._gate_options = old_gate_options
+                return False
+            stream = spotter.create_stream()
+
+            with self._onnx_lock:
+                old_spotter, old_stream = self._keyword_spotter, self._stream
+                self._keyword_spotter, self._stream = spotter, stream
+                self._model_dir = model_dir
+                if gate_changed:
+                    self._gate = self._make_gate()
+            self._loaded_signature = signature
+
+            # 锁外释放旧实例：先 spotter 后 stream（见 _release_model）
+            del old_spotter
+            del old_stream
+            logger.info("唤醒词模型已热替换，检测未中断")
+            return True
+
+    async def _reinitialize(self, model_path: str | None) -> bool:
+        """完整重建：停止 → 释放 → 加载 → 按原状态重启."""
         was_running = self._running
         codec = self.audio_codec
 
@@ -342,90 +541,171 @@ class WakeWordDetector:
         """Resume detection."""
         self._paused = False
 
-    async def _detection_loop(self):
-        error_count = 0
-        MAX_ERRORS = 5
+    def _inference_loop(self, audio_queue: queue.Queue):
+        """KWS 推理线程：阻塞取帧（空闲零唤醒），ONNX 调用不占用事件循环.
 
-        while self._running and not self._stopping:
+        每次唤醒把队列里已积压的帧一并取出批量解码，落后时追得上而不是丢帧。
+        """
+        error_count = 0
+        stopping = False
+        while not stopping:
+            batch = [audio_queue.get()]
+            while len(batch) < _MAX_BATCH_FRAMES:
+                try:
+                    batch.append(audio_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if any(f is _STOP_SENTINEL for f in batch):
+                stopping = True
+                batch = [f for f in batch if f is not _STOP_SENTINEL]
+            if not batch:
+                continue
             try:
-                if self._paused or self._stopping:
-                    await asyncio.sleep(0.1)
-                    continue
-
-                await self._process_audio()
-                await asyncio.sleep(0.005)
+                self._process_batch(batch)
                 error_count = 0
-
-            except asyncio.CancelledError:
-                break
-            except RuntimeError as e:
-                if "no running event loop" in str(e) or "Event loop is closed" in str(e):
-                    break
-                error_count += 1
-                logger.error(f"检测循环错误 ({error_count}/{MAX_ERRORS}): {e}", exc_info=True)
-
-                if error_count >= MAX_ERRORS:
-                    logger.critical("达到最大错误次数，停止检测")
-                    break
-
-                await asyncio.sleep(1)
             except Exception as e:
                 error_count += 1
-                logger.error(f"检测循环错误 ({error_count}/{MAX_ERRORS}): {e}", exc_info=True)
-
-                if self.on_error:
-                    try:
-                        if asyncio.iscoroutinefunction(self.on_error):
-                            await self.on_error(e)
-                        else:
-                            self.on_error(e)
-                    except Exception as cb_error:
-                        logger.error(f"错误回调失败: {cb_error}")
-
-                if error_count >= MAX_ERRORS:
+                logger.error(f"检测循环错误 ({error_count}/{_MAX_ERRORS}): {e}", exc_info=True)
+                if error_count >= _MAX_ERRORS:
                     logger.critical("达到最大错误次数，停止检测")
+                    self._post(self._on_fatal_error, e)
+                    break
+                # 退避后再取下一批（期间新帧照常入队，满则丢最旧）；stop() 可提前打断
+                if self._halt.wait(_ERROR_BACKOFF_S):
                     break
 
-                await asyncio.sleep(1)
+    def _process_batch(self, frames: list):
+        """推理线程：批量处理积压帧，命中时把结果投递回事件循环."""
+        try:
+            if self._paused or self._stopping:
+                return
+            detected_result = self._accept_frames(frames)
+        finally:
+            for frame in frames:
+                _release_frame(frame)
 
-    async def _process_audio(self):
-        if self._stopping or not self._audio_queue:
+        if detected_result is not None:
+            self._post(self._on_result, detected_result)
+
+    def _gather(self, frames: list):
+        """经能量门过滤后拼接进复用缓冲（单段直接用共享视图，不拷贝）."""
+        gate = self._gate
+        if gate is None:
+            pieces = [f.data for f in frames]
+        else:
+            pieces = [p for p in (gate.filter(f.data) for f in frames) if p is not None]
+        if not pieces:
+            return None
+        if len(pieces) == 1:
+            return pieces[0]
+        total = sum(len(p) for p in pieces)
+        if self._batch_buf.size < total:
+            self._batch_buf = np.empty(total, dtype=np.float32)
+        out = self._batch_buf[:total]
+        off = 0
+        for p in pieces:
+            n = len(p)
+            out[off : off + n] = p
+            off += n
+        return out
+
+    def _post(self, callback: Callable, *args) -> None:
+        """线程安全地把回调投递到事件循环（循环已关闭则丢弃）."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
             return
-
         try:
-            audio_data = self._audio_queue.get_nowait()
-        except asyncio.QueueEmpty:
-            return
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # 循环关闭竞态
 
-        if audio_data is _STOP_SENTINEL:
+    def _on_result(self, result):
+        """事件循环线程：为检测结果创建处理任务."""
+        if not self._running or self._stopping:
             return
+        task = asyncio.create_task(self._handle_detection(result))
+        self._handler_tasks.add(task)
+        task.add_done_callback(self._handler_tasks.discard)
 
-        if audio_data is None or len(audio_data) == 0:
+    def _on_fatal_error(self, error: Exception):
+        """事件循环线程：推理线程已放弃，真正停止检测并只通知一次 on_error."""
+        if not self._running or self._stopping:
             return
+        task = asyncio.create_task(self._stop_after_error(error))
+        self._handler_tasks.add(task)
+        task.add_done_callback(self._handler_tasks.discard)
+
+    async def _stop_after_error(self, error: Exception):
+        await self.stop()
+        self._report_error(error)
 
-        detected_result = None
+    def _report_error(self, error: Exception):
+        if not self.on_error:
+            return
+        try:
+            result = self.on_error(error)
+            if asyncio.iscoroutine(result):
+                task = asyncio.create_task(result)
+                self._handler_tasks.add(task)
+                task.add_done_callback(self._handler_tasks.discard)
+        except Exception as cb_error:
+            logger.error(f"错误回调失败: {cb_error}")
+
+    def _accept_frames(self, frames: list):
+        """一次 accept_waveform 送入全部帧，is_ready 期间循环解码.
+
+        返回检测结果或 None；命中即重置流，本批剩余解码结果作废。
+        推理异常向上抛给 _inference_loop 计数、退避，连续失败则停止检测。
+        """
+        self._processed_frames += len(frames)
+        waveform = self._gather(frames)
+        if waveform is None or len(waveform) == 0:
+            return None
 
         with self._onnx_lock:
             if self._stopping or self._stream is None or self._keyword_spotter is None:
-                return
+                return None
 
+            t0 = time.perf_counter()
             try:
-                self._stream.accept_waveform(
-                    sample_rate=self._sample_rate, waveform=audio_data
-                )
-
-                if self._keyword_spotter.is_ready(self._stream):
-                    self._keyword_spotter.decode_stream(self._stream)
-                    result = self._keyword_spotter.get_result(self._stream)
+                spotter = self._keyword_spotter
+                stream = self._stream
+                stream.accept_waveform(sample_rate=self._sample_rate, waveform=waveform)
 
+                while spotter.is_ready(stream):
+                    spotter.decode_stream(stream)
+                    result = spotter.get_result(stream)
                     if result:
-                        detected_result = result
-                        self._keyword_spotter.reset_stream(self._stream)
-            except Exception as e:
-                logger.debug(f"处理音频时出错: {e}")
-
-        if detected_result is not None:
-            await self._handle_detection(detected_result)
+                        spotter.reset_stream(stream)
+                        return result
+            finally:
+                self._busy_s += time.perf_counter() - t0
+                self._audio_s += len(waveform) / self._sample_rate
+                self._batches += 1
+        return None
+
+    @property
+    def stats(self) -> dict:
+        """推理统计：丢帧数与实时率（RTF = 推理耗时 / 音频时长，用于选 NUM_THREADS）."""
+        rtf = self._busy_s / self._audio_s if self._audio_s else 0.0
+        return {
+            "processed_frames": self._processed_frames,
+            "dropped_frames": self._dropped_frames,
+            "batches": self._batches,
+            "avg_batch_frames": (
+                round(self._processed_frames / self._batches, 2) if self._batches else 0.0
+            ),
+            "rtf": round(rtf, 4),
+            "gate_open_ratio": self._gate_open_ratio(),
+        }
+
+    def _gate_open_ratio(self) -> float | None:
+        """能量门放行的音频占比（未启用门为 None）."""
+        gate = self._gate
+        if gate is None:
+            return None
+        total = gate.passed_samples + gate.gated_samples
+        return round(gate.passed_samples / total, 4) if total else 0.0
 
     async def _handle_detection(self, result):
         # Anti-repeat check
@@ -457,7 +737,7 @@ class WakeWordDetector:
             if self._audio_queue:
                 while True:
                     try:
-                        self._audio_queue.get_nowait()
-                    except asyncio.QueueEmpty:
+                        _release_frame(self._audio_queue.get_nowait())
+                    except queue.Empty:
                         break
             self._paused = False
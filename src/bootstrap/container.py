@@ -13,6 +13,7 @@ from src.bootstrap.plugin_wiring import setup_plugins
 from src.bootstrap.protocols import PluginCommands, PluginContext
 from src.bootstrap.session import ConversationSession
 from src.core.event_bus import EventBus, Events
+from src.core.event_loop import LoopLagMonitor
 from src.core.protocol_manager import ProtocolManager
 from src.core.resource_pool import ResourcePool
 from src.core.state_manager import StateManager
@@ -48,6 +49,8 @@ class ServiceContainer:
         self.protocol = ProtocolManager(self.event_bus, task_manager=self.tasks)
         self.plugins = PluginManager()
         self.resource_pool = ResourcePool()
+        # 事件循环调度延迟监控（SYSTEM_OPTIONS.LOOP_MONITOR）
+        self.loop_monitor: LoopLagMonitor | None = None
 
         # 容器持有的跨插件共享服务（启动时 bind，关闭时 unbind）
         self.mcp_server = None
@@ -91,6 +94,7 @@ class ServiceContainer:
 
         try:
             self.tasks.initialize()
+            self._start_loop_monitor()
             self.protocol.set_task_manager(self.tasks)
             self.protocol.set_protocol(protocol)
 
@@ -130,6 +134,16 @@ class ServiceContainer:
         finally:
             await self.shutdown()
 
+    def _start_loop_monitor(self) -> None:
+        """启动调度延迟监控（任务随 TaskManager 取消，取消时输出最终报告）."""
+        try:
+            if not bool(self.config.get_config("SYSTEM_OPTIONS.LOOP_MONITOR", True)):
+                return
+        except Exception:
+            return
+        self.loop_monitor = LoopLagMonitor()
+        self.tasks.spawn(self.loop_monitor.run(), "loop_lag_monitor")
+
     async def shutdown(self) -> None:
         """关闭应用，统一通过资源池逆序释放所有资源."""
         if self._shutting_down:
@@ -89,6 +89,9 @@ async def setup_plugins(
     # 设置音频直连通道（TTS 音频不经过 EventBus，减少延迟）
     if not audio_plugin.failed:
         container.protocol.set_audio_handler(audio_plugin.on_incoming_audio)
+        container.protocol.set_audio_batch_handler(
+            audio_plugin.on_incoming_audio_batch
+        )
 
 
 def register_cleanup_resources(container: "ServiceContainer") -> None:
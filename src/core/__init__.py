@@ -3,6 +3,8 @@ Core services module.
 """
 
 from src.core.event_bus import EventBus, Events
+from src.core.event_loop import LoopLagMonitor, install_loop_backend
+from src.core.frame_queue import FrameQueue
 from src.core.protocol_manager import ProtocolManager
 from src.core.state_manager import StateManager
 from src.core.task_manager import TaskManager
@@ -13,4 +15,7 @@ __all__ = [
     "StateManager",
     "TaskManager",
     "ProtocolManager",
+    "LoopLagMonitor",
+    "install_loop_backend",
+    "FrameQueue",
 ]
@@ -0,0 +1,121 @@
+"""事件循环后端选择与调度延迟监控.
+
+- install_loop_backend：CLI/TUI/GPIO 模式可选 uvloop（GUI 固定 qasync）；
+  未安装或平台不支持时回退标准 asyncio。
+- LoopLagMonitor：周期 sleep 测量实际唤醒滞后（= 循环被占用/排队的时间），
+  定期输出 p50/p99/max；音频帧经 call_soon_threadsafe 跨线程投递，
+  该值升高即说明事件循环成为音频瓶颈。
+"""
+
+import asyncio
+import sys
+from collections import deque
+
+from src.logging import get_logger
+
+logger = get_logger()
+
+LOOP_BACKENDS = ("asyncio", "uvloop")
+
+# 采样间隔、报告间隔（秒）、保留样本数（约 10 分钟）
+_SAMPLE_INTERVAL_S = 0.5
+_REPORT_INTERVAL_S = 60.0
+_WINDOW = 1200
+# p99 超过该值时以 WARNING 输出报告
+_WARN_P99_MS = 50.0
+
+
+def install_loop_backend(backend: str) -> str:
+    """安装事件循环策略，返回实际生效的后端名.
+
+    须在创建事件循环（asyncio.run）之前调用。
+    """
+    backend = (backend or "asyncio").lower()
+    if backend not in LOOP_BACKENDS:
+        logger.warning(f"未知事件循环后端 {backend}，使用 asyncio")
+        return "asyncio"
+    if backend == "asyncio":
+        return "asyncio"
+
+    if sys.platform == "win32":
+        logger.warning("uvloop 不支持 Windows，使用 asyncio")
+        return "asyncio"
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning("未安装 uvloop（pip install uvloop），使用 asyncio")
+        return "asyncio"
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info(f"事件循环后端: uvloop {getattr(uvloop, '__version__', '')}")
+    return "uvloop"
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+class LoopLagMonitor:
+    """事件循环调度延迟监控（在被测循环内运行 run()）."""
+
+    def __init__(
+        self,
+        interval: float = _SAMPLE_INTERVAL_S,
+        report_interval: float = _REPORT_INTERVAL_S,
+        window: int = _WINDOW,
+    ):
+        self._interval = float(interval)
+        self._report_interval = float(report_interval)
+        self._samples: deque = deque(maxlen=window)
+        self._max_s = 0.0
+        self._backend: str | None = None
+
+    def record(self, lag_s: float) -> None:
+        lag_s = max(0.0, lag_s)
+        self._samples.append(lag_s)
+        if lag_s > self._max_s:
+            self._max_s = lag_s
+
+    def snapshot(self) -> dict:
+        """窗口内 p50/p99 与启动以来的最大滞后（毫秒）."""
+        values = sorted(self._samples)
+        return {
+            "backend": self._backend,
+            "samples": len(values),
+            "p50_ms": round(_percentile(values, 0.50) * 1000, 2),
+            "p99_ms": round(_percentile(values, 0.99) * 1000, 2),
+            "max_ms": round(self._max_s * 1000, 2),
+        }
+
+    def report(self) -> dict:
+        snap = self.snapshot()
+        msg = (
+            f"事件循环调度延迟 | p50 {snap['p50_ms']}ms, p99 {snap['p99_ms']}ms, "
+            f"max {snap['max_ms']}ms ({snap['samples']} 样本, {snap['backend']})"
+        )
+        if snap["p99_ms"] > _WARN_P99_MS:
+            logger.warning(msg)
+        else:
+            logger.info(msg)
+        return snap
+
+    async def run(self) -> None:
+        """采样循环：sleep(interval) 的实际超时部分即调度滞后."""
+        loop = asyncio.get_running_loop()
+        self._backend = type(loop).__module__.split(".")[0]
+        next_report = loop.time() + self._report_interval
+        try:
+            while True:
+                t0 = loop.time()
+                await asyncio.sleep(self._interval)
+                now = loop.time()
+                self.record(now - t0 - self._interval)
+                if now >= next_report:
+                    self.report()
+                    next_report = now + self._report_interval
+        finally:
+            if self._samples:
+                self.report()
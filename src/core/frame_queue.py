@@ -0,0 +1,138 @@
+"""跨线程帧队列.
+
+音频线程（生产者）→ 事件循环内单个常驻协程（消费者）的有界队列：
+- put() 任意线程调用，不阻塞；队满丢弃最旧帧（实时音频宁可丢旧，不可积压）
+- 消费者未被唤醒前，多次 put 只触发一次 call_soon_threadsafe
+- get_batch() 一次取空队列，按批处理
+
+替代「每帧 call_soon_threadsafe + create_task + 信号量」的调度方式。
+"""
+
+import asyncio
+import threading
+from collections import deque
+from typing import Any
+
+
+class FrameQueue:
+    """有界、丢最旧、合并唤醒的线程 → 事件循环队列.
+
+    用法:
+        q = FrameQueue(maxsize=50)
+        q.bind(asyncio.get_running_loop())
+
+        # 音频线程
+        q.put(frame)
+
+        # 事件循环内常驻协程
+        while batch := await q.get_batch():
+            for frame in batch:
+                await send(frame)
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize <= 0:
+            raise ValueError("maxsize 必须大于 0")
+        self._maxsize = maxsize
+        self._items: deque = deque()
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._event: asyncio.Event | None = None
+        self._wakeup_pending = False
+        self._closed = False
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.wakeups = 0
+        self.batches = 0
+        self.max_depth = 0
+
+    def bind(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        """绑定消费者所在的事件循环（须在循环线程内调用）."""
+        self._loop = loop or asyncio.get_running_loop()
+        self._event = asyncio.Event()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item: Any) -> bool:
+        """入队（线程安全，不阻塞）.
+
+        Returns:
+            False 表示队列未绑定/已关闭，帧被丢弃
+        """
+        loop = self._loop
+        if self._closed or loop is None:
+            return False
+        with self._lock:
+            if len(self._items) >= self._maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self.enqueued += 1
+            depth = len(self._items)
+            if depth > self.max_depth:
+                self.max_depth = depth
+            if self._wakeup_pending:
+                return True
+            self._wakeup_pending = True
+        try:
+            loop.call_soon_threadsafe(self._wake)
+        except RuntimeError:
+            # 事件循环已关闭
+            return False
+        return True
+
+    def _wake(self) -> None:
+        self.wakeups += 1
+        self._event.set()
+
+    async def get_batch(self) -> list:
+        """等待并取出当前全部帧；队列关闭且为空时返回空列表."""
+        while True:
+            with self._lock:
+                if self._items:
+                    batch = list(self._items)
+                    self._items.clear()
+                    self._wakeup_pending = False
+                    self.batches += 1
+                    return batch
+                self._wakeup_pending = False
+                if self._closed:
+                    return []
+            await self._event.wait()
+            self._event.clear()
+
+    def close(self) -> None:
+        """关闭队列：拒绝后续 put，消费者取完剩余帧后收到空批次."""
+        self._closed = True
+        loop = self._loop
+        if loop is None or self._event is None:
+            return
+        try:
+            if loop.is_closed():
+                return
+            loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            pass
+
+    def stats(self) -> dict:
+        batches = self.batches
+        return {
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "wakeups": self.wakeups,
+            "batches": batches,
+            "avg_batch": round(
+                (self.enqueued - self.dropped - len(self._items)) / batches, 2
+            )
+            if batches
+            else 0.0,
+            "max_depth": self.max_depth,
+            "depth": len(self._items),
+        }
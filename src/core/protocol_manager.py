@@ -5,11 +5,14 @@
 """
 
 import asyncio
-from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
 
+from src.audio_codecs.opus_packet import InboundAudioPacket
 from src.constants.constants import ListeningMode
 from src.core.event_bus import EventBus, Events
 from src.logging import get_logger
+from src.utils.config_manager import get_config
 
 if TYPE_CHECKING:
     from src.core.task_manager import TaskManager
@@ -19,9 +22,13 @@ logger = get_logger()
 
 # 音频回调类型
 AudioCallback = Callable[[bytes], Awaitable[None]]
+# 批量回调：入站包记录列表（sequence 为 None 表示传输层无序列号，即 WebSocket）
+AudioBatchCallback = Callable[[list[InboundAudioPacket]], Awaitable[None]]
 
 # 入站音频有界队列：满时丢弃最旧帧，防止 event loop 被任务淹没
 _INCOMING_AUDIO_QUEUE_SIZE = 64
+# 非正常断线后的自动重连次数默认值：0 关闭（同协议层默认），由用户按需开启
+_DEFAULT_RECONNECT_ATTEMPTS = 0
 
 
 class ProtocolTransport:
@@ -30,27 +37,31 @@ class ProtocolTransport:
     def __init__(
         self,
         event_bus: EventBus,
-        task_manager: Optional["TaskManager"] = None,
+        task_manager: "TaskManager | None" = None,
     ):
         self._event_bus = event_bus
         self._task_manager = task_manager
-        self._protocol: Optional["Protocol"] = None
+        self._protocol: Protocol | None = None
         self._connect_lock = asyncio.Lock()
-        self._incoming_audio_handler: Optional[AudioCallback] = None
+        self._incoming_audio_handler: AudioCallback | None = None
+        self._incoming_audio_batch_handler: AudioBatchCallback | None = None
 
         # 有界音频队列 + 单 consumer（替代 per-packet create_task）
-        self._audio_queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(
-            maxsize=_INCOMING_AUDIO_QUEUE_SIZE
+        # 元素为 InboundAudioPacket（入队时查表得时长），sequence 仅 MQTT/UDP 提供
+        self._audio_queue: asyncio.Queue[InboundAudioPacket | None] = (
+            asyncio.Queue(maxsize=_INCOMING_AUDIO_QUEUE_SIZE)
         )
-        self._audio_consumer_task: Optional[asyncio.Task] = None
+        self._audio_consumer_task: asyncio.Task | None = None
         self._audio_consumer_running = False
+        # 自动重连进行中：恢复的通道不是用户发起的会话
+        self._reconnecting = False
 
     def set_task_manager(self, task_manager: "TaskManager") -> None:
         """注入 TaskManager（容器初始化后可再绑定）."""
         self._task_manager = task_manager
 
     @property
-    def protocol(self) -> Optional["Protocol"]:
+    def protocol(self) -> "Protocol | None":
         return self._protocol
 
     def set_protocol(self, protocol_type: str) -> None:
@@ -66,12 +77,30 @@ class ProtocolTransport:
             self._protocol = WebsocketProtocol()
 
         self._setup_callbacks()
+        self._configure_reconnect()
         self._ensure_audio_consumer()
 
-    def set_audio_handler(self, handler: Optional[AudioCallback]) -> None:
+    def _configure_reconnect(self) -> None:
+        """按 SYSTEM_OPTIONS.NETWORK.AUTO_RECONNECT_ATTEMPTS 启用断线自动重连."""
+        attempts = get_config().get_config(
+            "SYSTEM_OPTIONS.NETWORK.AUTO_RECONNECT_ATTEMPTS",
+            _DEFAULT_RECONNECT_ATTEMPTS,
+        )
+        try:
+            attempts = max(0, int(attempts))
+        except (TypeError, ValueError):
+            attempts = _DEFAULT_RECONNECT_ATTEMPTS
+        self._protocol.enable_auto_reconnect(attempts > 0, max_attempts=attempts)
+
+    def set_audio_handler(self, handler: AudioCallback | None) -> None:
         self._incoming_audio_handler = handler
         self._ensure_audio_consumer()
 
+    def set_audio_batch_handler(self, handler: AudioBatchCallback | None) -> None:
+        """批量处理器：consumer 一次取空队列，整批交出（优先于单包处理器）."""
+        self._incoming_audio_batch_handler = handler
+        self._ensure_audio_consumer()
+
     def _setup_callbacks(self) -> None:
         if not self._protocol:
             return
@@ -81,6 +110,7 @@ class ProtocolTransport:
         self._protocol.on_incoming_audio(self._on_incoming_audio)
         self._protocol.on_audio_channel_opened(self._on_audio_channel_opened)
         self._protocol.on_audio_channel_closed(self._on_audio_channel_closed)
+        self._protocol.on_reconnecting(self._on_reconnecting)
 
     def _spawn(self, coro: Awaitable, name: str) -> None:
         """优先走 TaskManager；否则本地 create_task 并记录异常."""
@@ -145,24 +175,56 @@ class ProtocolTransport:
         self._audio_consumer_task.add_done_callback(_on_done)
 
     async def _audio_consumer_loop(self) -> None:
-        """单消费者串行处理入站音频，避免 per-frame 任务爆炸."""
+        """单消费者串行处理入站音频，避免 per-frame 任务爆炸.
+
+        每次唤醒取空队列：TTS 快于实时下发时整批交给批量处理器，
+        减少 event loop 唤醒与下游 FIFO 取锁次数。
+        """
         while True:
             data = await self._audio_queue.get()
             if data is None:
                 # 毒丸：退出
                 return
+            batch: list[InboundAudioPacket] = [data]
+            stop = False
+            while True:
+                try:
+                    item = self._audio_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    # 毒丸前已到的包照常处理，再退出
+                    stop = True
+                    break
+                batch.append(item)
+
+            await self._dispatch_audio_batch(batch)
+            if stop:
+                return
+
+    async def _dispatch_audio_batch(self, batch: list[InboundAudioPacket]) -> None:
+        try:
+            if self._incoming_audio_batch_handler:
+                await self._incoming_audio_batch_handler(batch)
+                return
+        except Exception as e:
+            logger.error(f"处理入站音频失败: {e}", exc_info=True)
+            return
+
+        for packet in batch:
             try:
                 if self._incoming_audio_handler:
-                    await self._incoming_audio_handler(data)
+                    await self._incoming_audio_handler(packet.data)
                 else:
-                    await self._event_bus.emit(Events.INCOMING_AUDIO, data)
+                    await self._event_bus.emit(Events.INCOMING_AUDIO, packet.data)
             except Exception as e:
                 logger.error(f"处理入站音频失败: {e}", exc_info=True)
 
-    def _enqueue_audio(self, data: bytes) -> None:
+    def _enqueue_audio(self, data: bytes, sequence: int | None = None) -> None:
         """有界入队：满则丢最旧帧再放入最新帧."""
+        item = InboundAudioPacket(data, sequence)
         try:
-            self._audio_queue.put_nowait(data)
+            self._audio_queue.put_nowait(item)
             return
         except asyncio.QueueFull:
             pass
@@ -173,7 +235,7 @@ class ProtocolTransport:
         except asyncio.QueueEmpty:
             pass
         try:
-            self._audio_queue.put_nowait(data)
+            self._audio_queue.put_nowait(item)
         except asyncio.QueueFull:
             logger.warning("入站音频队列仍满，丢弃当前帧")
 
@@ -210,7 +272,11 @@ class ProtocolTransport:
             except asyncio.QueueEmpty:
                 break
 
+    def _on_reconnecting(self, attempt: int, max_attempts: int) -> None:
+        self._reconnecting = True
+
     async def _on_network_error(self, error_message: str = None) -> None:
+        self._reconnecting = False
         if error_message:
             logger.error(f"网络错误: {error_message}")
         await self._event_bus.emit(Events.NETWORK_ERROR, error_message)
@@ -221,14 +287,21 @@ class ProtocolTransport:
             name="protocol:incoming_json",
         )
 
-    def _on_incoming_audio(self, data: bytes) -> None:
+    def _on_incoming_audio(self, data: bytes, sequence: int | None = None) -> None:
         try:
             self._ensure_audio_consumer()
-            self._enqueue_audio(data)
+            self._enqueue_audio(data, sequence)
         except Exception as exc:
             logger.warning(f"分发音频数据失败: {exc}", exc_info=True)
 
     async def _on_audio_channel_opened(self) -> None:
+        if self._reconnecting:
+            # 断线后自动恢复：会话已随断线回到空闲，不重发 AUDIO_CHANNEL_OPENED
+            # （否则会进入聆听态却未向服务端发起聆听），下次交互直接复用该连接
+            self._reconnecting = False
+            logger.info("协议通道已自动恢复")
+            await self._event_bus.emit(Events.PROTOCOL_CONNECTED, self._protocol)
+            return
         logger.info("协议通道已打开")
         await self._event_bus.emit(Events.AUDIO_CHANNEL_OPENED)
         await self._event_bus.emit(Events.PROTOCOL_CONNECTED, self._protocol)
@@ -257,6 +330,8 @@ class ProtocolTransport:
             if self.is_audio_channel_opened():
                 return True
 
+            # 应用主动建连：即使处于重连退避中，也按正常打开通道通知会话
+            self._reconnecting = False
             try:
                 opened = await asyncio.wait_for(
                     self._protocol.open_audio_channel(),
@@ -351,7 +426,7 @@ class ProtocolManager:
     def __init__(
         self,
         event_bus: EventBus,
-        task_manager: Optional["TaskManager"] = None,
+        task_manager: "TaskManager | None" = None,
     ):
         self._transport = ProtocolTransport(event_bus, task_manager=task_manager)
         self._gateway = ProtocolGateway(self._transport)
@@ -360,15 +435,18 @@ class ProtocolManager:
         self._transport.set_task_manager(task_manager)
 
     @property
-    def protocol(self) -> Optional["Protocol"]:
+    def protocol(self) -> "Protocol | None":
         return self._transport.protocol
 
     def set_protocol(self, protocol_type: str) -> None:
         self._transport.set_protocol(protocol_type)
 
-    def set_audio_handler(self, handler: Optional[AudioCallback]) -> None:
+    def set_audio_handler(self, handler: AudioCallback | None) -> None:
         self._transport.set_audio_handler(handler)
 
+    def set_audio_batch_handler(self, handler: AudioBatchCallback | None) -> None:
+        self._transport.set_audio_batch_handler(handler)
+
     def is_audio_channel_opened(self) -> bool:
         return self._transport.is_audio_channel_opened()
 
@@ -4,8 +4,6 @@ Normal camera implementation using remote API.
 
 import json
 
-import requests
-
 from src.logging import get_logger
 from src.utils.config_manager import get_config
 
@@ -43,6 +41,8 @@ class NormalCamera(BaseCamera):
         return self.capture_frame()
 
     def analyze(self, question: str, image_data: bytes | None = None) -> str:
+        import requests
+
         if not self.explain_url:
             return json.dumps(
                 {"success": False, "message": "Image explain URL is not set"}
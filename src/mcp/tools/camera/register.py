@@ -8,9 +8,6 @@ from src.logging import get_logger
 from src.mcp.tooling import McpTool, Property, PropertyList, PropertyType
 from src.utils.config_manager import get_config
 
-from .normal_camera import NormalCamera
-from .vl_camera import VLCamera
-
 logger = get_logger()
 
 
@@ -23,10 +20,15 @@ def create_camera():
     vl_key = config.get_config("CAMERA.VLapi_key")
     vl_url = config.get_config("CAMERA.Local_VL_url")
 
+    # 按需导入实现：VLCamera 依赖 openai/httpx，未配置时不加载
     if vl_key and vl_url:
+        from .vl_camera import VLCamera
+
         logger.info(f"Initializing VL Camera with URL: {vl_url}")
         return VLCamera()
 
+    from .normal_camera import NormalCamera
+
     logger.info("VL configuration not found, using normal Camera implementation")
     return NormalCamera()
 
@@ -11,8 +11,6 @@ from pathlib import Path
 from typing import Any, Mapping
 from urllib.parse import urlparse
 
-import requests
-
 from src.logging import get_logger
 from src.utils.resource_finder import get_ffmpeg_path
 
@@ -157,6 +155,8 @@ class MusicDownloader:
     async def _fetch_json(
         self, url: str, headers: dict[str, str], *, timeout: int = 15
     ) -> Any | None:
+        import requests
+
         try:
             response = await asyncio.to_thread(
                 requests.get, url, headers=headers, timeout=timeout
@@ -287,6 +287,8 @@ class MusicDownloader:
     def _sync_download(
         self, download_url: str, headers: dict, temp_path: Path, cache_path: Path
     ) -> Path:
+        import requests
+
         # CDN 偶发 RemoteDisconnected，多试两次
         last_err: Exception | None = None
         for attempt in range(3):
@@ -5,8 +5,6 @@ from __future__ import annotations
 import asyncio
 from typing import Any
 
-import requests
-
 from src.logging import get_logger
 
 logger = get_logger()
@@ -95,6 +93,8 @@ async def fetch_kuwo_lyrics(
     headers: dict[str, Any] | None = None,
 ) -> list[LyricLine]:
     """从酷我接口拉歌词并解析."""
+    import requests
+
     try:
         logger.info(f"获取歌词: ID={song_id}")
         response = await asyncio.to_thread(
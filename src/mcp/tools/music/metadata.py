@@ -1,18 +1,14 @@
 """本地音频文件元数据."""
 
+import importlib.util
 from pathlib import Path
 
 from src.logging import get_logger
 
 logger = get_logger()
 
-try:
-    from mutagen import File as MutagenFile
-    from mutagen.id3 import ID3NoHeaderError
-
-    MUTAGEN_AVAILABLE = True
-except ImportError:
-    MUTAGEN_AVAILABLE = False
+# mutagen 导入时注册全部格式，较重：只探测是否安装，首次读元数据时再导入
+MUTAGEN_AVAILABLE = importlib.util.find_spec("mutagen") is not None
 
 
 class MusicMetadata:
@@ -33,6 +29,9 @@ class MusicMetadata:
         if not MUTAGEN_AVAILABLE:
             return False
 
+        from mutagen import File as MutagenFile
+        from mutagen.id3 import ID3NoHeaderError
+
         try:
             audio_file = MutagenFile(self.file_path)
             if audio_file is None:
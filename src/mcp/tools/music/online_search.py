@@ -6,8 +6,6 @@ import asyncio
 from dataclasses import dataclass
 from urllib.parse import quote
 
-import requests
-
 from src.logging import get_logger
 
 from .config import DEFAULT_SEARCH_URL
@@ -26,6 +24,8 @@ class SearchHit:
 
 async def search_song(song_name: str, config: dict) -> SearchHit | None:
     """搜一首歌；失败返回 None."""
+    import requests
+
     try:
         keyword_encoded = quote(song_name)
         limit = int(config.get("SEARCH_LIMIT") or 20)
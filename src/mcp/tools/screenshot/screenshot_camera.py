@@ -31,11 +31,11 @@ class ScreenshotCamera(BaseCamera):
         """
         导入必要的依赖库.
         """
-        # 检测 PIL 是否可用（避免未使用导入的告警）
+        # 检测 PIL 是否可用：只查顶层包，查子模块会导入 PIL 本身
         try:
             import importlib.util
 
-            self._pil_available = importlib.util.find_spec("PIL.ImageGrab") is not None
+            self._pil_available = importlib.util.find_spec("PIL") is not None
             if self._pil_available:
                 logger.info("PIL ImageGrab available for screenshot capture")
             else:
@@ -9,6 +9,8 @@ import os
 from typing import TYPE_CHECKING
 
 from src.audio_codecs.audio_codec import AudioCodec
+from src.audio_codecs.opus_packet import InboundAudioPacket
+from src.core.frame_queue import FrameQueue
 from src.logging import get_logger
 from src.plugins.base import Plugin
 
@@ -17,7 +19,8 @@ if TYPE_CHECKING:
 
 logger = get_logger()
 
-MAX_CONCURRENT_AUDIO_SENDS = 4
+# 上行待发帧上限（20ms 帧约 1s）；网络阻塞时丢最旧帧，保证恢复后发送的是最新语音
+SEND_QUEUE_MAX_FRAMES = 50
 
 
 class AudioPlugin(Plugin):
@@ -27,7 +30,9 @@ class AudioPlugin(Plugin):
     def __init__(self) -> None:
         super().__init__()
         self.codec: AudioCodec | None = None
-        self._send_sem = asyncio.Semaphore(MAX_CONCURRENT_AUDIO_SENDS)
+        # 音频线程 → 常驻发送协程；替代每帧 schedule_nowait + 任务 + 信号量
+        self._send_queue = FrameQueue(SEND_QUEUE_MAX_FRAMES)
+        self._sender_task: asyncio.Task | None = None
         self._in_silence_period = False
 
     async def setup(self, ctx: "PluginContext", cmd: "PluginCommands") -> None:
@@ -40,6 +45,8 @@ class AudioPlugin(Plugin):
         try:
             self.codec = AudioCodec()
             await self.codec.initialize()
+            self._send_queue.bind(asyncio.get_running_loop())
+            self._sender_task = cmd.spawn(self._sender_loop(), "audio_sender")
             self.codec.set_encoded_callback(self._on_encoded_audio)
 
             from src.core.event_bus import Events
@@ -61,6 +68,12 @@ class AudioPlugin(Plugin):
         if self.codec and not self.failed:
             await self._publish_audio_codec(self.codec)
 
+    async def stop(self) -> None:
+        self._send_queue.close()
+        if self._sender_task:
+            logger.info(f"音频上行队列统计: {self._send_queue.stats()}")
+        await super().stop()
+
     async def _publish_audio_codec(self, codec) -> None:
         """向订阅者（如 MusicPlayer）发布 AudioCodec 实例或 None."""
         if not self._ctx or not self._ctx.event_bus:
@@ -175,6 +188,16 @@ class AudioPlugin(Plugin):
             except Exception as e:
                 logger.debug(f"写入音频数据失败: {e}")
 
+    async def on_incoming_audio_batch(self, packets: list[InboundAudioPacket]) -> None:
+        """
+        批量接收并播放音频数据（协议层一次取空入站队列；带序列号时经抖动缓冲）.
+        """
+        if self.codec:
+            try:
+                await self.codec.write_packets(packets)
+            except Exception as e:
+                logger.debug(f"批量写入音频数据失败: {e}")
+
     async def _pause_music_for_tts(self):
         """TTS 开始时暂停音乐（TTS/音乐分队列混音，互不丢帧；音乐余量自然淡出）."""
         try:
@@ -222,26 +245,29 @@ class AudioPlugin(Plugin):
 
     def _on_encoded_audio(self, encoded_data: bytes) -> None:
         """
-        音频编码回调（从音频线程调用）.
+        音频编码回调（从音频线程调用），仅入队，不触碰事件循环对象.
         """
-        try:
-            if not self._cmd:
+        self._send_queue.put(encoded_data)
+
+    async def _sender_loop(self) -> None:
+        """常驻发送协程：按批取出编码帧，逐帧顺序发送."""
+        queue = self._send_queue
+        while True:
+            batch = await queue.get_batch()
+            if not batch:
                 return
-            self._cmd.schedule_command_nowait(self._send_audio_async, encoded_data)
-        except Exception as e:
-            logger.error(f"调度音频发送失败: {e}", exc_info=True)
-
-    async def _send_audio_async(self, encoded_data: bytes) -> None:
-        """
-        异步发送音频数据.
-        """
-        async with self._send_sem:
             try:
                 if not self._ctx.is_audio_channel_opened():
-                    return
-                if self._should_send_microphone_audio():
+                    continue
+                for encoded_data in batch:
+                    # 逐帧判定：静默期/状态可能在批内 await 期间变化
+                    if not self._should_send_microphone_audio():
+                        continue
                     await self._cmd.send_audio(encoded_data)
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
+                # 整批放弃，避免通道故障时逐帧刷屏
                 logger.error(f"发送音频数据失败: {e}", exc_info=True)
 
     def _should_send_microphone_audio(self) -> bool:
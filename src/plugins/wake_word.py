@@ -44,6 +44,12 @@ class WakeWordPlugin(Plugin):
         try:
             # 延迟加载模型到 start() 阶段，避免 setup() 时与 PortAudio DLL 冲突
             if self.detector is None:
+                # 未启用时不导入检测器（numpy / sherpa-onnx / 模型路径解析）
+                config = self._ctx.get_config()
+                if not config.get_config("WAKE_WORD_OPTIONS.USE_WAKE_WORD", False):
+                    logger.info("唤醒词功能已禁用")
+                    return
+
                 from src.audio_processing.wake_word_detect import WakeWordDetector
 
                 self.detector = WakeWordDetector()
@@ -2,8 +2,17 @@
 
 from __future__ import annotations
 
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+import struct
+
+
+def _aes_cipher(key: bytes, mode_name: str, *args):
+    """构造 AES Cipher；cryptography 仅 MQTT/UDP 通道使用，按需导入."""
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+    return Cipher(
+        algorithms.AES(key), getattr(modes, mode_name)(*args), backend=default_backend()
+    )
 
 
 def aes_ctr_encrypt(key: bytes, nonce: bytes, plaintext: bytes) -> bytes:
@@ -14,8 +23,7 @@ def aes_ctr_encrypt(key: bytes, nonce: bytes, plaintext: bytes) -> bytes:
         nonce: 初始向量（与解密时一致）
         plaintext: 明文
     """
-    cipher = Cipher(algorithms.AES(key), modes.CTR(nonce), backend=default_backend())
-    encryptor = cipher.encryptor()
+    encryptor = _aes_cipher(key, "CTR", nonce).encryptor()
     return encryptor.update(plaintext) + encryptor.finalize()
 
 
@@ -27,8 +35,7 @@ def aes_ctr_decrypt(key: bytes, nonce: bytes, ciphertext: bytes) -> bytes:
         nonce: 与加密相同的 nonce
         ciphertext: 密文
     """
-    cipher = Cipher(algorithms.AES(key), modes.CTR(nonce), backend=default_backend())
-    decryptor = cipher.decryptor()
+    decryptor = _aes_cipher(key, "CTR", nonce).decryptor()
     return decryptor.update(ciphertext) + decryptor.finalize()
 
 
@@ -43,3 +50,70 @@ def build_audio_nonce(aes_nonce_hex: str, audio_len: int, sequence: int) -> str:
         + aes_nonce_hex[8:24]
         + format(sequence, "08x")
     )
+
+
+_U64_MAX = (1 << 64) - 1
+_U128_MASK = (1 << 128) - 1
+# 单包上限（与收包缓冲一致），计数器块缓冲按此预分配
+_MAX_PACKET_BYTES = 4096
+
+
+class AudioPacketCipher:
+    """UDP 音频包 AES-CTR 加解密（会话级缓存，单方向单线程使用）.
+
+    CTR 每包 nonce 不同，逐包 Cipher(CTR(nonce)) 需重建上下文；这里改为
+    会话内只解码一次密钥、缓存一个 AES-ECB 上下文，把 nonce 起的计数器块
+    写进复用缓冲一次性加密得到密钥流，再按整数异或。结果与 aes_ctr_encrypt
+    逐字节一致（nonce 视为 128 位大端计数器）。
+
+    发送与接收在不同线程，须各持一个实例。
+    """
+
+    def __init__(self, key_hex: str, nonce_hex: str):
+        self._ecb = _aes_cipher(bytes.fromhex(key_hex), "ECB").encryptor()
+        # 发送 nonce 模板：仅 [2:4] 长度与 [12:16] 序列号逐包改写
+        self._nonce = bytearray(bytes.fromhex(nonce_hex))
+        if len(self._nonce) != 16:
+            raise ValueError(f"nonce 长度应为 16 字节: {len(self._nonce)}")
+        self._counters = bytearray(_MAX_PACKET_BYTES + 16)
+        self._counters_view = memoryview(self._counters)
+
+    def _keystream_int(self, hi: int, lo: int, length: int) -> int:
+        blocks = (length + 15) >> 4
+        if 16 * blocks > len(self._counters):
+            self._counters = bytearray(16 * blocks)
+            self._counters_view = memoryview(self._counters)
+        if lo + blocks <= _U64_MAX:
+            values = []
+            for i in range(blocks):
+                values += (hi, lo + i)
+            struct.pack_into(f">{2 * blocks}Q", self._counters, 0, *values)
+        else:
+            # 低 64 位进位（极少见）：按 128 位整数逐块计算
+            base = (hi << 64) | lo
+            for i in range(blocks):
+                struct.pack_into(
+                    ">16s",
+                    self._counters,
+                    16 * i,
+                    ((base + i) & _U128_MASK).to_bytes(16, "big"),
+                )
+        stream = self._ecb.update(self._counters_view[: 16 * blocks])
+        return int.from_bytes(memoryview(stream)[:length], "big")
+
+    def encrypt(self, audio_data, sequence: int) -> bytes:
+        """加密并组包：nonce(16) + 密文，一次生成最终 bytes."""
+        length = len(audio_data)
+        struct.pack_into(">H", self._nonce, 2, length)
+        struct.pack_into(">I", self._nonce, 12, sequence)
+        hi, lo = struct.unpack_from(">QQ", self._nonce)
+        body = int.from_bytes(audio_data, "big") ^ self._keystream_int(hi, lo, length)
+        return (((hi << 64 | lo) << (8 * length)) | body).to_bytes(16 + length, "big")
+
+    def decrypt(self, packet) -> tuple[bytes, int]:
+        """解密收到的包（nonce(16) + 密文），返回 (明文, 序列号)."""
+        hi, lo = struct.unpack_from(">QQ", packet)
+        length = len(packet) - 16
+        body = int.from_bytes(memoryview(packet)[16:], "big")
+        plain = (body ^ self._keystream_int(hi, lo, length)).to_bytes(length, "big")
+        return plain, lo & 0xFFFFFFFF
@@ -13,8 +13,9 @@ import paho.mqtt.client as mqtt
 
 from src.constants.constants import AudioConfig
 from src.logging import get_logger
-from src.protocols.mqtt_udp import MqttUdpChannel
+from src.protocols.mqtt_udp import MqttUdpChannel, MqttUdpDatagramChannel
 from src.protocols.protocol import Protocol
+from src.protocols.tls_session import ResumableSSLContext
 from src.utils.config_manager import get_config
 
 logger = get_logger()
@@ -62,9 +63,17 @@ class MqttProtocol(Protocol):
         self.password = None
         self.publish_topic = None
         self.subscribe_topic = None
+        # TLS 上下文跨重连复用（每次 connect 都新建 paho 客户端），携带上次会话
+        self._tls_context: ResumableSSLContext | None = None
 
-        # UDP 音频通道
-        self._udp = MqttUdpChannel(loop)
+        # UDP 音频通道：asyncio 数据报端点（默认）或收包线程（回退）
+        udp_transport = self.config.get_config(
+            "SYSTEM_OPTIONS.NETWORK.UDP_TRANSPORT", "asyncio"
+        )
+        if udp_transport == "thread":
+            self._udp = MqttUdpChannel(loop)
+        else:
+            self._udp = MqttUdpDatagramChannel(loop)
         self._udp.set_audio_handler(self._on_udp_audio)
 
         self.server_hello_event = asyncio.Event()
@@ -86,15 +95,15 @@ class MqttProtocol(Protocol):
     def udp_port(self) -> int:
         return self._udp.port
 
-    def _on_udp_audio(self, audio_data: bytes) -> None:
-        """在 event loop 线程：把 UDP 帧交给协议 on_incoming_audio."""
+    def _on_udp_audio(self, audio_data: bytes, sequence: int | None = None) -> None:
+        """在 event loop 线程：把 UDP 帧（连同 nonce 序列号）交给协议 on_incoming_audio."""
         cb = self._on_incoming_audio
         if not cb:
             return
         if asyncio.iscoroutinefunction(cb):
-            self.loop.create_task(cb(audio_data))
+            self.loop.create_task(cb(audio_data, sequence))
         else:
-            cb(audio_data)
+            cb(audio_data, sequence)
 
     def _schedule_coro(self, coro, name: str = "mqtt") -> None:
         """从任意线程安全调度协程到 event loop，并记录异常."""
@@ -196,13 +205,10 @@ class MqttProtocol(Protocol):
 
         if use_tls:
             try:
-                self.mqtt_client.tls_set(
-                    ca_certs=None,
-                    certfile=None,
-                    keyfile=None,
-                    cert_reqs=mqtt.ssl.CERT_REQUIRED,
-                    tls_version=mqtt.ssl.PROTOCOL_TLS,
-                )
+                # 系统 CA 校验证书与主机名（同原 tls_set(CERT_REQUIRED)）
+                if self._tls_context is None:
+                    self._tls_context = ResumableSSLContext.default()
+                self.mqtt_client.tls_set_context(self._tls_context)
                 logger.info("已配置TLS加密连接")
             except Exception as e:
                 logger.error(
@@ -219,6 +225,9 @@ class MqttProtocol(Protocol):
         def on_connect_callback(client, userdata, flags, rc, properties=None):
             if rc == 0:
                 logger.info("已连接到MQTT服务器")
+                if use_tls:
+                    # CONNACK 之前的 TLS 1.3 ticket 已处理，记下会话供重连复用
+                    self._tls_context.remember(client.socket())
                 self._last_activity_time = time.time()
                 self.loop.call_soon_threadsafe(lambda: connect_future.set_result(True))
             else:
@@ -255,6 +264,13 @@ class MqttProtocol(Protocol):
 
                 self._udp.stop()
 
+                # 与 _handle_connection_loss 一致：重连前先通知通道关闭，会话回到空闲
+                if self._on_audio_channel_closed:
+                    self._schedule_coro(
+                        self._on_audio_channel_closed(),
+                        name="audio_channel_closed",
+                    )
+
                 if (
                     rc != 0
                     and not self._is_closing
@@ -266,11 +282,6 @@ class MqttProtocol(Protocol):
                         name=f"reconnect:rc={rc}",
                     )
                 else:
-                    if self._on_audio_channel_closed:
-                        self._schedule_coro(
-                            self._on_audio_channel_closed(),
-                            name="audio_channel_closed",
-                        )
                     if rc != 0 and self._on_network_error:
                         error_msg = f"MQTT连接断开: {rc}"
                         if (
@@ -550,6 +561,8 @@ class MqttProtocol(Protocol):
                 "udp_server": (
                     f"{self._udp.server}:{self._udp.port}" if self._udp.server else None
                 ),
+                "udp_rx": self._udp.rx_stats(),
+                "tls": self._tls_context.stats() if self._tls_context else None,
                 "session_id": self.session_id,
             }
         )
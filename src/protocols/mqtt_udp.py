@@ -1,21 +1,25 @@
 """MQTT 会话配套的 UDP 加密音频通道.
 
-负责：套接字、收包线程、AES 加解密发包；经 event loop 把帧回调给上层。
+负责：套接字、收包、AES 加解密发包；把帧回调给上层（event loop 线程）。
+
+两种实现，由 SYSTEM_OPTIONS.NETWORK.UDP_TRANSPORT 选择：
+- MqttUdpDatagramChannel（asyncio，默认）：loop.create_datagram_endpoint，
+  收包直接在 event loop 回调，无额外线程、无逐包跨线程调度；
+  selector 循环下每次可读事件顺带非阻塞取空积压包（突发批量收取）
+- MqttUdpChannel（thread，回退）：阻塞 recvfrom 线程 + call_soon_threadsafe
 """
 
 from __future__ import annotations
 
 import asyncio
 import socket
+import struct
 import threading
 import time
 
 from src.logging import get_logger
-from src.protocols.mqtt_crypto import (
-    aes_ctr_decrypt,
-    aes_ctr_encrypt,
-    build_audio_nonce,
-)
+from src.protocols.mqtt_crypto import AudioPacketCipher
+from src.protocols.udp_sequence import InboundSequenceFilter
 
 logger = get_logger()
 
@@ -35,6 +39,11 @@ class MqttUdpChannel:
         self.aes_nonce: str | None = None  # hex
         self.local_sequence = 0
         self.remote_sequence = 0
+        # 会话级加解密上下文（configure 时建立；收发分属不同线程，各持一个）
+        self._tx_cipher: AudioPacketCipher | None = None
+        self._rx_cipher: AudioPacketCipher | None = None
+        # 入站序列号校验（丢重复/过旧包）与会话级丢包/乱序统计；仅收包侧线程访问
+        self._rx_filter = InboundSequenceFilter()
 
         self._on_incoming_audio = None
 
@@ -51,6 +60,14 @@ class MqttUdpChannel:
         self.aes_nonce = aes_nonce
         self.local_sequence = 0
         self.remote_sequence = 0
+        self._rx_filter.reset()
+        try:
+            self._tx_cipher = AudioPacketCipher(aes_key, aes_nonce)
+            self._rx_cipher = AudioPacketCipher(aes_key, aes_nonce)
+        except (TypeError, ValueError) as e:
+            logger.error(f"UDP 加密参数无效: {e}")
+            self._tx_cipher = None
+            self._rx_cipher = None
 
     def set_audio_handler(self, handler) -> None:
         self._on_incoming_audio = handler
@@ -102,10 +119,16 @@ class MqttUdpChannel:
     def reset_session(self) -> None:
         """goodbye 后清空会话侧字段."""
         self.stop()
+        stats = self._rx_filter.stats()
+        if stats["lost"] or stats["reordered"] or stats["duplicate"] or stats["stale"]:
+            logger.info(f"UDP 入站会话统计: {stats}")
+        self._rx_filter.reset()
         self.server = ""
         self.port = 0
         self.aes_key = None
         self.aes_nonce = None
+        self._tx_cipher = None
+        self._rx_cipher = None
         self.local_sequence = 0
         self.remote_sequence = 0
 
@@ -113,21 +136,14 @@ class MqttUdpChannel:
         if not self.socket or not self.server or not self.port:
             logger.error("UDP通道未初始化")
             return False
-        if not self.aes_key or not self.aes_nonce:
+        cipher = self._tx_cipher
+        if cipher is None:
             logger.error("UDP 加密参数缺失")
             return False
 
         self.local_sequence = (self.local_sequence + 1) & 0xFFFFFFFF
-        new_nonce = build_audio_nonce(
-            self.aes_nonce, len(audio_data), self.local_sequence
-        )
-        encrypt_encoded_data = aes_ctr_encrypt(
-            bytes.fromhex(self.aes_key),
-            bytes.fromhex(new_nonce),
-            bytes(audio_data),
-        )
-        packet = bytes.fromhex(new_nonce) + encrypt_encoded_data
-        self.socket.sendto(packet, (self.server, self.port))
+        packet = cipher.encrypt(audio_data, self.local_sequence)
+        self._sendto(packet)
 
         if self.local_sequence % 10 == 0:
             logger.info(
@@ -136,6 +152,30 @@ class MqttUdpChannel:
             )
         return True
 
+    def _sendto(self, packet: bytes) -> None:
+        self.socket.sendto(packet, (self.server, self.port))
+
+    def _decrypt_packet(self, data: bytes) -> tuple[bytes, int] | None:
+        """校验并解密收到的包，返回 (明文, 序列号)；无效包返回 None."""
+        if len(data) < 16:
+            logger.error(f"无效的音频数据包大小: {len(data)}")
+            return None
+        cipher = self._rx_cipher
+        if cipher is None:
+            return None
+        # 序列号在 nonce 明文部分：重复/过旧包不解密直接丢弃
+        sequence = struct.unpack_from(">I", data, 12)[0]
+        if not self._rx_filter.accept(sequence):
+            return None
+        self.remote_sequence = self._rx_filter.highest
+        return cipher.decrypt(data)
+
+    def rx_stats(self) -> dict:
+        """入站丢包/乱序/重复统计（本会话）."""
+        stats = self._rx_filter.stats()
+        stats["transport"] = "thread"
+        return stats
+
     def _receive_loop(self) -> None:
         debug_counter = 0
         while self.running and self.socket:
@@ -143,28 +183,18 @@ class MqttUdpChannel:
                 data, _addr = self.socket.recvfrom(4096)
                 debug_counter += 1
                 try:
-                    if len(data) < 16:
-                        logger.error(f"无效的音频数据包大小: {len(data)}")
-                        continue
-                    if not self.aes_key:
+                    result = self._decrypt_packet(data)
+                    if result is None:
                         continue
 
-                    received_nonce = data[:16]
-                    encrypted_audio = data[16:]
-                    decrypted = aes_ctr_decrypt(
-                        bytes.fromhex(self.aes_key),
-                        received_nonce,
-                        encrypted_audio,
-                    )
-
                     if debug_counter % 100 == 0:
                         logger.debug(
                             f"已解密音频数据包 #{debug_counter}, "
-                            f"大小: {len(decrypted)} 字节"
+                            f"大小: {len(result[0])} 字节"
                         )
 
                     if self._on_incoming_audio:
-                        self._dispatch_audio(decrypted)
+                        self._dispatch_audio(*result)
 
                 except Exception as e:
                     logger.error(f"处理音频数据包错误: {e}", exc_info=True)
@@ -179,12 +209,164 @@ class MqttUdpChannel:
 
         logger.info("UDP接收线程已停止")
 
-    def _dispatch_audio(self, audio_data: bytes) -> None:
+    def _dispatch_audio(self, audio_data: bytes, sequence: int) -> None:
         """从收包线程把帧回调调度到 event loop（handler 须为同步，在 loop 线程执行）."""
         handler = self._on_incoming_audio
         if not handler:
             return
         try:
-            self._loop.call_soon_threadsafe(handler, audio_data)
+            self._loop.call_soon_threadsafe(handler, audio_data, sequence)
         except Exception as e:
             logger.error(f"调度音频回调失败: {e}", exc_info=True)
+
+
+# 每次可读事件最多额外取出的积压包数（selector 循环）
+_MAX_DRAIN_PACKETS = 32
+
+
+class _UdpAudioProtocol(asyncio.DatagramProtocol):
+    def __init__(self, channel: MqttUdpDatagramChannel) -> None:
+        self._channel = channel
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self._channel._on_datagram(data)
+
+    def error_received(self, exc: Exception) -> None:
+        # 如 ICMP 端口不可达：UDP 无连接，记录后继续
+        logger.debug(f"UDP 数据报错误: {exc}")
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        if exc:
+            logger.warning(f"UDP 数据报端点异常关闭: {exc}")
+
+
+class MqttUdpDatagramChannel(MqttUdpChannel):
+    """UDP 音频传输（asyncio 数据报端点，无收包线程）.
+
+    创建端点失败（事件循环不支持数据报等）时自动回退父类的收包线程实现。
+    stop() 可从任意线程调用（如 paho 断开回调），传输关闭转交 event loop。
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__(loop)
+        self._transport: asyncio.DatagramTransport | None = None
+        # 仅 selector 循环可在回调内直接读同一 socket（proactor 有挂起的重叠读）
+        self._drain_enabled = isinstance(
+            loop, asyncio.selector_events.BaseSelectorEventLoop
+        )
+        self._mode = "asyncio"
+        self.received_packets = 0
+        self.drained_packets = 0
+
+    def configure(self, *args, **kwargs) -> None:
+        super().configure(*args, **kwargs)
+        self.received_packets = 0
+        self.drained_packets = 0
+
+    def _on_loop_thread(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def start(self) -> None:
+        """创建非阻塞套接字并在 event loop 上建立数据报端点（会先 stop 旧资源）."""
+        self.stop()
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # 显式绑定，确保 macOS 网络栈正确路由 UDP
+        sock.bind(("0.0.0.0", 0))
+        sock.setblocking(False)
+        self.socket = sock
+        self.running = True
+        self._mode = "asyncio"
+
+        coro = self._open_endpoint(sock)
+        if self._on_loop_thread():
+            self._loop.create_task(coro, name="mqtt-udp-endpoint")
+        else:
+            asyncio.run_coroutine_threadsafe(coro, self._loop)
+        logger.info(
+            f"UDP数据报端点已启动，监听来自 {self.server}:{self.port} 的数据"
+        )
+
+    async def _open_endpoint(self, sock: socket.socket) -> None:
+        try:
+            transport, _ = await self._loop.create_datagram_endpoint(
+                lambda: _UdpAudioProtocol(self), sock=sock
+            )
+        except Exception as e:
+            if self.socket is not sock or not self.running:
+                return
+            logger.warning(f"创建UDP数据报端点失败，回退收包线程: {e}")
+            self._mode = "thread"
+            MqttUdpChannel.start(self)
+            return
+
+        if self.socket is not sock or not self.running:
+            # 建立期间已 stop/重启
+            transport.close()
+            return
+        self._transport = transport
+
+    def stop(self) -> None:
+        transport, self._transport = self._transport, None
+        if transport is not None:
+            # 关闭传输即关闭其 socket；须在 event loop 线程执行
+            self.running = False
+            self.socket = None
+            if self._on_loop_thread():
+                transport.close()
+            else:
+                try:
+                    self._loop.call_soon_threadsafe(transport.close)
+                except RuntimeError:
+                    # event loop 已关闭
+                    pass
+        # 端点尚未建立时的裸 socket / 回退模式的收包线程
+        super().stop()
+
+    def rx_stats(self) -> dict:
+        stats = super().rx_stats()
+        stats["transport"] = self._mode
+        stats["datagrams"] = self.received_packets
+        stats["drained"] = self.drained_packets
+        return stats
+
+    def _sendto(self, packet: bytes) -> None:
+        transport = self._transport
+        if transport is not None:
+            transport.sendto(packet, (self.server, self.port))
+        else:
+            self.socket.sendto(packet, (self.server, self.port))
+
+    def _on_datagram(self, data: bytes) -> None:
+        """event loop 线程：处理一个包，并在 selector 循环下取空突发积压."""
+        self._handle_datagram(data)
+        if not self._drain_enabled:
+            return
+        sock = self.socket
+        for _ in range(_MAX_DRAIN_PACKETS):
+            if sock is None or not self.running:
+                return
+            try:
+                data, _addr = sock.recvfrom(4096)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.debug(f"UDP 积压读取失败: {e}")
+                return
+            self.drained_packets += 1
+            self._handle_datagram(data)
+
+    def _handle_datagram(self, data: bytes) -> None:
+        self.received_packets += 1
+        try:
+            result = self._decrypt_packet(data)
+            if result is None:
+                return
+            handler = self._on_incoming_audio
+            if handler:
+                handler(*result)
+        except Exception as e:
+            logger.error(f"处理音频数据包错误: {e}", exc_info=True)
@@ -1,11 +1,32 @@
 import asyncio
 import json
+import random
 
 from src.constants.constants import AbortReason, ListeningMode
 from src.logging import get_logger
 
 logger = get_logger()
 
+# 重连退避：首次立即重试，之后 base*2^n 封顶 cap，取 [c/2, c] 均匀抖动
+RECONNECT_BASE_DELAY = 1.0
+RECONNECT_MAX_DELAY = 30.0
+
+
+def reconnect_delay(
+    attempt: int,
+    base: float = RECONNECT_BASE_DELAY,
+    cap: float = RECONNECT_MAX_DELAY,
+) -> float:
+    """第 attempt 次（从 1 计）重连前的等待秒数.
+
+    瞬时断线（Wi-Fi 漫游、NAT 表项过期）大多立即重连即可成功，首次不等待；
+    后续指数退避并加抖动，避免大量设备在服务端重启后同一时刻集中重连。
+    """
+    if attempt <= 1:
+        return 0.0
+    ceiling = min(cap, base * 2 ** (attempt - 2))
+    return random.uniform(ceiling / 2, ceiling)
+
 
 class Protocol:
     def __init__(self):
@@ -284,11 +305,16 @@ class Protocol:
                     await self._handle_connection_loss("连接检测失败")
                     break
 
+                await self._on_monitor_tick()
+
         except asyncio.CancelledError:
             logger.debug("连接监控任务被取消")
         except Exception as e:
             logger.error(f"连接监控异常: {e}", exc_info=True)
 
+    async def _on_monitor_tick(self):
+        """连接存活时每个监控周期调用一次，子类可覆盖（如链路探测、预热备用连接）."""
+
     # ============ 自动重连（公共） ============
 
     def enable_auto_reconnect(self, enabled: bool = True, max_attempts: int = 5):
@@ -370,56 +396,80 @@ class Protocol:
                 else:
                     await self._on_network_error(f"连接丢失: {reason}")
 
+    def _reconnect_delay(self, attempt: int) -> float:
+        """第 attempt 次重连前的等待秒数，子类可覆盖."""
+        return reconnect_delay(attempt)
+
     async def _attempt_reconnect(self, original_reason: str):
         """尝试自动重连（公共逻辑）.
 
-        使用指数退避策略，调用子类的 connect() 进行实际连接.
+        首次立即重试，之后抖动指数退避，直到成功或达到最大次数；
+        实际连接由子类 connect() 完成（可复用预热连接 / TLS 会话）.
         """
-        self._reconnect_attempts += 1
-
-        # 通知开始重连
-        if self._on_reconnecting:
-            try:
-                self._on_reconnecting(
-                    self._reconnect_attempts, self._max_reconnect_attempts
-                )
-            except Exception as e:
-                logger.error(f"调用重连回调失败: {e}", exc_info=True)
+        error_message = f"重连失败，已达到最大重连次数: {original_reason}"
+        while (
+            not self._is_closing
+            and self._reconnect_attempts < self._max_reconnect_attempts
+        ):
+            self._reconnect_attempts += 1
 
-        logger.info(
-            f"尝试自动重连 ({self._reconnect_attempts}/{self._max_reconnect_attempts})"
-        )
+            # 通知开始重连
+            if self._on_reconnecting:
+                try:
+                    self._on_reconnecting(
+                        self._reconnect_attempts, self._max_reconnect_attempts
+                    )
+                except Exception as e:
+                    logger.error(f"调用重连回调失败: {e}", exc_info=True)
 
-        # 指数退避等待，最大30秒
-        await asyncio.sleep(min(self._reconnect_attempts * 2, 30))
+            delay = self._reconnect_delay(self._reconnect_attempts)
+            logger.info(
+                f"尝试自动重连 ({self._reconnect_attempts}/"
+                f"{self._max_reconnect_attempts})，等待 {delay:.2f}s"
+            )
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self._is_closing:
+                return
+            # 退避期间应用已按需 connect() 恢复连接：不再重复建连
+            if self.connected and self._is_connected():
+                self._reconnect_attempts = 0
+                return
 
-        try:
-            success = await self.connect()
-            if success:
-                logger.info("自动重连成功")
-                if self._on_connection_state_changed:
-                    self._on_connection_state_changed(True, "重连成功")
-            else:
+            try:
+                if await self.connect():
+                    logger.info("自动重连成功")
+                    if self._on_connection_state_changed:
+                        self._on_connection_state_changed(True, "重连成功")
+                    return
                 logger.warning(
                     f"自动重连失败 ({self._reconnect_attempts}/{self._max_reconnect_attempts})"
                 )
-                if self._reconnect_attempts >= self._max_reconnect_attempts:
-                    if self._on_network_error:
-                        await self._on_network_error(
-                            f"重连失败，已达到最大重连次数: {original_reason}"
-                        )
-        except Exception as e:
-            logger.error(f"重连过程中出错: {e}", exc_info=True)
-            if self._reconnect_attempts >= self._max_reconnect_attempts:
-                if self._on_network_error:
-                    await self._on_network_error(f"重连异常: {str(e)}")
+                error_message = f"重连失败，已达到最大重连次数: {original_reason}"
+            except Exception as e:
+                logger.error(f"重连过程中出错: {e}", exc_info=True)
+                error_message = f"重连异常: {str(e)}"
+
+        if (
+            not self._is_closing
+            and self._reconnect_attempts >= self._max_reconnect_attempts
+            and self._on_network_error
+        ):
+            await self._on_network_error(error_message)
 
     async def _cancel_monitor_task(self):
-        """取消并等待连接监控任务完成."""
-        if self._connection_monitor_task and not self._connection_monitor_task.done():
-            self._connection_monitor_task.cancel()
+        """取消并等待连接监控任务完成.
+
+        监控任务自身检测到断线时也会走到这里，此时不能取消/等待自己.
+        """
+        task = self._connection_monitor_task
+        if task is asyncio.current_task():
+            self._connection_monitor_task = None
+            return
+        if task and not task.done():
+            task.cancel()
             try:
-                await self._connection_monitor_task
+                await task
             except asyncio.CancelledError:
                 pass
 
@@ -0,0 +1,112 @@
+"""TLS 会话恢复.
+
+重连时完整 TLS 握手要多一个往返并重做证书链校验/密钥交换。同一 SSLContext
+上记住最近一次握手得到的会话（TLS 1.2 session id / TLS 1.3 session ticket），
+新连接握手时自动携带，服务端接受即走简化握手；服务端拒绝则照常完整握手，
+不影响连接本身。
+
+asyncio（websockets）经 wrap_bio、paho-mqtt 经 wrap_socket 创建 TLS 连接，
+两处都在未显式传入 session 时注入已保存的会话。会话只能用于创建它的
+SSLContext，因此每个协议实例持有自己的上下文并跨重连复用。
+"""
+
+import ssl
+
+from src.logging import get_logger
+
+logger = get_logger()
+
+
+class ResumableSSLContext(ssl.SSLContext):
+    """记住最近一次 TLS 会话、新握手自动复用的客户端 SSLContext."""
+
+    def __new__(cls, protocol=ssl.PROTOCOL_TLS_CLIENT, *args, **kwargs):
+        return super().__new__(cls, protocol, *args, **kwargs)
+
+    def __init__(self, protocol=ssl.PROTOCOL_TLS_CLIENT):
+        self._session = None
+        self.handshakes = 0
+        self.resumed = 0
+
+    @classmethod
+    def unverified(cls) -> "ResumableSSLContext":
+        """不校验证书与主机名（兼容服务端自签名证书）."""
+        context = cls()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+
+    @classmethod
+    def default(cls) -> "ResumableSSLContext":
+        """系统 CA 校验证书与主机名."""
+        context = cls()
+        context.load_default_certs()
+        return context
+
+    def wrap_bio(
+        self,
+        incoming,
+        outgoing,
+        server_side=False,
+        server_hostname=None,
+        session=None,
+    ):
+        if session is None and not server_side:
+            session = self._session
+        return super().wrap_bio(
+            incoming,
+            outgoing,
+            server_side=server_side,
+            server_hostname=server_hostname,
+            session=session,
+        )
+
+    def wrap_socket(
+        self,
+        sock,
+        server_side=False,
+        do_handshake_on_connect=True,
+        suppress_ragged_eofs=True,
+        server_hostname=None,
+        session=None,
+    ):
+        if session is None and not server_side:
+            session = self._session
+        return super().wrap_socket(
+            sock,
+            server_side=server_side,
+            do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs,
+            server_hostname=server_hostname,
+            session=session,
+        )
+
+    def remember(self, ssl_object) -> None:
+        """记录已完成握手的连接：统计是否复用，并保存其会话供下次握手使用.
+
+        TLS 1.3 的 ticket 在握手后才下发，应在收到首条应用数据后调用。
+        """
+        if ssl_object is None:
+            return
+        try:
+            reused = ssl_object.session_reused
+            session = ssl_object.session
+        except (AttributeError, ValueError) as e:
+            logger.debug(f"读取 TLS 会话失败: {e}")
+            return
+        self.handshakes += 1
+        if reused:
+            self.resumed += 1
+        if session is not None:
+            self._session = session
+        logger.debug(f"TLS 握手完成: 会话复用={reused}")
+
+    def forget(self) -> None:
+        self._session = None
+
+    def stats(self) -> dict:
+        return {
+            "handshakes": self.handshakes,
+            "resumed": self.resumed,
+            "has_session": self._session is not None,
+        }
@@ -0,0 +1,115 @@
+"""UDP 入站音频序列号校验（防重放滑动窗口）.
+
+序列号取自包 nonce 末 4 字节（32 位，回绕按序号算术处理）。以已收最大序号
+为窗口右沿、位图记录窗口内已收序号：
+- 新的最大序号：接受；跳过的序号计为丢失（之后补到则改记乱序）
+- 窗口内未收过的旧序号：接受（乱序，由下游抖动缓冲按序号排回）
+- 重复序号 / 落在窗口之外的过旧序号：丢弃，不解密、不解码
+
+本过滤器只做接收判定与统计，不缓存包：按播放时钟重排与缺包补偿
+（FEC/PLC）由 AudioCodec 的 JitterBuffer 负责，避免两级缓冲叠加延迟。
+"""
+
+from __future__ import annotations
+
+_SEQ_MOD = 1 << 32
+_SEQ_HALF = 1 << 31
+
+# 默认窗口（包数）：20ms 帧约 1.3s
+DEFAULT_WINDOW = 64
+# 前跳超过该值视为序号重置（服务端重启计数等），不计入丢失
+_RESYNC_GAP = 3000
+# 连续这么多过旧包说明对端序号已重置，以新序号重新同步
+_STALE_RESYNC = 50
+
+
+class InboundSequenceFilter:
+    """入站序列号过滤与丢包/乱序/重复统计（单线程使用）."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        if not 1 <= window <= 1024:
+            raise ValueError("window 须在 1~1024 之间")
+        self._window = window
+        self._mask = (1 << window) - 1
+        self.reset()
+
+    def reset(self) -> None:
+        self.highest: int | None = None
+        self._bitmap = 0
+        self._stale_run = 0
+
+        self.accepted = 0
+        self.lost = 0
+        self.reordered = 0
+        self.duplicate = 0
+        self.stale = 0
+        self.resyncs = 0
+
+    def _resync(self, sequence: int) -> None:
+        self.highest = sequence
+        self._bitmap = 1
+        self._stale_run = 0
+        self.resyncs += 1
+
+    def accept(self, sequence: int) -> bool:
+        """判定是否接受该序号（同时更新窗口与统计）."""
+        sequence &= _SEQ_MOD - 1
+        if self.highest is None:
+            self.highest = sequence
+            self._bitmap = 1
+            self.accepted += 1
+            return True
+
+        diff = (sequence - self.highest) % _SEQ_MOD
+        if diff >= _SEQ_HALF:
+            diff -= _SEQ_MOD
+
+        if diff > 0:
+            if diff > _RESYNC_GAP:
+                self._resync(sequence)
+            else:
+                self.lost += diff - 1
+                self._bitmap = (
+                    ((self._bitmap << diff) | 1) & self._mask
+                    if diff < self._window
+                    else 1
+                )
+                self.highest = sequence
+            self._stale_run = 0
+            self.accepted += 1
+            return True
+
+        offset = -diff
+        if offset == 0 or (offset < self._window and self._bitmap >> offset & 1):
+            self.duplicate += 1
+            return False
+
+        if offset >= self._window:
+            self.stale += 1
+            self._stale_run += 1
+            if self._stale_run >= _STALE_RESYNC:
+                self._resync(sequence)
+                self.accepted += 1
+                return True
+            return False
+
+        # 窗口内迟到：此前按丢失计入，补到后改记乱序
+        self._bitmap |= 1 << offset
+        self.lost -= 1
+        self.reordered += 1
+        self._stale_run = 0
+        self.accepted += 1
+        return True
+
+    def stats(self) -> dict:
+        expected = self.accepted + self.lost
+        return {
+            "highest_sequence": self.highest,
+            "accepted": self.accepted,
+            "lost": self.lost,
+            "reordered": self.reordered,
+            "duplicate": self.duplicate,
+            "stale": self.stale,
+            "resyncs": self.resyncs,
+            "loss_rate": round(self.lost / expected, 4) if expected else 0.0,
+        }
@@ -1,21 +1,23 @@
 import asyncio
 import json
 import logging
-import ssl
 
 import websockets
 
 from src.constants.constants import AudioConfig
 from src.logging import get_logger
 from src.protocols.protocol import Protocol
+from src.protocols.tls_session import ResumableSSLContext
+from src.protocols.ws_send_scheduler import WsSendScheduler
 from src.utils.config_manager import get_config
 
-# 服务器可能使用自签名证书，暂时跳过客户端证书验证
-# 以避免生产环境中非正规SSL证书导致连接失败
-ssl_context = ssl._create_unverified_context()
-
 logger = get_logger()
 
+# 链路劣化：keepalive 测得时延（秒）达到该值，或 ping 超过该时间未回
+_DEGRADED_LATENCY_S = 1.0
+# 备用连接未被接管时的最长保留时间（秒）
+_STANDBY_TTL_S = 20.0
+
 
 class WebsocketProtocol(Protocol):
     def __init__(self):
@@ -27,6 +29,15 @@ class WebsocketProtocol(Protocol):
         self.hello_received = None  # 初始化时先设为 None
         # 消息处理任务引用，便于在关闭时取消
         self._message_task = None
+        # 上行发送调度（单写协程 + 水位丢帧），每次连接新建
+        self._sender: WsSendScheduler | None = None
+        # 链路劣化时预热的备用连接（已完成 TCP/TLS/升级，未发 hello）
+        self._standby = None
+        self._standby_task: asyncio.Task | None = None
+        # 写出失败触发的断线处理（独立任务，不在调度器写协程内拆除调度器）
+        self._loss_task: asyncio.Task | None = None
+        self.standby_prewarmed = 0
+        self.standby_used = 0
 
         self.WEBSOCKET_URL = self.config.get_config(
             "SYSTEM_OPTIONS.NETWORK.WEBSOCKET_URL"
@@ -44,6 +55,15 @@ class WebsocketProtocol(Protocol):
             "Client-Id": client_id,
         }
 
+        # 服务器可能使用自签名证书，暂时跳过客户端证书验证
+        # 以避免生产环境中非正规SSL证书导致连接失败；
+        # 上下文跨重连复用以携带上次的 TLS 会话（会话恢复）
+        self._tls_context = (
+            ResumableSSLContext.unverified()
+            if self.WEBSOCKET_URL.startswith("wss://")
+            else None
+        )
+
     async def connect(self) -> bool:
         """
         连接到WebSocket服务器.
@@ -56,39 +76,15 @@ class WebsocketProtocol(Protocol):
             # 在连接时创建 Event，确保在正确的事件循环中
             self.hello_received = asyncio.Event()
 
-            # 判断是否应该使用 SSL
-            current_ssl_context = None
-            if self.WEBSOCKET_URL.startswith("wss://"):
-                current_ssl_context = ssl_context
+            # 优先接管预热好的备用连接，省去 TCP/TLS/升级握手
+            self.websocket = await self._take_standby() or await self._open_websocket()
 
-            # 建立WebSocket连接 (兼容不同Python版本的写法)
-            try:
-                # 新的写法 (在Python 3.11+版本中)
-                self.websocket = await websockets.connect(
-                    uri=self.WEBSOCKET_URL,
-                    ssl=current_ssl_context,
-                    additional_headers=self.HEADERS,
-                    ping_interval=20,
-                    ping_timeout=20,
-                    close_timeout=10,
-                    open_timeout=5,
-                    max_size=10 * 1024 * 1024,
-                    compression=None,
-                    proxy=None,
-                )
-            except TypeError:
-                # 旧的写法 (在较早的Python版本中)
-                self.websocket = await websockets.connect(
-                    self.WEBSOCKET_URL,
-                    ssl=current_ssl_context,
-                    extra_headers=self.HEADERS,
-                    ping_interval=20,
-                    ping_timeout=20,
-                    close_timeout=10,
-                    open_timeout=5,
-                    max_size=10 * 1024 * 1024,
-                    compression=None,
-                )
+            self._sender = WsSendScheduler(
+                self.websocket.send,
+                buffer_size=self._transport_buffer_size,
+                on_error=self._on_send_error,
+            )
+            self._sender.start()
 
             # 启动消息处理循环（保存任务引用，关闭时可取消）
             self._message_task = asyncio.create_task(self._message_handler())
@@ -111,13 +107,19 @@ class WebsocketProtocol(Protocol):
                     "frame_duration": AudioConfig.FRAME_DURATION,
                 },
             }
-            await self.send_text(json.dumps(hello_message))
+            if not await self.send_text(json.dumps(hello_message)):
+                raise ConnectionError("hello 消息未能发出")
 
             # 等待服务器hello响应
             try:
                 await asyncio.wait_for(self.hello_received.wait(), timeout=10.0)
                 self.connected = True
                 self._reconnect_attempts = 0  # 重置重连计数
+                if self._tls_context:
+                    # 首条应用数据已到，TLS 1.3 ticket 此时已下发
+                    self._tls_context.remember(
+                        self.websocket.transport.get_extra_info("ssl_object")
+                    )
                 logger.info("已连接到WebSocket服务器")
 
                 # 通知连接状态变化
@@ -139,6 +141,130 @@ class WebsocketProtocol(Protocol):
                 await self._on_network_error(f"无法连接服务: {str(e)}")
             return False
 
+    async def _open_websocket(self):
+        """建立一条 WebSocket 连接（TCP/TLS/HTTP 升级），不发送 hello."""
+        # 建立WebSocket连接 (兼容不同Python版本的写法)
+        try:
+            # 新的写法 (在Python 3.11+版本中)
+            return await websockets.connect(
+                uri=self.WEBSOCKET_URL,
+                ssl=self._tls_context,
+                additional_headers=self.HEADERS,
+                ping_interval=20,
+                ping_timeout=20,
+                close_timeout=10,
+                open_timeout=5,
+                max_size=10 * 1024 * 1024,
+                compression=None,
+                proxy=None,
+            )
+        except TypeError:
+            # 旧的写法 (在较早的Python版本中)
+            return await websockets.connect(
+                self.WEBSOCKET_URL,
+                ssl=self._tls_context,
+                extra_headers=self.HEADERS,
+                ping_interval=20,
+                ping_timeout=20,
+                close_timeout=10,
+                open_timeout=5,
+                max_size=10 * 1024 * 1024,
+                compression=None,
+            )
+
+    # ============ 备用连接预热 ============
+
+    async def _probe_latency(self, websocket) -> bool:
+        """ping 在 _DEGRADED_LATENCY_S 内得到回应返回 True."""
+        try:
+            pong = await websocket.ping()
+        except Exception:
+            return False
+        done, _ = await asyncio.wait({pong}, timeout=_DEGRADED_LATENCY_S)
+        return bool(done) and not pong.cancelled() and pong.exception() is None
+
+    async def _on_monitor_tick(self):
+        """链路劣化（上行拥塞或 keepalive 时延过高）时后台预热备用连接.
+
+        不额外发 ping：时延取 websockets 自身 keepalive（ping_interval）的测量值.
+        当前连接随后断开时，connect() 直接接管备用连接，只剩 hello 往返.
+        """
+        if self._standby is not None or (
+            self._standby_task and not self._standby_task.done()
+        ):
+            return
+        websocket = self.websocket
+        if websocket is None:
+            return
+        congested = self._sender is not None and self._sender.congested
+        latency = getattr(websocket, "latency", 0.0)
+        if not congested and latency < _DEGRADED_LATENCY_S:
+            return
+        if self._is_closing:
+            return
+        reason = "上行拥塞" if congested else f"时延 {latency * 1000:.0f}ms"
+        logger.info(f"链路劣化（{reason}），预热备用连接")
+        self._standby_task = asyncio.create_task(
+            self._prewarm_standby(), name="ws_standby_prewarm"
+        )
+
+    async def _prewarm_standby(self):
+        try:
+            websocket = await self._open_websocket()
+        except Exception as e:
+            logger.info(f"预热备用连接失败: {e}")
+            return
+        if self._is_closing or self._standby is not None:
+            await self._close_quietly(websocket)
+            return
+        self._standby = websocket
+        self.standby_prewarmed += 1
+        asyncio.get_running_loop().call_later(
+            _STANDBY_TTL_S, self._expire_standby, websocket
+        )
+        logger.info("备用连接已就绪")
+
+    def _expire_standby(self, websocket) -> None:
+        if self._standby is websocket:
+            self._standby = None
+            logger.debug("备用连接超时未使用，关闭")
+            asyncio.create_task(self._close_quietly(websocket))
+
+    async def _take_standby(self):
+        """取出可用的备用连接；预热进行中则等待其完成，失效的关闭并丢弃."""
+        task = self._standby_task
+        if task and not task.done() and task is not asyncio.current_task():
+            await asyncio.wait({task})
+        websocket, self._standby = self._standby, None
+        if websocket is None:
+            return None
+        # 与主连接一起断掉的备用连接往往看起来仍然打开，先确认链路可用
+        if websocket.close_code is None and await self._probe_latency(websocket):
+            self.standby_used += 1
+            logger.info("接管预热的备用连接")
+            return websocket
+        await self._close_quietly(websocket)
+        return None
+
+    async def _discard_standby(self):
+        task, self._standby_task = self._standby_task, None
+        if task and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        websocket, self._standby = self._standby, None
+        if websocket is not None:
+            await self._close_quietly(websocket)
+
+    @staticmethod
+    async def _close_quietly(websocket) -> None:
+        try:
+            await websocket.close()
+        except Exception as e:
+            logger.debug(f"关闭备用连接时出错: {e}")
+
     # ============ 模板方法实现 ============
 
     @property
@@ -158,16 +284,26 @@ class WebsocketProtocol(Protocol):
         清理消息处理任务、心跳任务、WebSocket 连接和心跳时间戳.
         不负责取消连接监控任务（基类 _handle_connection_loss 负责）.
         """
-        # 取消消息处理任务
-        if self._message_task and not self._message_task.done():
-            self._message_task.cancel()
+        # 取消消息处理任务（断线由消息任务自身处理时不能取消/等待自己）
+        task, self._message_task = self._message_task, None
+        if task and task is not asyncio.current_task() and not task.done():
+            task.cancel()
             try:
-                await self._message_task
+                await task
             except asyncio.CancelledError:
                 pass
             except Exception as e:
                 logger.debug(f"等待消息任务取消时异常: {e}")
-        self._message_task = None
+
+        # 停止上行调度（未写出的控制消息以失败返回）
+        if self._sender:
+            sender, self._sender = self._sender, None
+            stats = sender.stats()
+            if stats["dropped_audio"] or stats["congestion_events"]:
+                logger.info(f"WebSocket 上行统计: {stats}")
+            else:
+                logger.debug(f"WebSocket 上行统计: {stats}")
+            await sender.stop()
 
         # 关闭WebSocket连接
         if self.websocket and self.websocket.close_code is None:
@@ -192,10 +328,24 @@ class WebsocketProtocol(Protocol):
                     self.websocket.close_code is not None if self.websocket else True
                 ),
                 "websocket_url": self.WEBSOCKET_URL,
+                "send": self._sender.stats() if self._sender else None,
+                "tls": self._tls_context.stats() if self._tls_context else None,
+                "standby": {
+                    "ready": self._standby is not None,
+                    "prewarmed": self.standby_prewarmed,
+                    "used": self.standby_used,
+                },
             }
         )
         return info
 
+    def _transport_buffer_size(self) -> int:
+        """传输层（含 TLS）写缓冲中尚未交给内核的字节数."""
+        transport = getattr(self.websocket, "transport", None)
+        if transport is None:
+            return 0
+        return transport.get_write_buffer_size()
+
     async def _message_handler(self):
         """
         处理接收到的WebSocket消息.
@@ -254,35 +404,55 @@ class WebsocketProtocol(Protocol):
             await self._handle_connection_loss(f"消息处理异常: {str(e)}")
 
     async def send_audio(self, data: bytes):
+        """发送音频数据.
+
+        仅入队，由发送调度器写出；上行拥塞时丢弃最旧音频帧，不阻塞调用方。
         """
-        发送音频数据.
-        """
-        if not self.is_audio_channel_opened():
+        if not self.is_audio_channel_opened() or not self._sender:
             return
+        self._sender.enqueue_audio(data)
 
-        try:
-            await self.websocket.send(data)
-        except websockets.ConnectionClosedOK as e:
+    async def _on_send_error(self, e: Exception, is_text: bool) -> None:
+        """发送调度器写出失败（写协程随后退出）.
+
+        在调度器写协程内被调用：断线处理会停止该调度器并可能重连，
+        因此另起任务执行，本回调立即返回让写协程退出。
+        """
+        kind = "文本" if is_text else "音频"
+        if self._is_closing:
+            return
+        if isinstance(e, websockets.ConnectionClosedOK):
             # 服务端正常收回会话（如 TTS 结束后关闭），不算网络错误
-            logger.info(f"发送音频时连接已由服务端正常关闭: {e}")
-            await self._handle_connection_loss(
-                f"发送音频时服务端关闭: {e.code}", clean=True
-            )
-        except websockets.ConnectionClosedError as e:
-            logger.warning(f"发送音频时连接异常关闭: {e}")
-            await self._handle_connection_loss(f"发送音频失败: {e.code} {e.reason}")
-        except Exception as e:
-            logger.error(f"发送音频数据失败: {e}", exc_info=True)
+            logger.info(f"发送{kind}时连接已由服务端正常关闭: {e}")
+            reason, clean = f"发送{kind}时服务端关闭: {e.code}", True
+        elif isinstance(e, websockets.ConnectionClosedError):
+            logger.warning(f"发送{kind}时连接异常关闭: {e}")
+            reason, clean = f"发送{kind}失败: {e.code} {e.reason}", False
+        else:
+            logger.error(f"发送{kind}数据失败: {e}", exc_info=True)
             # 不要在这里调用网络错误回调，让连接处理器处理
-            await self._handle_connection_loss(f"发送音频异常: {str(e)}")
+            reason, clean = f"发送{kind}异常: {str(e)}", False
+        if self.connected or not is_text:
+            self._schedule_connection_loss(reason, clean=clean)
+
+    def _schedule_connection_loss(self, reason: str, *, clean: bool = False) -> None:
+        if self._loss_task is not None and not self._loss_task.done():
+            return
+        self._loss_task = asyncio.create_task(
+            self._handle_connection_loss(reason, clean=clean),
+            name="ws_connection_loss",
+        )
 
-    async def send_text(self, message: str):
+    async def send_text(self, message: str) -> bool:
         """
         发送文本消息.
+
+        Returns:
+            是否已写出；未写出时已记录警告
         """
         if not self.websocket or self._is_closing:
             logger.warning("WebSocket未连接或正在关闭，无法发送消息")
-            return
+            return False
 
         try:
             close_code = self.websocket.close_code
@@ -299,27 +469,13 @@ class WebsocketProtocol(Protocol):
                 await self._handle_connection_loss(
                     f"发送文本失败: 连接已关闭 {close_code}", clean=clean
                 )
-            return
+            return False
 
-        try:
-            await self.websocket.send(message)
-        except websockets.ConnectionClosedOK as e:
-            # 服务端正常收回会话，不算网络错误
-            logger.info(f"发送文本时连接已由服务端正常关闭: {e}")
-            if self.connected and not self._is_closing:
-                await self._handle_connection_loss(
-                    f"发送文本时服务端关闭: {e.code}", clean=True
-                )
-        except websockets.ConnectionClosedError as e:
-            logger.warning(f"发送文本时连接异常关闭: {e}")
-            if self.connected and not self._is_closing:
-                await self._handle_connection_loss(
-                    f"发送文本错误: {e.code} {e.reason}"
-                )
-        except Exception as e:
-            logger.error(f"发送文本消息失败: {e}", exc_info=True)
-            if self.connected and not self._is_closing:
-                await self._handle_connection_loss(f"发送文本异常: {str(e)}")
+        # 与音频同一 FIFO 顺序写出，控制消息从不丢弃；写出失败由 _on_send_error 处理
+        if not self._sender or not await self._sender.send_control(message):
+            logger.warning(f"WebSocket 上行通道已关闭，文本消息未发送: {message[:100]}")
+            return False
+        return True
 
     def is_audio_channel_opened(self) -> bool:
         """检查音频通道是否打开.
@@ -385,6 +541,7 @@ class WebsocketProtocol(Protocol):
 
             # 协议特定清理
             await self._do_cleanup()
+            await self._discard_standby()
 
             if self._on_audio_channel_closed:
                 await self._on_audio_channel_closed()
@@ -0,0 +1,242 @@
+"""WebSocket 上行发送调度.
+
+所有上行消息（音频帧与 JSON 控制消息）进入同一个 FIFO，由单个写协程顺序
+调用 websocket.send，保证控制消息与音频的相对顺序不变。
+
+拥塞判定基于「调度队列字节数 + 传输层写缓冲字节数」：
+- 超过高水位进入拥塞状态，丢弃队列中最旧的音频帧，直到回落到低水位以下
+- JSON 控制消息永不丢弃
+- 慢上行时延迟有界（旧音频丢弃，最新语音优先），发送方永不阻塞
+
+统计：排队字节/条数、传输层缓冲、丢帧数、拥塞次数、入队到写出的发送延迟。
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+from src.logging import get_logger
+
+logger = get_logger()
+
+# 默认水位（字节）：16kHz Opus 约 3~5KB/s，高水位约 3s 音频
+DEFAULT_HIGH_WATER = 16 * 1024
+DEFAULT_LOW_WATER = 8 * 1024
+# 发送延迟统计窗口（条）
+_LATENCY_WINDOW = 500
+
+_AUDIO = 0
+_CONTROL = 1
+
+
+def _percentile_ms(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return round(sorted_values[idx] * 1000, 2)
+
+
+class WsSendScheduler:
+    """单写协程 + 水位丢帧的上行调度器.
+
+    Args:
+        send: 实际发送函数（websocket.send）
+        buffer_size: 返回传输层写缓冲字节数的函数
+        on_error: 发送失败回调（写协程随后退出）
+        high_water / low_water: 拥塞进入/退出水位（字节）
+    """
+
+    def __init__(
+        self,
+        send: Callable[[object], Awaitable[None]],
+        buffer_size: Callable[[], int] = lambda: 0,
+        on_error: Callable[[Exception, bool], Awaitable[None]] | None = None,
+        high_water: int = DEFAULT_HIGH_WATER,
+        low_water: int = DEFAULT_LOW_WATER,
+    ):
+        if low_water > high_water:
+            raise ValueError("low_water 不能大于 high_water")
+        self._send = send
+        self._buffer_size = buffer_size
+        self._on_error = on_error
+        self._high = high_water
+        self._low = low_water
+
+        # (类型, 数据, 入队时刻, 完成 future)
+        self._queue: deque = deque()
+        self._queued_bytes = 0
+        self._queued_audio = 0
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._closed = False
+        self._congested = False
+
+        self._latencies: deque = deque(maxlen=_LATENCY_WINDOW)
+        self.max_latency = 0.0
+        self.sent_audio = 0
+        self.sent_control = 0
+        self.dropped_audio = 0
+        self.dropped_audio_bytes = 0
+        self.congestion_events = 0
+        self.max_queued_bytes = 0
+
+    def start(self) -> None:
+        self._closed = False
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._writer(), name="ws_send_scheduler")
+
+    async def stop(self) -> None:
+        """停止写协程；未发送的控制消息以 False 完成，不让调用方挂起."""
+        self._closed = True
+        task = self._task
+        self._task = None
+        if task and task is not asyncio.current_task() and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._fail_pending()
+
+    @property
+    def queued_bytes(self) -> int:
+        return self._queued_bytes
+
+    @property
+    def congested(self) -> bool:
+        return self._congested
+
+    def _transport_bytes(self) -> int:
+        try:
+            return int(self._buffer_size() or 0)
+        except Exception:
+            return 0
+
+    def enqueue_audio(self, data: bytes) -> bool:
+        """音频帧入队（不阻塞）；拥塞时先丢最旧音频帧.
+
+        Returns:
+            False 表示调度器已关闭
+        """
+        if self._closed:
+            return False
+        size = len(data)
+        backlog = self._queued_bytes + self._transport_bytes()
+        if not self._congested and backlog + size > self._high:
+            self._congested = True
+            self.congestion_events += 1
+            logger.warning(
+                f"WebSocket 上行拥塞：积压 {backlog}B（队列 {self._queued_bytes}B），"
+                "开始丢弃最旧音频帧"
+            )
+        if self._congested:
+            while backlog + size > self._low and self._drop_oldest_audio():
+                backlog = self._queued_bytes + self._transport_bytes()
+            if backlog + size <= self._low:
+                self._congested = False
+                logger.info(
+                    f"WebSocket 上行拥塞解除，累计丢弃音频 {self.dropped_audio} 帧"
+                )
+        self._push(_AUDIO, data, None)
+        return True
+
+    async def send_control(self, message: str) -> bool:
+        """JSON 控制消息入队并等待写出；从不丢弃.
+
+        Returns:
+            是否已交给 websocket 写出
+        """
+        if self._closed:
+            return False
+        future = asyncio.get_running_loop().create_future()
+        self._push(_CONTROL, message, future)
+        return await future
+
+    def _push(self, kind: int, payload, future) -> None:
+        self._queue.append((kind, payload, time.monotonic(), future))
+        self._queued_bytes += len(payload)
+        if kind == _AUDIO:
+            self._queued_audio += 1
+        if self._queued_bytes > self.max_queued_bytes:
+            self.max_queued_bytes = self._queued_bytes
+        self._wakeup.set()
+
+    def _drop_oldest_audio(self) -> bool:
+        if not self._queued_audio:
+            return False
+        for i, item in enumerate(self._queue):
+            if item[0] == _AUDIO:
+                del self._queue[i]
+                size = len(item[1])
+                self._queued_bytes -= size
+                self._queued_audio -= 1
+                self.dropped_audio += 1
+                self.dropped_audio_bytes += size
+                return True
+        return False
+
+    def _fail_pending(self) -> None:
+        while self._queue:
+            _, _, _, future = self._queue.popleft()
+            if future is not None and not future.done():
+                future.set_result(False)
+        self._queued_bytes = 0
+        self._queued_audio = 0
+
+    async def _writer(self) -> None:
+        queue = self._queue
+        while not self._closed:
+            if not queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            kind, payload, enqueued_at, future = queue.popleft()
+            self._queued_bytes -= len(payload)
+            if kind == _AUDIO:
+                self._queued_audio -= 1
+            try:
+                await self._send(payload)
+            except asyncio.CancelledError:
+                if future is not None and not future.done():
+                    future.set_result(False)
+                raise
+            except Exception as e:
+                if future is not None and not future.done():
+                    future.set_result(False)
+                self._closed = True
+                self._fail_pending()
+                if self._on_error:
+                    await self._on_error(e, kind == _CONTROL)
+                return
+
+            latency = time.monotonic() - enqueued_at
+            self._latencies.append(latency)
+            if latency > self.max_latency:
+                self.max_latency = latency
+            if kind == _AUDIO:
+                self.sent_audio += 1
+            else:
+                self.sent_control += 1
+                if not future.done():
+                    future.set_result(True)
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+        return {
+            "queued_bytes": self._queued_bytes,
+            "queued_messages": len(self._queue),
+            "transport_buffer_bytes": self._transport_bytes(),
+            "max_queued_bytes": self.max_queued_bytes,
+            "high_water": self._high,
+            "low_water": self._low,
+            "congested": self._congested,
+            "congestion_events": self.congestion_events,
+            "sent_audio": self.sent_audio,
+            "sent_control": self.sent_control,
+            "dropped_audio": self.dropped_audio,
+            "dropped_audio_bytes": self.dropped_audio_bytes,
+            "latency_p50_ms": _percentile_ms(latencies, 0.50),
+            "latency_p99_ms": _percentile_ms(latencies, 0.99),
+            "latency_max_ms": round(self.max_latency * 1000, 2),
+        }
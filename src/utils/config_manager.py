@@ -67,11 +67,19 @@ class ConfigManager:
             "CLIENT_ID": None,
             "DEVICE_ID": None,
             "WINDOW_SIZE_MODE": "default",
+            # 事件循环后端：asyncio | uvloop（仅 CLI/TUI/GPIO，GUI 固定 qasync；--loop 覆盖）
+            "EVENT_LOOP": "asyncio",
+            # 事件循环调度延迟监控（定期日志输出 p50/p99/max）
+            "LOOP_MONITOR": True,
             "NETWORK": {
                 "OTA_VERSION_URL": "https://api.tenclass.net/xiaozhi/ota/",
                 "WEBSOCKET_URL": None,
                 "WEBSOCKET_ACCESS_TOKEN": None,
                 "MQTT_INFO": None,
+                # MQTT 音频 UDP 通道：asyncio（数据报端点，无收包线程）| thread（收包线程）
+                "UDP_TRANSPORT": "asyncio",
+                # 非正常断线后的自动重连次数（首次立即、之后指数退避），0 关闭
+                "AUTO_RECONNECT_ATTEMPTS": 0,
                 "ACTIVATION_VERSION": "v2",  # 可选值: v1, v2
                 "AUTHORIZATION_URL": "https://xiaozhi.me/",
             },
@@ -79,6 +87,8 @@ class ConfigManager:
         "WAKE_WORD_OPTIONS": {
             "USE_WAKE_WORD": True,
             "MODEL_PATH": "models/zh",
+            # 模型档位：fp32 用 encoder.onnx 等；int8 等用 encoder.int8.onnx（缺失回退 fp32）
+            "MODEL_PROFILE": "fp32",
             "NUM_THREADS": 5,
             "PROVIDER": "cpu",
             "MAX_ACTIVE_PATHS": 2,
@@ -87,6 +97,12 @@ class ConfigManager:
             "NUM_TRAILING_BLANKS": 1,
             "WAKE_WORD": "你好小智",
             "WAKE_WORD_LANG": "zh",
+            # 前置能量门：安静时跳过推理降低常驻 CPU（带预录，唤醒词开头不丢）
+            "ENERGY_GATE": False,
+            "GATE_OPEN_DB": -45,
+            "GATE_CLOSE_DB": -52,
+            "GATE_HANGOVER_MS": 600,
+            "GATE_PREROLL_MS": 400,
         },
         "CAMERA": {
             "camera_index": 0,
@@ -121,9 +137,22 @@ class ConfigManager:
             "MUSIC_PARALLEL": True,
             # 延迟补偿（协议帧数），实际 delay_ms = 40 + N * 帧长
             "FRAME_DELAY": 3,
+            # 在线估计播放→采集延迟（互相关），FRAME_DELAY 作为初始值
+            "AUTO_DELAY": True,
             # 噪声抑制/高通预处理
             "ENABLE_PREPROCESS": True,
         },
+        # 上行 Opus 编码器参数（null=libopus 默认）；低功耗设备可调低 COMPLEXITY
+        "OPUS_OPTIONS": {
+            "COMPLEXITY": None,  # 0-10
+            "BITRATE": None,  # bps，如 24000
+            "VBR": True,
+            # 静音帧不发送（DTX 帧在编码回调前丢弃）
+            "DTX": False,
+            # 带内 FEC 及预期丢包率（%），FEC 仅在丢包率 > 0 时生效
+            "INBAND_FEC": False,
+            "PACKET_LOSS_PERC": 0,
+        },
         # 可写目录覆盖（config 仍固定在用户数据/config；null=默认）
         # 环境变量优先：XIAOZHI_CACHE_DIR / XIAOZHI_LOG_DIR /
         # XIAOZHI_MUSIC_CACHE_DIR / XIAOZHI_KEYWORDS_DIR / XIAOZHI_DATA_DIR
@@ -161,6 +190,9 @@ class ConfigManager:
             "output_channels": None,
             "opus_output_sample_rate": 24000,  # Opus 解码采样率：24000(官方) 或 16000(第三方)
             "frame_duration": 20,  # 音频帧长度(ms)：20(低延迟) / 40(平衡) / 60(低CPU)
+            # 播放 FIFO 实现：locked(加锁) / spsc(无锁单生产单消费，回调不等锁)
+            "tts_fifo": "locked",
+            "music_fifo": "locked",
         },
         "LOGGING": {
             "LEVEL": "INFO",  # DEBUG, INFO, WARNING, ERROR, CRITICAL
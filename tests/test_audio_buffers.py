@@ -0,0 +1,264 @@
+"""PcmRingBuffer / SpscPcmFifo / PcmFramePool 回归测试.
+
+覆盖：按帧读写、跨环尾读取、多声道、超容量丢最旧；
+SPSC FIFO 与 PcmFifo 语义一致，以及双线程压测下的顺序与 pull 延迟；
+共享只读采集帧的引用计数与回池复用。
+背景：AudioConverter 曾用 deque 逐样本 extend/popleft，回调线程 CPU 占用过高；
+PcmFifo 每次 push/pull 取锁，event loop 忙时输出回调可能等锁。
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.audio_codecs.audio_buffer import PcmFramePool, PcmRingBuffer, SpscPcmFifo
+
+
+class TestPcmRingBuffer:
+    def test_read_requires_full_frame(self):
+        rb = PcmRingBuffer(100)
+        rb.write(np.ones(30, dtype=np.float32))
+        assert rb.read(40) is None
+        assert rb.size == 30
+        out = rb.read(30)
+        assert out.shape == (30, 1)
+        assert np.all(out == 1)
+        assert rb.size == 0
+
+    def test_contiguous_read_is_view(self):
+        rb = PcmRingBuffer(100)
+        rb.write(np.arange(50, dtype=np.float32))
+        out = rb.read(20)
+        assert np.shares_memory(out, rb._buf)
+
+    def test_wraparound_preserves_order(self):
+        rb = PcmRingBuffer(10)
+        rb.write(np.arange(8, dtype=np.float32))
+        rb.read(6)
+        rb.write(np.arange(8, 14, dtype=np.float32))
+        out = rb.read(8)
+        assert np.array_equal(out.ravel(), np.arange(6, 14, dtype=np.float32))
+
+    def test_overflow_drops_oldest(self):
+        rb = PcmRingBuffer(10)
+        rb.write(np.arange(8, dtype=np.float32))
+        rb.write(np.arange(8, 12, dtype=np.float32))
+        assert rb.size == 10
+        assert rb.dropped == 2
+        assert np.array_equal(rb.read(10).ravel(), np.arange(2, 12))
+
+    def test_oversized_write_keeps_newest(self):
+        rb = PcmRingBuffer(10)
+        rb.write(np.arange(25, dtype=np.float32))
+        assert rb.dropped == 15
+        assert np.array_equal(rb.read(10).ravel(), np.arange(15, 25))
+
+    def test_multichannel_frames(self):
+        rb = PcmRingBuffer(16, channels=2)
+        stereo = np.stack([np.arange(12), -np.arange(12)], axis=1).astype(np.float32)
+        rb.write(stereo)
+        assert rb.size == 12
+        out = rb.read(12)
+        assert out.shape == (12, 2)
+        assert np.array_equal(out, stereo)
+
+    def test_read_available_and_clear(self):
+        rb = PcmRingBuffer(100)
+        rb.write(np.ones(30, dtype=np.float32))
+        out = rb.read_available(50)
+        assert out.shape == (30, 1)
+        assert rb.read_available(50) is None
+        rb.write(np.ones(10, dtype=np.float32))
+        assert rb.clear() == 10
+        assert rb.size == 0
+
+
+class TestSpscPcmFifo:
+    def test_pull_basic_and_pad(self):
+        f = SpscPcmFifo(1000)
+        f.push(np.ones(300, dtype=np.float32))
+        out = f.pull(200)
+        assert np.all(out == 1)
+        assert f.size == 100
+        out = f.pull(200)
+        assert np.all(out[:100] == 1)
+        assert np.all(out[100:] == 0)
+        assert f.pull(10) is None
+
+    def test_push_drops_oldest_over_capacity(self):
+        f = SpscPcmFifo(1000)
+        f.push(np.zeros(600, dtype=np.float32))
+        f.push(np.ones(600, dtype=np.float32))
+        assert f.size == 1000
+        assert f.dropped == 200
+        out = f.pull(1000)
+        assert np.all(out[:400] == 0)
+        assert np.all(out[400:] == 1)
+
+    def test_wraparound_and_out_buffer(self):
+        f = SpscPcmFifo(10)
+        f.push(np.arange(8, dtype=np.float32))
+        f.pull(6)
+        f.push(np.arange(8, 14, dtype=np.float32))
+        buf = np.empty(8, dtype=np.float32)
+        out = f.pull(8, out=buf)
+        assert np.shares_memory(out, buf)
+        assert np.array_equal(out, np.arange(6, 14, dtype=np.float32))
+
+    def test_clear(self):
+        f = SpscPcmFifo(1000)
+        f.push(np.ones((250, 2), dtype=np.float32))
+        assert f.clear() == 500
+        assert f.size == 0
+        assert f.pull(10) is None
+
+    def test_two_thread_stress_order_and_p99_latency(self):
+        """容量仅 4 块：读写位置反复回绕，生产者写满即退避重试；顺序不乱、不丢."""
+        total = 200_000
+        block = 480
+        capacity = 4 * block
+        f = SpscPcmFifo(capacity)
+        latencies: list[float] = []
+        received: list[np.ndarray] = []
+        stats = {"full": 0, "max_size": 0}
+        done = threading.Event()
+
+        def producer():
+            rng = np.random.default_rng(1)
+            pos = 0
+            while pos < total:
+                n = int(min(total - pos, rng.integers(100, 2 * block)))
+                # 空间不足时退避，不覆盖未读数据
+                while capacity - f.size < n:
+                    stats["full"] += 1
+                    time.sleep(0)
+                f.push(np.arange(pos, pos + n, dtype=np.float32))
+                stats["max_size"] = max(stats["max_size"], f.size)
+                pos += n
+            done.set()
+
+        def consumer():
+            got = 0
+            buf = np.empty(block, dtype=np.float32)
+            while got < total:
+                # 只有生产者写完后才允许读到不足一块（尾部补零）
+                if f.size < block and not done.is_set():
+                    time.sleep(0)
+                    continue
+                t0 = time.perf_counter()
+                out = f.pull(block, out=buf)
+                latencies.append(time.perf_counter() - t0)
+                if out is None:
+                    break
+                take = min(block, total - got)
+                received.append(out[:take].copy())
+                got += take
+
+        threads = [threading.Thread(target=producer), threading.Thread(target=consumer)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=60)
+
+        data = np.concatenate(received)
+        assert f.dropped == 0
+        assert np.array_equal(data, np.arange(total, dtype=np.float32))
+        # 数据量为容量的百倍以上：环必然多次回绕，且生产者确实遇到过写满
+        assert total // capacity > 100
+        assert stats["full"] > 0
+        assert stats["max_size"] <= capacity
+
+        # 宽松上限：仅防止退化为阻塞等待（无锁实现不应出现毫秒级 pull）
+        assert float(np.percentile(latencies, 99)) < 5e-3
+
+    def test_two_thread_overrun_keeps_newest(self):
+        """生产者不退避、持续套圈消费者：只丢最旧，读到的样本仍单调递增."""
+        total = 100_000
+        block = 480
+        capacity = 2 * block
+        f = SpscPcmFifo(capacity)
+        received: list[np.ndarray] = []
+        done = threading.Event()
+
+        def producer():
+            for pos in range(0, total, 320):
+                f.push(np.arange(pos, min(pos + 320, total), dtype=np.float32))
+            done.set()
+
+        def consumer():
+            buf = np.empty(block, dtype=np.float32)
+            while not done.is_set() or f.size:
+                out = f.pull(block, out=buf)
+                if out is None:
+                    time.sleep(0)
+                    continue
+                received.append(out[out > 0].copy())
+                time.sleep(0.0005)
+
+        threads = [threading.Thread(target=producer), threading.Thread(target=consumer)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=60)
+
+        assert f.dropped > 0
+        assert f.size == 0
+        data = np.concatenate(received)
+        assert data.max() == total - 1
+        # 覆盖区间被跳过而非重读；竞态下可能混入少量新样本，故只看整体有序
+        assert np.count_nonzero(np.diff(data) <= 0) <= len(received)
+
+
+class TestPcmFramePool:
+    def test_frame_is_read_only_and_copy_is_writable(self):
+        pool = PcmFramePool()
+        frame = pool.acquire(np.arange(4, dtype=np.float32))
+        assert not frame.data.flags.writeable
+        with pytest.raises(ValueError):
+            frame.data[0] = 1.0
+        own = frame.copy()
+        own[0] = 9.0
+        assert frame.data[0] == 0.0
+        assert np.array_equal(np.asarray(frame), np.arange(4, dtype=np.float32))
+        frame.release()
+
+    def test_returns_to_pool_after_last_release(self):
+        pool = PcmFramePool()
+        frame = pool.acquire(np.ones(8, dtype=np.float32))
+        frame.retain()  # 第二个消费者
+        frame.release()
+        assert pool.free_count == 0
+        frame.release()
+        assert pool.free_count == 1
+
+        again = pool.acquire(np.zeros(8, dtype=np.float32))
+        assert again is frame
+        assert pool.allocated == 1
+        assert np.all(again.data == 0)
+        again.release()
+
+    def test_held_frame_not_reused(self):
+        pool = PcmFramePool()
+        held = pool.acquire(np.full(8, 1.0, dtype=np.float32))
+        other = pool.acquire(np.full(8, 2.0, dtype=np.float32))
+        assert other is not held
+        assert np.all(held.data == 1.0)
+        other.release()
+        held.release()
+
+    def test_shorter_frame_reuses_larger_buffer(self):
+        pool = PcmFramePool()
+        pool.acquire(np.ones(16, dtype=np.float32)).release()
+        frame = pool.acquire(np.ones(8, dtype=np.float32))
+        assert len(frame) == 8
+        assert not frame.data.flags.writeable
+        frame.release()
+
+    def test_double_release_raises(self):
+        pool = PcmFramePool()
+        frame = pool.acquire(np.ones(4, dtype=np.float32))
+        frame.release()
+        with pytest.raises(RuntimeError):
+            frame.release()
@@ -1,9 +1,12 @@
 """TTS/音乐分队列混音回归测试.
 
-覆盖：PcmFifo 采样级语义、_pull_mixed 混音/闪避/削波。
+覆盖：PcmFifo 采样级语义、_pull_mixed 混音/闪避/削波、输出回调零分配、
+TTS 突发批量解码。
 背景：TTS 与音乐曾共用一条 FIFO，逐句 TTS 时帧交错导致"同时播放+断续"。
 """
 
+import tracemalloc
+
 import numpy as np
 import pytest
 
@@ -60,6 +63,15 @@ class TestPcmFifo:
         assert f.size == 0
         assert f.pull(10) is None
 
+    def test_pull_into_preallocated_out(self):
+        f = PcmFifo(1000)
+        f.push(np.ones(100, dtype=np.float32))
+        buf = np.full(200, 7.0, dtype=np.float32)
+        out = f.pull(200, out=buf)
+        assert np.shares_memory(out, buf)
+        assert np.all(out[:100] == 1)
+        assert np.all(out[100:] == 0)
+
     def test_multichannel_flattened(self):
         f = PcmFifo(1000)
         f.push(np.ones((100, 2), dtype=np.float32))
@@ -124,3 +136,111 @@ class TestMixing:
         codec._tts_fifo.clear()
         # TTS 清空不影响音乐
         assert codec._music_fifo.size == n
+
+    def test_mix_reuses_codec_scratch(self, codec):
+        n = codec._mix_chunk
+        codec._tts_fifo.push(np.full(n, 0.5, dtype=np.float32))
+        codec._music_fifo.push(np.full(n, 0.4, dtype=np.float32))
+        out = codec._pull_mixed(n)
+        assert np.shares_memory(out, codec._tts_scratch)
+
+
+class TestOutputCallback:
+    @pytest.fixture()
+    def codec(self):
+        return AudioCodec()
+
+    def test_broadcasts_into_outdata_and_pads(self, codec):
+        n = codec._mix_chunk
+        codec._tts_fifo.push(np.full(n // 2, 0.5, dtype=np.float32))
+        outdata = np.full((n, 2), 9.0, dtype=np.float32)
+        codec._output_callback(outdata, n, None, None)
+        assert np.allclose(outdata[: n // 2], 0.5)
+        assert np.all(outdata[n // 2 :] == 0)
+
+    def test_steady_state_allocates_no_pcm(self, codec):
+        n = codec._mix_chunk
+        outdata = np.zeros((n, 2), dtype=np.float32)
+        chunk = np.full(n, 0.3, dtype=np.float32)
+        # 预热：FIFO 内部 deque 节点等一次性分配
+        for _ in range(3):
+            codec._tts_fifo.push(chunk)
+            codec._output_callback(outdata, n, None, None)
+
+        # 回调期间的瞬时峰值不应达到一个 PCM 块（n*4 字节）
+        peak_extra = 0
+        tracemalloc.start()
+        try:
+            for _ in range(50):
+                codec._tts_fifo.push(chunk)
+                codec._music_fifo.push(chunk)
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                codec._output_callback(outdata, n, None, None)
+                peak_extra = max(peak_extra, tracemalloc.get_traced_memory()[1] - base)
+        finally:
+            tracemalloc.stop()
+
+        assert peak_extra < n * 4
+
+
+class TestWriteAudioBatch:
+    @pytest.fixture()
+    def codec(self):
+        c = AudioCodec()
+        c.opus_codec.initialize()
+        yield c
+        c.opus_codec.close()
+
+    @staticmethod
+    def _encode_tone(n_packets: int) -> list[bytes]:
+        import opuslib
+
+        rate = AudioCodec().opus_codec.output_sample_rate
+        frame = rate * 60 // 1000
+        enc = opuslib.Encoder(rate, 1, opuslib.APPLICATION_AUDIO)
+        t = np.arange(frame * n_packets) / rate
+        pcm = (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+        return [
+            enc.encode_float(pcm[i * frame : (i + 1) * frame].tobytes(), frame)
+            for i in range(n_packets)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_sequential_decode(self, codec):
+        packets = self._encode_tone(5)
+
+        await codec.write_audio_batch(packets)
+        batched = codec._tts_fifo.pull(codec._tts_fifo.size)
+
+        # 新解码器状态重跑逐包路径，结果应逐样本一致
+        codec.opus_codec.close()
+        codec.opus_codec._closed = False
+        codec.opus_codec.initialize()
+        for p in packets:
+            await codec.write_audio(p)
+        sequential = codec._tts_fifo.pull(codec._tts_fifo.size)
+
+        assert batched.shape == sequential.shape
+        assert np.array_equal(batched, sequential)
+
+    @pytest.mark.asyncio
+    async def test_batch_single_fifo_push_and_skips_bad_packet(self, codec):
+        packets = self._encode_tone(3)
+        pushes = []
+        orig_push = codec._tts_fifo.push
+        codec._tts_fifo.push = lambda pcm: (pushes.append(len(pcm)), orig_push(pcm))
+
+        # 空包被忽略；合法 TOC 的坏负载只跳过该包
+        await codec.write_audio_batch([packets[0], b"", packets[1][:1] + b"\xff", packets[2]])
+
+        assert len(pushes) == 1
+        frame = codec.opus_codec.output_sample_rate * 60 // 1000
+        assert pushes[0] >= 2 * frame
+
+    @pytest.mark.asyncio
+    async def test_batch_rejects_mismatched_sequences(self, codec):
+        packets = self._encode_tone(3)
+        with pytest.raises(ValueError):
+            await codec.write_audio_batch(packets, [1, 2])
+        assert codec._tts_fifo.size == 0
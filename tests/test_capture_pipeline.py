@@ -0,0 +1,124 @@
+"""采集线程回归测试.
+
+覆盖：设备块按序在采集线程处理、处理变慢时环溢出计数而 push 不阻塞、
+阶段耗时统计、stop 超时后立即 start 时旧线程不再取新环的数据。背景：AEC/编码曾在 PortAudio 输入回调内执行，偶发变慢即丢输入。
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from src.audio_codecs import capture_pipeline
+from src.audio_codecs.capture_pipeline import CapturePipeline
+
+
+def _wait(pred, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if pred():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_blocks_processed_in_order_on_worker_thread():
+    seen: list[tuple[float, tuple, str]] = []
+
+    def process(block):
+        seen.append((float(block[0, 0]), block.shape, threading.current_thread().name))
+
+    pipe = CapturePipeline(process, name="test-capture")
+    pipe.start(block_frames=160, channels=2)
+    try:
+        for i in range(20):
+            pipe.push(np.full((160, 2), i, dtype=np.float32))
+        assert _wait(lambda: len(seen) == 20)
+    finally:
+        pipe.stop()
+
+    assert [v for v, _s, _n in seen] == list(range(20))
+    assert all(shape == (160, 2) for _v, shape, _n in seen)
+    assert all(name == "test-capture" for _v, _s, name in seen)
+    assert pipe.overflow_blocks == 0
+
+
+def test_slow_processing_overflows_without_blocking_push():
+    release = threading.Event()
+    processed = []
+
+    def process(block):
+        release.wait(2.0)
+        processed.append(float(block[0, 0]))
+
+    pipe = CapturePipeline(process)
+    pipe.start(block_frames=320, channels=1)
+    try:
+        t0 = time.perf_counter()
+        for i in range(100):
+            pipe.push(np.full((320, 1), i, dtype=np.float32))
+        push_elapsed = time.perf_counter() - t0
+        release.set()
+        assert _wait(lambda: pipe.backlog_blocks == 0 and processed)
+    finally:
+        pipe.stop()
+
+    # 100 次 push 远快于一次被卡住的处理
+    assert push_elapsed < 0.5
+    assert pipe.overflow_blocks > 0
+    # 丢的是最旧块：最后处理的是最新块
+    assert processed[-1] == 99.0
+
+
+def test_stage_stats_snapshot():
+    pipe = CapturePipeline(lambda block: pipe.stats.record("aec", 0.001))
+    pipe.start(block_frames=160, channels=1)
+    try:
+        pipe.stats.record("callback", 0.00002)
+        pipe.push(np.zeros((160, 1), dtype=np.float32))
+        assert _wait(lambda: "worker" in pipe.snapshot()["stages"])
+    finally:
+        pipe.stop()
+
+    snap = pipe.snapshot()
+    assert snap["stages"]["callback"]["avg_us"] == 20.0
+    assert snap["stages"]["aec"]["max_us"] == 1000.0
+    assert snap["overflow_blocks"] == 0
+    assert snap["device_overflows"] == 0
+
+
+def test_restart_after_stop_timeout_keeps_single_consumer(monkeypatch):
+    monkeypatch.setattr(capture_pipeline, "_STOP_JOIN_TIMEOUT_S", 0.05)
+    release = threading.Event()
+    seen: list[tuple[float, str]] = []
+
+    def process(block):
+        if float(block[0, 0]) < 0:
+            release.wait(2.0)
+        seen.append((float(block[0, 0]), threading.current_thread().ident))
+
+    pipe = CapturePipeline(process, name="test-capture")
+    pipe.start(block_frames=160, channels=1)
+    pipe.push(np.full((160, 1), -1.0, dtype=np.float32))
+    assert _wait(lambda: pipe.backlog_blocks == 0)
+    old = pipe._thread
+
+    # 旧线程卡在处理中：stop 超时返回，随即以新参数重启
+    pipe.stop()
+    assert old.is_alive()
+    pipe.start(block_frames=160, channels=1)
+    new = pipe._thread
+    try:
+        for i in range(10):
+            pipe.push(np.full((160, 1), i, dtype=np.float32))
+        release.set()
+        assert _wait(lambda: len(seen) == 11)
+        old.join(1.0)
+        assert not old.is_alive()
+    finally:
+        pipe.stop()
+
+    # 旧线程只完成手头那一块；新环的数据全部由新线程按序处理
+    assert [v for v, ident in seen if ident == old.ident] == [-1.0]
+    assert [v for v, ident in seen if ident == new.ident] == [float(i) for i in range(10)]
+    assert pipe._retired == []
@@ -0,0 +1,57 @@
+import asyncio
+import builtins
+import time
+
+from src.core.event_loop import LoopLagMonitor, install_loop_backend
+
+
+def test_snapshot_percentiles():
+    monitor = LoopLagMonitor(window=100)
+    for ms in range(1, 101):
+        monitor.record(ms / 1000)
+    snap = monitor.snapshot()
+    assert snap["samples"] == 100
+    assert snap["p50_ms"] in (50.0, 51.0)
+    assert snap["p99_ms"] == 99.0
+    assert snap["max_ms"] == 100.0
+
+
+def test_monitor_detects_blocked_loop():
+    async def run():
+        monitor = LoopLagMonitor(interval=0.01, report_interval=3600)
+        task = asyncio.create_task(monitor.run())
+        await asyncio.sleep(0.05)
+        time.sleep(0.12)  # 阻塞事件循环
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return monitor.snapshot()
+
+    snap = asyncio.run(run())
+    assert snap["samples"] >= 3
+    assert snap["backend"] == "asyncio"
+    assert snap["max_ms"] >= 100
+    assert snap["p50_ms"] < 50
+
+
+def test_uvloop_missing_falls_back(monkeypatch):
+    real_import = builtins.__import__
+
+    def fake_import(name, *args, **kwargs):
+        if name == "uvloop":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", fake_import)
+    monkeypatch.setattr("sys.platform", "linux")
+    policy = asyncio.get_event_loop_policy()
+    assert install_loop_backend("uvloop") == "asyncio"
+    assert asyncio.get_event_loop_policy() is policy
+
+
+def test_unknown_backend_falls_back():
+    assert install_loop_backend("trio") == "asyncio"
+    assert install_loop_backend("") == "asyncio"
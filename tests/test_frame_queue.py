@@ -0,0 +1,135 @@
+"""FrameQueue / AudioPlugin 上行发送回归测试.
+
+覆盖：跨线程入队的顺序与合并唤醒、队满丢最旧及计数、关闭后排空退出；
+AudioPlugin 常驻发送协程按序发送、不按帧创建任务。
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.core.frame_queue import FrameQueue
+
+
+def test_requires_positive_maxsize():
+    with pytest.raises(ValueError):
+        FrameQueue(0)
+
+
+def test_unbound_put_is_rejected():
+    q = FrameQueue(4)
+    assert q.put(b"x") is False
+    assert len(q) == 0
+
+
+def test_drop_oldest_when_full():
+    async def run():
+        q = FrameQueue(3)
+        q.bind()
+        for i in range(5):
+            q.put(i)
+        return await q.get_batch(), q.stats()
+
+    batch, stats = asyncio.run(run())
+    assert batch == [2, 3, 4]
+    assert stats["dropped"] == 2
+    assert stats["enqueued"] == 5
+    assert stats["max_depth"] == 3
+
+
+def test_cross_thread_order_and_coalesced_wakeups():
+    n = 2000
+
+    async def run():
+        q = FrameQueue(n)
+        q.bind()
+        received = []
+
+        def producer():
+            for i in range(n):
+                q.put(i)
+            q.close()
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+        while batch := await q.get_batch():
+            received.extend(batch)
+            await asyncio.sleep(0.001)
+        thread.join()
+        return received, q.stats()
+
+    received, stats = asyncio.run(run())
+    assert received == list(range(n))
+    assert stats["dropped"] == 0
+    # 消费者处理一批期间的所有 put 共用一次唤醒
+    assert stats["wakeups"] < n
+    assert stats["batches"] < n
+
+
+def test_close_drains_then_returns_empty():
+    async def run():
+        q = FrameQueue(4)
+        q.bind()
+        q.put(b"a")
+        q.close()
+        assert q.put(b"b") is False
+        return await q.get_batch(), await q.get_batch()
+
+    first, second = asyncio.run(run())
+    assert first == [b"a"]
+    assert second == []
+
+
+class _Ctx:
+    def __init__(self):
+        self.opened = True
+
+    def is_audio_channel_opened(self):
+        return self.opened
+
+    def should_capture_audio(self):
+        return True
+
+
+class _Cmd:
+    def __init__(self):
+        self.sent = []
+        self.spawned = []
+
+    def spawn(self, coro, name):
+        task = asyncio.create_task(coro, name=name)
+        self.spawned.append(name)
+        return task
+
+    async def send_audio(self, data):
+        await asyncio.sleep(0)
+        self.sent.append(data)
+
+
+def test_audio_plugin_sender_single_task():
+    from src.plugins.audio import AudioPlugin
+
+    async def run():
+        plugin = AudioPlugin()
+        ctx, cmd = _Ctx(), _Cmd()
+        plugin._ctx, plugin._cmd = ctx, cmd
+        plugin._send_queue.bind()
+        plugin._sender_task = cmd.spawn(plugin._sender_loop(), "audio_sender")
+
+        def producer():
+            for i in range(30):
+                plugin._on_encoded_audio(bytes([i]))
+
+        await asyncio.to_thread(producer)
+        await asyncio.sleep(0.05)
+        ctx.opened = False
+        plugin._on_encoded_audio(b"closed")
+        await asyncio.sleep(0.01)
+        plugin._send_queue.close()
+        await asyncio.wait_for(plugin._sender_task, 1.0)
+        return cmd
+
+    cmd = asyncio.run(run())
+    assert cmd.sent == [bytes([i]) for i in range(30)]
+    assert cmd.spawned == ["audio_sender"]
@@ -0,0 +1,55 @@
+"""冷启动导入预算测试.
+
+覆盖：在新解释器中以 -X importtime 走一遍 CLI 模式（websocket、唤醒词关闭）
+的启动路径，断言 sherpa-onnx / cv2 / PIL / mutagen / PySide6 / cryptography 等
+重依赖在首次使用前不被导入，且顶层导入累计耗时不超出预算；importtime 输出解析。
+背景：音乐播放器、相机工具、MQTT 加密、Opus 编解码器等在模块顶层导入依赖，
+CLI 冷启动即使用不到也要全部加载。
+"""
+
+import pytest
+
+from scripts.cold_start_report import DEFERRED_MODULES, parse_importtime, run_child
+
+# 顶层导入累计耗时上限（毫秒）。本机约 0.5s，留足余量以免慢机误报
+IMPORT_BUDGET_MS = 3000
+
+
+def test_parse_importtime():
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     _io",
+            "import time:        30 |        150 |   io",
+            "import time:       900 |       1050 | src.app",
+            "无关输出",
+        ]
+    )
+    assert parse_importtime(stderr) == [
+        ("_io", 120, 120, 2),
+        ("io", 30, 150, 1),
+        ("src.app", 900, 1050, 0),
+    ]
+
+
+@pytest.fixture(scope="module")
+def cli_startup(tmp_path_factory):
+    from pathlib import Path
+
+    root = str(Path(__file__).resolve().parent.parent)
+    data_dir = str(tmp_path_factory.mktemp("data"))
+    result, stderr = run_child(root, data_dir, importtime=True)
+    return result, parse_importtime(stderr)
+
+
+def test_cli_startup_defers_heavy_modules(cli_startup):
+    result, rows = cli_startup
+    imported = {name.split(".")[0] for name, *_ in rows}
+    assert result["deferred_loaded"] == []
+    assert imported.isdisjoint(DEFERRED_MODULES)
+
+
+def test_cli_startup_import_budget(cli_startup):
+    _, rows = cli_startup
+    total_ms = sum(cumulative for _, _, cumulative, depth in rows if depth == 0) / 1000
+    assert total_ms < IMPORT_BUDGET_MS
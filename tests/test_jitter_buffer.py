@@ -0,0 +1,264 @@
+"""入站抖动缓冲回归测试.
+
+覆盖：序列号重排（含流起始处的乱序）、迟到/重复包、缺口 FEC/PLC 补偿、
+目标时延随抖动自适应（快于实时的突发下发与句间停顿不计为抖动）；
+以及合成有损 UDP 链路（丢包+乱序+抖动）下 AudioCodec 的端到端补偿。
+背景：OpusCodec 曾固定 decode_fec=False，UDP 迟到/丢包直接变成断音或爆音。
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.utils.config_manager import initialize_config
+
+try:
+    initialize_config()
+except Exception:
+    pass
+
+from src.audio_codecs.audio_codec import AudioCodec  # noqa: E402
+from src.audio_codecs.jitter_buffer import FEC, NORMAL, PLC, JitterBuffer  # noqa: E402
+
+
+class _Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+class _LossyLink:
+    """合成有损 UDP 链路：按 60ms 节拍发送，随机丢包、抖动（抖动大于帧间隔即乱序）."""
+
+    def __init__(self, loss: float, jitter_ms: float, seed: int = 7):
+        self._rng = random.Random(seed)
+        self.loss = loss
+        self.jitter_ms = jitter_ms
+        self.dropped: set[int] = set()
+
+    def transmit(self, packets: list[bytes], frame_ms: float = 60.0):
+        """返回按到达时间排序的 (arrival_s, seq, packet)."""
+        arrivals = []
+        for seq, packet in enumerate(packets):
+            # 首尾不丢，保证缺口两侧都有包
+            if 0 < seq < len(packets) - 1 and self._rng.random() < self.loss:
+                self.dropped.add(seq)
+                continue
+            delay = self._rng.uniform(0, self.jitter_ms)
+            arrivals.append(((seq * frame_ms + delay) / 1000.0, seq, packet))
+        arrivals.sort()
+        return arrivals
+
+
+def _start(jb: JitterBuffer, clock: _Clock, seq: int, packet: bytes) -> list:
+    """送入流首包并等过起始滞留，返回放出的项."""
+    jb.put(seq, packet, 60.0)
+    clock.t += jb.target_delay_ms / 1000.0
+    return jb.pop_ready()
+
+
+def _run(jb: JitterBuffer, clock: _Clock, arrivals, step_s: float = 0.005):
+    out = []
+    i = 0
+    end = arrivals[-1][0] + 1.0
+    while clock.t < end:
+        while i < len(arrivals) and arrivals[i][0] <= clock.t:
+            _t, seq, packet = arrivals[i]
+            jb.put(seq, packet, 60.0)
+            i += 1
+        out.extend(jb.pop_ready())
+        clock.t += step_s
+    return out
+
+
+class TestJitterBuffer:
+    @pytest.fixture()
+    def clock(self):
+        return _Clock()
+
+    def test_stream_start_held_then_in_order_passes_through(self, clock):
+        jb = JitterBuffer(clock=clock)
+        for seq in range(3):
+            jb.put(seq, bytes([seq]), 60.0)
+        assert jb.pop_ready() == []
+        assert jb.next_deadline() == pytest.approx(jb.target_delay_ms / 1000.0)
+
+        clock.t += jb.target_delay_ms / 1000.0
+        assert jb.pop_ready() == [(NORMAL, bytes([s]), 60.0) for s in range(3)]
+        assert jb.next_deadline() is None
+        jb.put(3, b"d", 60.0)
+        assert jb.pop_ready() == [(NORMAL, b"d", 60.0)]
+
+    def test_reorder_at_stream_start_is_not_late(self, clock):
+        jb = JitterBuffer(clock=clock)
+        jb.put(11, b"b", 60.0)
+        clock.t += 0.01
+        jb.put(10, b"a", 60.0)
+        assert jb.pop_ready() == []
+
+        clock.t += jb.target_delay_ms / 1000.0
+        assert [p for _k, p, _d in jb.pop_ready()] == [b"a", b"b"]
+        assert jb.late == 0
+        assert jb.reordered == 1
+
+    def test_reorder_within_target_delay(self, clock):
+        jb = JitterBuffer(clock=clock)
+        assert [p for _k, p, _d in _start(jb, clock, 10, b"a")] == [b"a"]
+        jb.put(12, b"c", 60.0)
+        assert jb.pop_ready() == []
+        assert jb.next_deadline() == pytest.approx(jb.target_delay_ms / 1000.0)
+
+        clock.t += 0.01
+        jb.put(11, b"b", 60.0)
+        assert [p for _k, p, _d in jb.pop_ready()] == [b"b", b"c"]
+        assert jb.reordered == 1
+        assert jb.fec_recovered == jb.plc_concealed == 0
+
+    def test_single_loss_uses_fec_from_next_packet(self, clock):
+        jb = JitterBuffer(clock=clock)
+        _start(jb, clock, 0, b"a")
+        jb.put(2, b"c", 60.0)
+        jb.pop_ready()
+        clock.t += jb.target_delay_ms / 1000.0
+        assert jb.pop_ready() == [(FEC, b"c", 60.0), (NORMAL, b"c", 60.0)]
+        assert jb.fec_recovered == 1
+
+    def test_burst_loss_falls_back_to_plc(self, clock):
+        jb = JitterBuffer(clock=clock)
+        _start(jb, clock, 0, b"a")
+        jb.put(4, b"e", 60.0)
+        jb.pop_ready()
+        clock.t += 1.0
+        kinds = [k for k, _p, _d in jb.pop_ready()]
+        assert kinds == [PLC, PLC, FEC, NORMAL]
+        assert jb.plc_concealed == 2
+        assert jb.fec_recovered == 1
+
+    def test_late_and_duplicate_packets_dropped(self, clock):
+        jb = JitterBuffer(clock=clock)
+        _start(jb, clock, 5, b"x")
+        jb.put(4, b"old", 60.0)
+        jb.put(7, b"z", 60.0)
+        jb.put(7, b"z", 60.0)
+        assert jb.late == 1
+        assert jb.duplicate == 1
+
+    def test_large_jump_resyncs_without_concealment(self, clock):
+        jb = JitterBuffer(clock=clock)
+        _start(jb, clock, 0, b"a")
+        jb.put(10_000, b"n", 60.0)
+        assert jb.pop_ready() == []
+        clock.t += jb.target_delay_ms / 1000.0
+        assert jb.pop_ready() == [(NORMAL, b"n", 60.0)]
+        assert jb.resyncs == 1
+        assert jb.plc_concealed == 0
+
+    def test_target_delay_adapts_to_jitter(self):
+        steady_clock, jittery_clock = _Clock(), _Clock()
+        steady = JitterBuffer(clock=steady_clock)
+        jittery = JitterBuffer(clock=jittery_clock)
+        packets = [bytes([i % 256]) for i in range(200)]
+
+        _run(steady, steady_clock, _LossyLink(0.0, 2.0).transmit(packets))
+        _run(jittery, jittery_clock, _LossyLink(0.0, 150.0).transmit(packets))
+
+        assert steady.target_delay_ms < 60
+        assert jittery.target_delay_ms > steady.target_delay_ms + 50
+        assert jittery.stats["target_depth_ms"] == round(jittery.target_delay_ms, 1)
+
+    def test_faster_than_realtime_bursts_and_pauses_are_not_jitter(self):
+        clock = _Clock()
+        jb = JitterBuffer(clock=clock)
+        arrivals = []
+        t = 0.0
+        seq = 0
+        # 三句 TTS：每句 1.2s 音频在 100ms 内突发下发，句间停顿 1s
+        for _sentence in range(3):
+            for _ in range(20):
+                arrivals.append((t, seq, bytes([seq])))
+                seq += 1
+                t += 0.005
+            t += 1.0
+        out = _run(jb, clock, arrivals)
+
+        assert [p[0] for _k, p, _d in out] == list(range(seq))
+        assert jb.jitter_ms < 1.0
+        assert jb.target_delay_ms < 45
+
+    def test_lossy_link_output_is_complete_and_ordered(self):
+        clock = _Clock()
+        jb = JitterBuffer(clock=clock)
+        packets = [i.to_bytes(2, "big") for i in range(300)]
+        link = _LossyLink(loss=0.1, jitter_ms=80.0)
+
+        out = _run(jb, clock, link.transmit(packets))
+
+        # 每个序号恰好对应一个输出帧：正常包按序，丢失帧由 FEC/PLC 补齐
+        normal = [int.from_bytes(p, "big") for k, p, _d in out if k == NORMAL]
+        assert normal == sorted(set(range(300)) - link.dropped)
+        assert len(out) == 300
+        assert jb.fec_recovered + jb.plc_concealed == len(link.dropped)
+        assert jb.stats["actual_depth_ms"] == 0
+
+
+class TestCodecJitterPath:
+    @pytest.fixture()
+    def codec(self):
+        c = AudioCodec()
+        c.opus_codec.initialize()
+        yield c
+        c._reset_jitter()
+        c.opus_codec.close()
+
+    @staticmethod
+    def _encode_with_fec(n_packets: int, rate: int) -> list[bytes]:
+        import opuslib
+        import opuslib.api.ctl
+        import opuslib.api.encoder
+
+        frame = rate * 60 // 1000
+        enc = opuslib.Encoder(rate, 1, opuslib.APPLICATION_VOIP)
+        # opuslib 的 inband_fec setter 漏传参数，直接走 ctl
+        opuslib.api.encoder.encoder_ctl(
+            enc.encoder_state, opuslib.api.ctl.set_inband_fec, 1
+        )
+        enc.packet_loss_perc = 20
+        t = np.arange(frame * n_packets) / rate
+        pcm = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+        return [
+            enc.encode_float(pcm[i * frame : (i + 1) * frame].tobytes(), frame)
+            for i in range(n_packets)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_lossy_udp_stream_is_gap_free(self, codec):
+        rate = codec.opus_codec.output_sample_rate
+        frame = rate * 60 // 1000
+        packets = self._encode_with_fec(60, rate)
+        link = _LossyLink(loss=0.1, jitter_ms=80.0, seed=3)
+        arrivals = link.transmit(packets)
+        assert link.dropped
+
+        clock = _Clock()
+        codec._jitter = JitterBuffer(clock=clock)
+        i = 0
+        while i < len(arrivals) or codec._jitter.stats["held_packets"]:
+            batch = []
+            while i < len(arrivals) and arrivals[i][0] <= clock.t:
+                batch.append(arrivals[i])
+                i += 1
+            if batch:
+                await codec.write_audio_batch(
+                    [p for _t, _s, p in batch], [s for _t, s, _p in batch]
+                )
+            else:
+                codec._drain_jitter()
+            clock.t += 0.01
+
+        stats = codec.jitter_stats
+        assert codec._tts_fifo.size == 60 * frame
+        assert stats["fec_recovered"] + stats["plc_concealed"] == len(link.dropped)
+        assert stats["fec_recovered"] > 0
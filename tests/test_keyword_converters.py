@@ -0,0 +1,99 @@
+"""关键词转换回归测试.
+
+覆盖：trie 贪心分词与原逐长度前缀扫描结果一致、词表按路径只解析一次、
+tokens.txt 更新后重新加载并丢弃单词缓存、批量转换保序去重。
+"""
+
+import os
+import random
+
+import pytest
+
+from src.audio_processing.keyword_converters import BpeConverter, convert_wake_word
+from src.audio_processing.keyword_converters.bpe_converter import _VOCAB_CACHE
+from src.utils.resource_finder import get_app_root
+
+_TOKENS = get_app_root() / "models" / "en" / "tokens.txt"
+
+
+def _legacy_tokenize(token_to_id, text):
+    """改造前的实现：每个位置从 20 字符起逐长度查字典."""
+    tokens = []
+    i = 0
+    while i < len(text):
+        for length in range(min(20, len(text) - i), 0, -1):
+            if text[i : i + length] in token_to_id:
+                tokens.append(text[i : i + length])
+                i += length
+                break
+        else:
+            tokens.append("<unk>")
+            i += 1
+    return tokens
+
+
+@pytest.fixture()
+def bpe():
+    conv = BpeConverter(str(_TOKENS))
+    conv._load_tokens()
+    return conv
+
+
+def test_trie_tokenizer_matches_prefix_scan(bpe):
+    rng = random.Random(0)
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ'"
+    words = ["▁MOSS", "▁HELLO", "▁JARVIS", "▁", "▁Q", "▁ÄBC", "▁" + "X" * 30]
+    words += [
+        "▁" + "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 15)))
+        for _ in range(500)
+    ]
+    for word in words:
+        assert bpe._greedy_tokenize(word) == _legacy_tokenize(bpe._token_to_id, word), word
+
+
+def test_vocab_parsed_once_per_path(bpe):
+    other = BpeConverter(str(_TOKENS))
+    other._load_tokens()
+    assert other._token_to_id is bpe._token_to_id
+    assert other._trie is bpe._trie
+    assert str(_TOKENS) in _VOCAB_CACHE
+
+
+def test_convert_keeps_existing_format(bpe):
+    assert bpe.convert(" moss ") == "▁MO S S @MOSS"
+
+
+def test_batch_preserves_order_and_converts_duplicates_once(bpe, monkeypatch):
+    calls = []
+    original = BpeConverter.convert
+
+    def counting(self, text):
+        calls.append(text)
+        return original(self, text)
+
+    monkeypatch.setattr(BpeConverter, "convert", counting)
+
+    texts = ["hello world", "moss", "hello world", "moss"]
+    results = bpe.convert_batch(texts)
+
+    assert results[0] == results[2]
+    assert results[1] == results[3] == "▁MO S S @MOSS"
+    assert sorted(calls) == ["hello world", "moss"]
+
+
+def test_tokens_file_change_reloads_vocab_and_word_cache(tmp_path):
+    tokens = tmp_path / "tokens.txt"
+    tokens.write_text("▁ 0\nM 1\nO 2\nS 3\n", encoding="utf-8")
+    conv = BpeConverter(str(tokens))
+    assert conv.convert("moss") == "▁ M O S S @MOSS"
+    assert "MOSS" in conv._word_cache
+
+    tokens.write_text("▁ 0\nM 1\nO 2\nS 3\n▁MO 4\nSS 5\n", encoding="utf-8")
+    stat = tokens.stat()
+    os.utime(tokens, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert conv.convert("moss") == "▁MO SS @MOSS"
+
+
+def test_convert_wake_word_detects_language():
+    assert convert_wake_word("小米小米") == ("x iǎo m ǐ x iǎo m ǐ @小米小米", "zh", "models/zh")
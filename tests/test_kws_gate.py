@@ -0,0 +1,70 @@
+"""EnergyGate 回归测试.
+
+覆盖：静音不放行、起音时预录按序吐出、迟滞跨过短停顿、持续安静后关闭。
+背景：KWS 在安静环境也逐帧推理，是常驻 CPU 的最大来源。
+"""
+
+import numpy as np
+
+from src.audio_processing.kws_gate import EnergyGate
+
+_RATE = 16000
+_FRAME = 320  # 20ms
+
+
+def _tone(amp: float, n: int = _FRAME, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (amp * rng.standard_normal(n)).astype(np.float32)
+
+
+def test_silence_is_gated():
+    gate = EnergyGate(_RATE)
+    for i in range(50):
+        assert gate.filter(_tone(1e-4, seed=i)) is None
+    assert not gate.is_open
+    assert gate.passed_samples == 0
+    assert gate.gated_samples == 50 * _FRAME
+
+
+def test_onset_flushes_preroll_in_order():
+    gate = EnergyGate(_RATE, preroll_ms=60)
+    quiet = [np.full(_FRAME, (i + 1) * 1e-5, dtype=np.float32) for i in range(5)]
+    for q in quiet:
+        assert gate.filter(q) is None
+
+    loud = _tone(0.1)
+    out = gate.filter(loud)
+    assert gate.is_open
+    # 预录只保留最近 60ms（3 帧），按时间顺序在前
+    expected = np.concatenate(quiet[-3:] + [loud])
+    assert np.array_equal(out, expected)
+    assert gate.opened == 1
+
+    # 打开后原样放行（不拷贝）
+    nxt = _tone(0.1, seed=1)
+    assert gate.filter(nxt) is nxt
+
+
+def test_hangover_bridges_pause_then_closes():
+    gate = EnergyGate(_RATE, hangover_ms=200)
+    gate.filter(_tone(0.1))
+    # 100ms 停顿：仍打开
+    for i in range(5):
+        assert gate.filter(_tone(1e-4, seed=i)) is not None
+    gate.filter(_tone(0.1))
+    assert gate.is_open
+    # 连续 200ms 安静后关闭
+    for i in range(10):
+        gate.filter(_tone(1e-4, seed=i))
+    assert not gate.is_open
+    assert gate.filter(_tone(1e-4)) is None
+
+
+def test_between_thresholds_keeps_state():
+    gate = EnergyGate(_RATE, open_db=-30, close_db=-50, hangover_ms=100)
+    mid = _tone(10 ** (-40 / 20))  # 约 -40 dBFS：不足以打开，也不触发关闭
+    assert gate.filter(mid) is None
+    gate.filter(_tone(0.2))
+    for _ in range(20):
+        assert gate.filter(mid) is not None
+    assert gate.is_open
@@ -0,0 +1,62 @@
+"""AudioPacketCipher 回归测试.
+
+覆盖：组包结果与逐包 Cipher(CTR) + hex nonce 的原实现逐字节一致
+（含空包、非 16 字节对齐、计数器低 64 位进位），解密还原明文与序列号。
+背景：UDP 收发曾逐包 bytes.fromhex 解码密钥/nonce 并重建 Cipher。
+"""
+
+import os
+
+import pytest
+
+from src.protocols.mqtt_crypto import (
+    AudioPacketCipher,
+    aes_ctr_decrypt,
+    aes_ctr_encrypt,
+    build_audio_nonce,
+)
+
+
+def _reference_packet(key_hex, nonce_hex, audio, sequence):
+    nonce = bytes.fromhex(build_audio_nonce(nonce_hex, len(audio), sequence))
+    return nonce + aes_ctr_encrypt(bytes.fromhex(key_hex), nonce, audio)
+
+
+@pytest.mark.parametrize("size", [0, 1, 15, 16, 17, 60, 120, 320, 1500])
+def test_encrypt_matches_reference(size):
+    key_hex, nonce_hex = os.urandom(16).hex(), os.urandom(16).hex()
+    cipher = AudioPacketCipher(key_hex, nonce_hex)
+    for sequence in (1, 2, 0xFFFFFFFF):
+        audio = os.urandom(size)
+        assert cipher.encrypt(audio, sequence) == _reference_packet(
+            key_hex, nonce_hex, audio, sequence
+        )
+
+
+def test_counter_carry_matches_reference():
+    key_hex = os.urandom(16).hex()
+    # 低 64 位接近上限：nonce[8:12] 全 0xFF，序列号 0xFFFFFFFF → 逐块进位到高 64 位
+    nonce_hex = "0011" + "0000" + "8899aabb" + "ffffffff" + "00000000"
+    cipher = AudioPacketCipher(key_hex, nonce_hex)
+    audio = os.urandom(100)
+    packet = cipher.encrypt(audio, 0xFFFFFFFF)
+    assert packet == _reference_packet(key_hex, nonce_hex, audio, 0xFFFFFFFF)
+    assert AudioPacketCipher(key_hex, nonce_hex).decrypt(packet) == (audio, 0xFFFFFFFF)
+
+
+def test_decrypt_roundtrip_and_sequence():
+    key_hex, nonce_hex = os.urandom(16).hex(), os.urandom(16).hex()
+    tx = AudioPacketCipher(key_hex, nonce_hex)
+    rx = AudioPacketCipher(key_hex, nonce_hex)
+    for sequence, size in ((7, 80), (8, 4096), (9, 3)):
+        audio = os.urandom(size)
+        packet = tx.encrypt(audio, sequence)
+        plain, seq = rx.decrypt(memoryview(packet))
+        assert plain == audio
+        assert seq == sequence
+        assert plain == aes_ctr_decrypt(bytes.fromhex(key_hex), packet[:16], packet[16:])
+
+
+def test_invalid_nonce_rejected():
+    with pytest.raises(ValueError):
+        AudioPacketCipher(os.urandom(16).hex(), "abcd")
@@ -0,0 +1,171 @@
+"""MqttUdpChannel / MqttUdpDatagramChannel 回归测试.
+
+两种实现对接本地 UDP 回显服务端：加密发出的包被原样回送，
+应解密还原为相同音频并带回发送序列号；回调均在 event loop 线程执行。
+另覆盖：数据报端点突发积压批量取出、跨线程 stop、端点失败回退收包线程。
+"""
+
+import asyncio
+import os
+import socket
+import threading
+
+import pytest
+
+from src.protocols.mqtt_udp import MqttUdpChannel, MqttUdpDatagramChannel
+
+
+class _UdpEcho:
+    """本地 UDP 回显（独立线程）；hold 置位时攒包，release 后一次性回送."""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.05)
+        self.port = self.sock.getsockname()[1]
+        self.hold = False
+        self._held = []
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while self._running:
+            try:
+                data, addr = self.sock.recvfrom(4096)
+            except TimeoutError:
+                continue
+            except OSError:
+                return
+            if self.hold:
+                self._held.append((data, addr))
+            else:
+                self.sock.sendto(data, addr)
+
+    def release(self):
+        self.hold = False
+        held, self._held = self._held, []
+        for data, addr in held:
+            self.sock.sendto(data, addr)
+
+    def close(self):
+        self._running = False
+        self._thread.join(1.0)
+        self.sock.close()
+
+
+@pytest.fixture()
+def echo():
+    server = _UdpEcho()
+    yield server
+    server.close()
+
+
+def _configure(channel, port):
+    channel.configure("127.0.0.1", port, os.urandom(16).hex(), os.urandom(16).hex())
+
+
+async def _wait_for(predicate, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() > deadline:
+            raise AssertionError("等待超时")
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize("channel_cls", [MqttUdpChannel, MqttUdpDatagramChannel])
+def test_roundtrip_through_echo(channel_cls, echo):
+    async def run():
+        loop = asyncio.get_running_loop()
+        channel = channel_cls(loop)
+        _configure(channel, echo.port)
+        received = []
+        threads = set()
+
+        def handler(audio, sequence):
+            threads.add(threading.get_ident())
+            received.append((audio, sequence))
+
+        channel.set_audio_handler(handler)
+        channel.start()
+        await _wait_for(channel.is_ready)
+        await asyncio.sleep(0.02)
+
+        frames = [os.urandom(40 + i) for i in range(20)]
+        for frame in frames:
+            assert channel.send_audio(frame)
+            await asyncio.sleep(0.002)
+        await _wait_for(lambda: len(received) == len(frames))
+        channel.stop()
+        return frames, received, threads, channel
+
+    frames, received, threads, channel = asyncio.run(run())
+    assert received == [(f, i + 1) for i, f in enumerate(frames)]
+    assert threads == {threading.main_thread().ident}
+    assert not channel.is_ready()
+    if isinstance(channel, MqttUdpDatagramChannel):
+        assert channel.thread is None
+
+
+def test_datagram_channel_drains_bursts(echo):
+    async def run():
+        channel = MqttUdpDatagramChannel(asyncio.get_running_loop())
+        _configure(channel, echo.port)
+        received = []
+        channel.set_audio_handler(lambda audio, seq: received.append(seq))
+        channel.start()
+        await _wait_for(lambda: channel._transport is not None)
+
+        echo.hold = True
+        for _ in range(50):
+            channel.send_audio(b"\x00" * 60)
+        await _wait_for(lambda: len(echo._held) == 50)
+        echo.release()
+        await _wait_for(lambda: len(received) == 50)
+        channel.stop()
+        return received, channel
+
+    received, channel = asyncio.run(run())
+    assert received == list(range(1, 51))
+    assert channel.received_packets == 50
+    # 突发到达：多数包在同一次可读事件内被批量取出
+    assert channel.drained_packets > 0
+
+
+def test_datagram_channel_stop_from_other_thread(echo):
+    async def run():
+        channel = MqttUdpDatagramChannel(asyncio.get_running_loop())
+        _configure(channel, echo.port)
+        channel.start()
+        await _wait_for(lambda: channel._transport is not None)
+        transport = channel._transport
+        await asyncio.to_thread(channel.stop)
+        await _wait_for(transport.is_closing)
+        return channel
+
+    channel = asyncio.run(run())
+    assert channel.socket is None and not channel.running
+
+
+def test_datagram_channel_falls_back_to_thread(echo):
+    async def run():
+        loop = asyncio.get_running_loop()
+        channel = MqttUdpDatagramChannel(loop)
+        _configure(channel, echo.port)
+
+        async def unsupported(*args, **kwargs):
+            raise NotImplementedError
+
+        loop.create_datagram_endpoint = unsupported
+        received = []
+        channel.set_audio_handler(lambda audio, seq: received.append(audio))
+        channel.start()
+        await _wait_for(lambda: channel.thread is not None)
+        channel.send_audio(b"abc")
+        await _wait_for(lambda: received == [b"abc"])
+        channel.stop()
+        return channel
+
+    channel = asyncio.run(run())
+    assert channel.thread is None and channel.socket is None
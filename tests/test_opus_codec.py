@@ -0,0 +1,76 @@
+"""OpusCodec 编码参数回归测试.
+
+覆盖：OPUS_OPTIONS 经 CTL 生效、DTX 静音帧识别。
+背景：编码器曾固定 libopus 默认参数，低功耗设备上编码耗时显著。
+"""
+
+import numpy as np
+import pytest
+
+from src.audio_codecs.opus_codec import OpusCodec
+from src.utils.opus_loader import setup_opus
+
+# opuslib 导入时即加载 libopus，须先定位内置库
+setup_opus()
+
+import opuslib.api.ctl as ctl_api  # noqa: E402
+import opuslib.api.encoder as encoder_api  # noqa: E402
+
+
+def _get(codec: OpusCodec, request) -> int:
+    return encoder_api.encoder_ctl(codec.encoder.encoder_state, request)
+
+
+@pytest.fixture()
+def make_codec():
+    codecs = []
+
+    def _make(options):
+        c = OpusCodec(16000, 24000, encoder_options=options)
+        c.initialize()
+        codecs.append(c)
+        return c
+
+    yield _make
+    for c in codecs:
+        c.close()
+
+
+def test_encoder_options_applied_via_ctl(make_codec):
+    codec = make_codec(
+        {
+            "COMPLEXITY": 3,
+            "BITRATE": 20000,
+            "VBR": False,
+            "DTX": True,
+            "INBAND_FEC": True,
+            "PACKET_LOSS_PERC": 15,
+        }
+    )
+    assert _get(codec, ctl_api.get_complexity) == 3
+    assert _get(codec, ctl_api.get_bitrate) == 20000
+    assert _get(codec, ctl_api.get_vbr) == 0
+    assert _get(codec, ctl_api.get_dtx) == 1
+    assert _get(codec, ctl_api.get_inband_fec) == 1
+    assert _get(codec, ctl_api.get_packet_loss_perc) == 15
+
+
+def test_none_options_keep_libopus_defaults(make_codec):
+    default = make_codec({})
+    explicit_none = make_codec({"COMPLEXITY": None, "BITRATE": None})
+    assert _get(explicit_none, ctl_api.get_complexity) == _get(
+        default, ctl_api.get_complexity
+    )
+    assert not explicit_none.dtx
+
+
+def test_dtx_silence_frames_detected(make_codec):
+    codec = make_codec({"DTX": True})
+    frame = 16000 * 60 // 1000
+    silence = np.zeros(frame, dtype=np.float32)
+    tone = (0.3 * np.sin(np.arange(frame) * 0.2)).astype(np.float32)
+
+    assert not codec.is_dtx_frame(codec.encode(tone, frame))
+    # DTX 需数帧静音后才进入不连续模式
+    flags = [codec.is_dtx_frame(codec.encode(silence, frame)) for _ in range(20)]
+    assert any(flags)
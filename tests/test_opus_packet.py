@@ -0,0 +1,74 @@
+"""入站 Opus 包记录 / TOC 查表回归测试.
+
+覆盖：查表时长与逐位解析（RFC 6716 3.1）对全部 256 个 TOC 字节一致，
+code 3 读第二字节帧数，空包返回 None；包记录不建 __dict__、不拷贝负载。
+背景：每个入站包都经 parse_opus_toc 构造 dict，TTS 突发时分配开销明显。
+"""
+
+import pytest
+
+from src.audio_codecs.opus_packet import (
+    InboundAudioPacket,
+    packet_duration_ms,
+    parse_opus_toc,
+)
+
+
+def _reference_duration(packet: bytes) -> float:
+    toc = packet[0]
+    config, code = toc >> 3, toc & 0x03
+    if config < 12:
+        frame_ms = (10, 20, 40, 60)[config % 4]
+    elif config < 16:
+        frame_ms = (10, 20)[config % 2]
+    else:
+        frame_ms = (2.5, 5, 10, 20)[config % 4]
+    if code == 0:
+        frames = 1
+    elif code <= 2:
+        frames = 2
+    else:
+        frames = (packet[1] & 0x3F) if len(packet) >= 2 else 1
+    return frame_ms * frames
+
+
+@pytest.mark.parametrize("second", [None, 0x03, 0x85])
+def test_duration_table_matches_bitwise_parse(second):
+    for toc in range(256):
+        packet = bytes([toc]) if second is None else bytes([toc, second])
+        expected = _reference_duration(packet)
+        assert packet_duration_ms(packet) == expected
+        assert parse_opus_toc(packet)["duration_ms"] == expected
+
+
+def test_parse_opus_toc_fields():
+    # config 1 = SILK NB 20ms, code 0
+    info = parse_opus_toc(bytes([1 << 3]))
+    assert info == {
+        "duration_ms": 20,
+        "frame_ms": 20,
+        "num_frames": 1,
+        "bandwidth": "NB",
+        "bandwidth_hz": "8kHz",
+        "mode": "SILK",
+    }
+    # config 31 = CELT FB 20ms, code 3 × 3 帧
+    info = parse_opus_toc(bytes([(31 << 3) | 3, 3]))
+    assert (info["mode"], info["bandwidth"], info["duration_ms"]) == ("CELT", "FB", 60)
+
+
+def test_empty_packet():
+    assert packet_duration_ms(b"") is None
+    assert parse_opus_toc(b"") is None
+    assert InboundAudioPacket(b"").duration_ms is None
+
+
+def test_packet_record_is_compact_and_zero_copy():
+    payload = bytes([(3 << 3), 0xAA, 0xBB])  # SILK NB 60ms
+    packet = InboundAudioPacket(payload, 7)
+    assert packet.data is payload
+    assert packet.sequence == 7
+    assert packet.duration_ms == 60
+    assert not hasattr(packet, "__dict__")
+    view = memoryview(payload)
+    assert InboundAudioPacket(view).duration_ms == 60
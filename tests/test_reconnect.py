@@ -0,0 +1,394 @@
+"""断线重连回归测试.
+
+覆盖：重连退避（首次立即、抖动指数退避封顶）、重连循环直到成功/用尽次数、
+监控任务自身处理断线时不自我取消；对接本地 wss 服务端（自签名证书）：
+服务端掐断连接后立即重连并复用 TLS 会话，keepalive 时延劣化时预热的备用连接被接管，
+链路健康时监控不额外发 ping；上行写出失败时 send_text 返回 False，
+断线处理在独立任务中执行（不在调度器写协程内拆除调度器）；经 ProtocolTransport 入口按配置启用自动重连，
+恢复的通道只通知 PROTOCOL_CONNECTED，配置为 0 时断线直接上报网络错误。
+背景：原重连每次固定等待 2×attempt 秒、只尝试一次，并重做完整 TLS 握手；
+自动重连此前无人启用。
+"""
+
+import asyncio
+import datetime
+import json
+import ssl
+
+import pytest
+import websockets
+
+from src.core import protocol_manager
+from src.core.event_bus import EventBus, Events
+from src.core.protocol_manager import ProtocolTransport
+from src.protocols import websocket_protocol
+from src.protocols.protocol import Protocol, reconnect_delay
+from src.protocols.websocket_protocol import WebsocketProtocol
+
+
+def test_reconnect_delay_schedule():
+    assert reconnect_delay(1) == 0.0
+    for attempt, ceiling in ((2, 1.0), (3, 2.0), (4, 4.0), (10, 30.0)):
+        for _ in range(50):
+            delay = reconnect_delay(attempt)
+            assert ceiling / 2 <= delay <= ceiling
+    assert len({reconnect_delay(5) for _ in range(20)}) > 1
+
+
+class _FlakyProtocol(Protocol):
+    def __init__(self, failures):
+        super().__init__()
+        self.connected = False
+        self.failures = failures
+        self.calls = 0
+
+    def _reconnect_delay(self, attempt):
+        return 0.0
+
+    async def connect(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            return False
+        self.connected = True
+        self._reconnect_attempts = 0
+        return True
+
+
+def _run_reconnect(protocol):
+    events = {"reconnecting": [], "errors": [], "states": []}
+    protocol.on_reconnecting(lambda a, m: events["reconnecting"].append(a))
+    protocol.on_connection_state_changed(lambda c, r: events["states"].append(c))
+
+    async def on_error(message):
+        events["errors"].append(message)
+
+    protocol.on_network_error(on_error)
+    protocol.enable_auto_reconnect(True, max_attempts=3)
+    asyncio.run(protocol._attempt_reconnect("测试"))
+    return events
+
+
+def test_reconnect_retries_until_success():
+    protocol = _FlakyProtocol(failures=2)
+    events = _run_reconnect(protocol)
+    assert protocol.calls == 3
+    assert events["reconnecting"] == [1, 2, 3]
+    assert events["states"] == [True]
+    assert events["errors"] == []
+    assert protocol._reconnect_attempts == 0
+
+
+def test_reconnect_gives_up_after_max_attempts():
+    protocol = _FlakyProtocol(failures=10)
+    events = _run_reconnect(protocol)
+    assert protocol.calls == 3
+    assert len(events["errors"]) == 1
+
+
+def test_monitor_cancel_from_monitor_task():
+    async def run():
+        protocol = _FlakyProtocol(failures=0)
+
+        async def monitor():
+            await protocol._cancel_monitor_task()
+            return "done"
+
+        protocol._connection_monitor_task = asyncio.create_task(monitor())
+        return await protocol._connection_monitor_task, protocol
+
+    result, protocol = asyncio.run(run())
+    assert result == "done"
+    assert protocol._connection_monitor_task is None
+
+
+# ---- 本地 wss 服务端 ----
+
+
+def _self_signed_context(tmp_path) -> ssl.SSLContext:
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    cert_file = tmp_path / "cert.pem"
+    key_file = tmp_path / "key.pem"
+    cert_file.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_file.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_file, key_file)
+    return context
+
+
+class _Config:
+    def __init__(self, url):
+        self.values = {
+            "SYSTEM_OPTIONS.NETWORK.WEBSOCKET_URL": url,
+            "SYSTEM_OPTIONS.NETWORK.WEBSOCKET_ACCESS_TOKEN": "token",
+            "SYSTEM_OPTIONS.DEVICE_ID": "device",
+            "SYSTEM_OPTIONS.CLIENT_ID": "client",
+        }
+
+    def get_config(self, path, default=None):
+        return self.values.get(path, default)
+
+
+async def _serve(server_ssl):
+    """回应 hello 的最小服务端；返回已接受的连接列表供测试掐断."""
+    connections = []
+
+    async def handler(ws):
+        connections.append(ws)
+        async for message in ws:
+            if isinstance(message, str) and json.loads(message)["type"] == "hello":
+                await ws.send(json.dumps({"type": "hello", "transport": "websocket"}))
+
+    server = await websockets.serve(handler, "127.0.0.1", 0, ssl=server_ssl)
+    port = server.sockets[0].getsockname()[1]
+    return server, port, connections
+
+
+async def _wait_for(predicate, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() > deadline:
+            raise AssertionError("等待超时")
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture()
+def server_ssl(tmp_path):
+    return _self_signed_context(tmp_path)
+
+
+def test_reconnect_after_kill_resumes_tls_session(server_ssl, monkeypatch):
+    async def run():
+        server, port, connections = await _serve(server_ssl)
+        monkeypatch.setattr(
+            websocket_protocol,
+            "get_config",
+            lambda: _Config(f"wss://127.0.0.1:{port}"),
+        )
+        protocol = WebsocketProtocol()
+        protocol.enable_auto_reconnect(True, max_attempts=3)
+        opened = []
+
+        async def on_opened():
+            opened.append(asyncio.get_running_loop().time())
+
+        protocol.on_audio_channel_opened(on_opened)
+        assert await protocol.connect()
+
+        connections[-1].transport.abort()
+        await _wait_for(lambda: len(opened) == 2 and protocol.connected)
+        info = protocol.get_connection_info()
+        await protocol.close_audio_channel()
+        server.close()
+        await server.wait_closed()
+        return info, connections
+
+    info, connections = asyncio.run(run())
+    assert len(connections) == 2
+    assert info["reconnect_attempts"] == 0
+    assert info["tls"]["handshakes"] == 2
+    assert info["tls"]["resumed"] == 1
+
+
+def test_degraded_link_prewarms_standby(server_ssl, monkeypatch):
+    monkeypatch.setattr(websocket_protocol, "_DEGRADED_LATENCY_S", 0.2)
+
+    async def run():
+        server, port, connections = await _serve(server_ssl)
+        monkeypatch.setattr(
+            websocket_protocol,
+            "get_config",
+            lambda: _Config(f"wss://127.0.0.1:{port}"),
+        )
+        protocol = WebsocketProtocol()
+        protocol.enable_auto_reconnect(True, max_attempts=3)
+        assert await protocol.connect()
+        primary = connections[-1]
+
+        # 服务端停止读取，keepalive 测得时延超过阈值：判定劣化并预热备用连接
+        primary.transport.pause_reading()
+        protocol.websocket.latency = 0.5
+        await protocol._on_monitor_tick()
+        await _wait_for(lambda: protocol._standby is not None)
+        assert len(connections) == 2
+
+        primary.transport.abort()
+        await _wait_for(lambda: protocol.connected and protocol.standby_used == 1)
+        info = protocol.get_connection_info()
+        await protocol.close_audio_channel()
+        server.close()
+        await server.wait_closed()
+        return info, connections
+
+    info, connections = asyncio.run(run())
+    # 接管备用连接，未再新建第三条
+    assert len(connections) == 2
+    assert info["standby"] == {"ready": False, "prewarmed": 1, "used": 1}
+
+
+def test_healthy_link_monitor_sends_no_ping(server_ssl, monkeypatch):
+    async def run():
+        server, port, connections = await _serve(server_ssl)
+        monkeypatch.setattr(
+            websocket_protocol,
+            "get_config",
+            lambda: _Config(f"wss://127.0.0.1:{port}"),
+        )
+        protocol = WebsocketProtocol()
+        assert await protocol.connect()
+        pings = []
+        real_ping = protocol.websocket.ping
+
+        async def counting_ping(*args, **kwargs):
+            pings.append(args)
+            return await real_ping(*args, **kwargs)
+
+        monkeypatch.setattr(protocol.websocket, "ping", counting_ping)
+        for _ in range(3):
+            await protocol._on_monitor_tick()
+        standby = protocol._standby_task
+        await protocol.close_audio_channel()
+        server.close()
+        await server.wait_closed()
+        return pings, standby, connections
+
+    pings, standby, connections = asyncio.run(run())
+    assert pings == []
+    assert standby is None
+    assert len(connections) == 1
+
+
+class _TransportConfig:
+    def __init__(self, attempts):
+        self.attempts = attempts
+
+    def get_config(self, path, default=None):
+        if path == "SYSTEM_OPTIONS.NETWORK.AUTO_RECONNECT_ATTEMPTS":
+            return self.attempts
+        return default
+
+
+@pytest.mark.parametrize("attempts", [3, 0])
+def test_transport_enables_auto_reconnect_from_config(
+    server_ssl, monkeypatch, attempts
+):
+    async def run():
+        server, port, connections = await _serve(server_ssl)
+        monkeypatch.setattr(
+            websocket_protocol,
+            "get_config",
+            lambda: _Config(f"wss://127.0.0.1:{port}"),
+        )
+        monkeypatch.setattr(
+            protocol_manager, "get_config", lambda: _TransportConfig(attempts)
+        )
+        bus = EventBus()
+        events = []
+        for name in (
+            Events.AUDIO_CHANNEL_OPENED,
+            Events.AUDIO_CHANNEL_CLOSED,
+            Events.PROTOCOL_CONNECTED,
+            Events.NETWORK_ERROR,
+        ):
+
+            async def record(*args, _name=name):
+                events.append(_name)
+
+            bus.on(name, record)
+
+        transport = ProtocolTransport(bus)
+        transport.set_protocol("websocket")
+        assert await transport.connect()
+
+        connections[-1].transport.abort()
+        if attempts:
+            await _wait_for(lambda: events.count(Events.PROTOCOL_CONNECTED) == 2)
+        else:
+            await _wait_for(lambda: Events.NETWORK_ERROR in events)
+        recovered = transport.is_audio_channel_opened()
+        await transport.disconnect()
+        server.close()
+        await server.wait_closed()
+        return events, recovered, connections
+
+    events, recovered, connections = asyncio.run(run())
+    # 仅首次主动建连通知 AUDIO_CHANNEL_OPENED；断线均先通知通道关闭
+    assert events.count(Events.AUDIO_CHANNEL_OPENED) == 1
+    assert events.count(Events.AUDIO_CHANNEL_CLOSED) >= 1
+    if attempts:
+        assert recovered
+        assert len(connections) == 2
+        assert Events.NETWORK_ERROR not in events
+    else:
+        assert not recovered
+        assert len(connections) == 1
+        assert events.count(Events.PROTOCOL_CONNECTED) == 1
+
+
+def test_send_failure_reports_and_handles_loss_off_writer(server_ssl, monkeypatch):
+    async def run():
+        server, port, connections = await _serve(server_ssl)
+        monkeypatch.setattr(
+            websocket_protocol,
+            "get_config",
+            lambda: _Config(f"wss://127.0.0.1:{port}"),
+        )
+        protocol = WebsocketProtocol()
+        closed = asyncio.Event()
+
+        async def on_closed():
+            closed.set()
+
+        protocol.on_audio_channel_closed(on_closed)
+        assert await protocol.connect()
+
+        writer = protocol._sender._task
+        loss_tasks = []
+        original = protocol._handle_connection_loss
+
+        async def recording(reason, **kwargs):
+            loss_tasks.append(asyncio.current_task())
+            await original(reason, **kwargs)
+
+        async def failing_send(_payload):
+            raise ConnectionResetError("boom")
+
+        monkeypatch.setattr(protocol, "_handle_connection_loss", recording)
+        protocol._sender._send = failing_send
+        sent = await protocol.send_text(json.dumps({"type": "listen"}))
+        await asyncio.wait_for(closed.wait(), 5.0)
+        server.close()
+        await server.wait_closed()
+        return sent, writer, loss_tasks, protocol
+
+    sent, writer, loss_tasks, protocol = asyncio.run(run())
+    assert sent is False
+    assert len(loss_tasks) == 1
+    assert loss_tasks[0] is not writer
+    assert loss_tasks[0].get_name() == "ws_connection_loss"
+    assert writer.done()
+    assert protocol._sender is None
+    assert not protocol.connected
@@ -172,6 +172,33 @@ async def test_protocol_audio_queue_uses_single_consumer_not_per_frame_tasks():
     await transport.disconnect()
 
 
+@pytest.mark.asyncio
+async def test_protocol_audio_consumer_drains_queue_into_batches():
+    bus = EventBus()
+    transport = ProtocolTransport(bus)
+    batches: list[list[bytes]] = []
+
+    async def batch_handler(packets):
+        assert all(p.sequence is None for p in packets)
+        batches.append([p.data for p in packets])
+
+    transport.set_audio_batch_handler(batch_handler)
+    # 同一轮同步入队：consumer 下次唤醒应一次取空
+    for i in range(10):
+        transport._on_incoming_audio(bytes([i]))
+
+    for _ in range(50):
+        if sum(len(b) for b in batches) == 10:
+            break
+        await asyncio.sleep(0.01)
+
+    flat = [p for b in batches for p in b]
+    assert flat == [bytes([i]) for i in range(10)]
+    assert len(batches) < 10
+
+    await transport.disconnect()
+
+
 @pytest.mark.asyncio
 async def test_protocol_json_spawns_via_task_manager():
     bus = EventBus()
@@ -0,0 +1,106 @@
+"""InboundSequenceFilter 回归测试.
+
+覆盖：顺序/丢包/窗口内乱序/重复/过旧包判定与计数，32 位回绕，
+大跨度前跳与对端序号重置后的重新同步；以及 UDP 通道对重放包不解密不回调。
+背景：remote_sequence 从未使用，重复包与迟到过久的包被照常解码播放成杂音。
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from src.protocols.mqtt_udp import MqttUdpChannel
+from src.protocols.udp_sequence import InboundSequenceFilter
+
+
+def _feed(f, seqs):
+    return [f.accept(s) for s in seqs]
+
+
+def test_in_order_and_loss():
+    f = InboundSequenceFilter(window=8)
+    assert _feed(f, [1, 2, 3, 6, 7]) == [True] * 5
+    stats = f.stats()
+    assert stats["lost"] == 2
+    assert stats["accepted"] == 5
+    assert stats["highest_sequence"] == 7
+    assert stats["loss_rate"] == pytest.approx(2 / 7, abs=1e-4)
+
+
+def test_reorder_within_window_and_duplicates():
+    f = InboundSequenceFilter(window=8)
+    assert _feed(f, [1, 3, 2, 2, 3, 4, 4]) == [True, True, True, False, False, True, False]
+    stats = f.stats()
+    assert stats["reordered"] == 1
+    assert stats["lost"] == 0
+    assert stats["duplicate"] == 3
+
+
+def test_stale_outside_window_dropped():
+    f = InboundSequenceFilter(window=8)
+    _feed(f, [1, 20])
+    assert f.accept(5) is False
+    assert f.accept(13) is True  # 窗口内（20-13 < 8）
+    stats = f.stats()
+    assert stats["stale"] == 1
+    assert stats["reordered"] == 1
+    assert stats["lost"] == 17
+
+
+def test_wraparound():
+    f = InboundSequenceFilter(window=16)
+    seqs = [0xFFFFFFFE, 0xFFFFFFFF, 1, 0, 2]
+    assert _feed(f, seqs) == [True] * 5
+    assert f.stats()["highest_sequence"] == 2
+    assert f.stats()["reordered"] == 1
+    assert f.accept(0xFFFFFFFF) is False
+
+
+def test_resync_on_large_jump_and_peer_reset():
+    f = InboundSequenceFilter(window=8)
+    _feed(f, [1, 2, 100000])
+    assert f.stats()["resyncs"] == 1
+    assert f.stats()["lost"] == 0
+
+    # 对端计数从 1 重新开始：连续过旧包后重新同步
+    results = _feed(f, range(1, 60))
+    assert results[-1] is True
+    assert f.stats()["resyncs"] == 2
+    assert f.accept(61) is True
+
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        InboundSequenceFilter(window=0)
+
+
+def test_channel_drops_replayed_packets():
+    async def run():
+        loop = asyncio.get_running_loop()
+        key, nonce = os.urandom(16).hex(), os.urandom(16).hex()
+        sender = MqttUdpChannel(loop)
+        sender.configure("127.0.0.1", 1, key, nonce)
+        receiver = MqttUdpChannel(loop)
+        receiver.configure("127.0.0.1", 1, key, nonce)
+        decrypted = []
+        receiver._rx_cipher.decrypt = (
+            lambda packet, _orig=receiver._rx_cipher.decrypt: decrypted.append(1)
+            or _orig(packet)
+        )
+
+        packets = [sender._tx_cipher.encrypt(bytes([i]) * 10, i) for i in range(1, 6)]
+        order = [0, 1, 1, 3, 2, 4, 0]  # 重复 2、乱序 4/3、重放 1
+        results = [receiver._decrypt_packet(packets[i]) for i in order]
+        return results, decrypted, receiver
+
+    results, decrypted, receiver = asyncio.run(run())
+    accepted = [r[1] for r in results if r is not None]
+    assert accepted == [1, 2, 4, 3, 5]
+    assert len(decrypted) == 5
+    assert receiver.remote_sequence == 5
+    stats = receiver.rx_stats()
+    assert stats["duplicate"] == 2
+    assert stats["reordered"] == 1
+    assert stats["lost"] == 0
+    assert stats["transport"] == "thread"
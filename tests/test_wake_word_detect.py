@@ -0,0 +1,403 @@
+"""WakeWordDetector 回归测试（sherpa-onnx 以假对象替代）.
+
+覆盖：共享只读采集帧的 retain/release，队列满丢帧时归还帧池，
+推理在独立线程执行、检测结果投递回事件循环，积压帧合并为一次
+accept_waveform 并循环解码，丢帧数/RTF 统计，推理连续失败时退避并真正停止，
+前置能量门，模型档位解析，双缓冲热重载（构建期间旧模型继续检测，
+替换后不重启推理线程；门参数未变或构建失败时保留能量门状态）。
+"""
+
+import asyncio
+import queue
+import threading
+
+import numpy as np
+import pytest
+
+from src.audio_codecs.audio_buffer import PcmFramePool
+from src.audio_processing import wake_word_detect
+from src.audio_processing.kws_gate import EnergyGate
+from src.audio_processing.wake_word_detect import (
+    WakeWordDetector,
+    resolve_model_files,
+)
+
+
+class _FakeStream:
+    def __init__(self):
+        self.waveforms = []
+        self.pending = 0
+
+    def accept_waveform(self, sample_rate, waveform):
+        self.waveforms.append(waveform)
+        self.pending += len(waveform) // 320  # 每 20ms 可解码一次
+
+
+class _FakeSpotter:
+    def __init__(self, hit_after: int = 0):
+        self.hit_after = hit_after
+        self.threads = set()
+        self.decoded = 0
+
+    def create_stream(self):
+        return _FakeStream()
+
+    def is_ready(self, stream):
+        self.threads.add(threading.current_thread().name)
+        return stream.pending > 0
+
+    def decode_stream(self, stream):
+        stream.pending -= 1
+        self.decoded += 1
+
+    def get_result(self, stream):
+        if self.hit_after and self.decoded >= self.hit_after:
+            return "你好小智"
+        return ""
+
+    def reset_stream(self, stream):
+        stream.pending = 0
+        self.decoded = 0
+
+
+class _BrokenSpotter(_FakeSpotter):
+    """decode_stream 总是失败，模拟 ONNX 推理异常."""
+
+    def __init__(self):
+        super().__init__()
+        self.failures = 0
+
+    def decode_stream(self, stream):
+        self.failures += 1
+        raise RuntimeError("decoder broken")
+
+
+class _FakeCodec:
+    def __init__(self):
+        self.listeners = []
+
+    def add_audio_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_audio_listener(self, listener):
+        self.listeners.remove(listener)
+
+
+def _detector(maxsize: int = 100) -> WakeWordDetector:
+    det = WakeWordDetector()
+    det.enabled = True
+    det._running = True
+    det._audio_queue = queue.Queue(maxsize=maxsize)
+    det._stream = _FakeStream()
+    det._keyword_spotter = _FakeSpotter()
+    return det
+
+
+def _process_next(det):
+    det._process_batch([det._audio_queue.get_nowait()])
+
+
+def test_frame_shared_without_copy_and_returned_after_processing():
+    pool = PcmFramePool()
+    det = _detector()
+
+    frame = pool.acquire(np.full(320, 0.5, dtype=np.float32))
+    det.on_audio_data(frame)
+    frame.release()  # 编解码器侧释放：检测器仍持有
+    assert pool.free_count == 0
+
+    _process_next(det)
+    waveform = det._stream.waveforms[0]
+    assert np.shares_memory(waveform, frame.data)
+    assert not waveform.flags.writeable
+    assert pool.free_count == 1
+
+
+def test_dropped_frames_released_when_queue_full():
+    pool = PcmFramePool()
+    det = _detector(maxsize=2)
+
+    for i in range(5):
+        frame = pool.acquire(np.full(160, i, dtype=np.float32))
+        det.on_audio_data(frame)
+        frame.release()
+
+    # 队列里只剩最新 2 帧；被挤掉的帧已回池并被后续 acquire 复用
+    assert det._audio_queue.qsize() == 2
+    assert det.stats["dropped_frames"] == 3
+    assert pool.allocated == 3
+    assert pool.free_count == 1
+
+    _process_next(det)
+    _process_next(det)
+    assert [float(w[0]) for w in det._stream.waveforms] == [3.0, 4.0]
+    assert pool.free_count == 3
+
+
+@pytest.mark.asyncio
+async def test_inference_runs_off_loop_and_detection_posted_back():
+    loop_thread = threading.current_thread().name
+    pool = PcmFramePool()
+    det = WakeWordDetector()
+    det.enabled = True
+    det._keyword_spotter = _FakeSpotter(hit_after=3)
+    det._detection_cooldown = 0
+
+    detected = asyncio.Event()
+    seen = []
+
+    def on_detected(text, full_text):
+        seen.append((text, threading.current_thread().name))
+        detected.set()
+
+    det.on_detected(on_detected)
+    codec = _FakeCodec()
+    assert await det.start(codec)
+    try:
+        for _ in range(3):
+            frame = pool.acquire(np.zeros(320, dtype=np.float32))
+            det.on_audio_data(frame)
+            frame.release()
+        await asyncio.wait_for(detected.wait(), 2.0)
+    finally:
+        await det.stop()
+
+    assert seen == [("你好小智", loop_thread)]
+    assert det._keyword_spotter.threads == {"kws-inference"}
+    assert codec.listeners == []
+    assert det._thread is None
+    assert pool.free_count == pool.allocated
+
+
+@pytest.mark.asyncio
+async def test_repeated_inference_errors_back_off_then_stop(monkeypatch):
+    monkeypatch.setattr(wake_word_detect, "_ERROR_BACKOFF_S", 0.02)
+    pool = PcmFramePool()
+    det = WakeWordDetector()
+    det.enabled = True
+    spotter = det._keyword_spotter = _BrokenSpotter()
+    errors = []
+    stopped = asyncio.Event()
+
+    def on_error(error):
+        errors.append(error)
+        stopped.set()
+
+    det.on_error = on_error
+    codec = _FakeCodec()
+    assert await det.start(codec)
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    while not stopped.is_set() and loop.time() - t0 < 2.0:
+        frame = pool.acquire(np.zeros(320, dtype=np.float32))
+        det.on_audio_data(frame)
+        frame.release()
+        await asyncio.sleep(0.005)
+    elapsed = loop.time() - t0
+
+    assert stopped.is_set()
+    assert spotter.failures == wake_word_detect._MAX_ERRORS
+    assert str(errors[0]) == "decoder broken"
+    # 每两次失败之间都有退避
+    assert elapsed >= (wake_word_detect._MAX_ERRORS - 1) * 0.02
+    await asyncio.sleep(0.05)
+    assert len(errors) == 1
+    assert not det._running
+    assert codec.listeners == []
+    assert det._thread is None
+    assert det._audio_queue is None
+    assert pool.free_count == pool.allocated
+
+
+def test_backlog_decoded_in_one_accept_waveform():
+    pool = PcmFramePool()
+    det = _detector()
+
+    for i in range(4):
+        frame = pool.acquire(np.full(320, i, dtype=np.float32))
+        det.on_audio_data(frame)
+        frame.release()
+
+    frames = [det._audio_queue.get_nowait() for _ in range(4)]
+    det._process_batch(frames)
+
+    # 一次 accept_waveform 送入 4 帧（按序拼接），is_ready 期间解码 4 次
+    assert len(det._stream.waveforms) == 1
+    assert det._stream.waveforms[0].tolist() == np.repeat([0.0, 1.0, 2.0, 3.0], 320).tolist()
+    assert det._keyword_spotter.decoded == 4
+    assert pool.free_count == pool.allocated
+
+    stats = det.stats
+    assert stats["processed_frames"] == 4
+    assert stats["batches"] == 1
+    assert stats["avg_batch_frames"] == 4.0
+    assert stats["rtf"] > 0
+
+
+def test_energy_gate_skips_silence_and_feeds_preroll_on_onset():
+    pool = PcmFramePool()
+    det = _detector()
+    det._gate = EnergyGate(16000, preroll_ms=40)
+
+    def push(values):
+        for v in values:
+            frame = pool.acquire(np.full(320, v, dtype=np.float32))
+            det.on_audio_data(frame)
+            frame.release()
+        n = det._audio_queue.qsize()
+        det._process_batch([det._audio_queue.get_nowait() for _ in range(n)])
+
+    push([1e-5] * 5)
+    assert det._stream.waveforms == []
+
+    push([1e-5, 0.1])
+    # 预录 2 帧 + 起音帧一次送入
+    assert len(det._stream.waveforms) == 1
+    assert det._stream.waveforms[0].tolist() == np.repeat([1e-5, 1e-5, 0.1], 320).astype(
+        np.float32
+    ).tolist()
+    assert det.stats["processed_frames"] == 7
+    assert det.stats["gate_open_ratio"] == round(1 / 7, 4)
+    assert pool.free_count == pool.allocated
+
+
+def test_model_profile_resolves_variant_files_with_fp32_fallback(tmp_path):
+    for name in ("encoder.onnx", "decoder.onnx", "joiner.onnx", "encoder.int8.onnx", "joiner.int8.onnx"):
+        (tmp_path / name).write_bytes(b"")
+
+    fp32 = resolve_model_files(tmp_path, "fp32")
+    assert {k: p.name for k, p in fp32.items()} == {
+        "encoder": "encoder.onnx",
+        "decoder": "decoder.onnx",
+        "joiner": "joiner.onnx",
+    }
+
+    int8 = resolve_model_files(tmp_path, "int8")
+    assert {k: p.name for k, p in int8.items()} == {
+        "encoder": "encoder.int8.onnx",
+        "decoder": "decoder.onnx",  # 无量化版本，回退 fp32
+        "joiner": "joiner.int8.onnx",
+    }
+
+
+class _DefaultsConfig:
+    def get_config(self, key, default=None):
+        if key == "WAKE_WORD_OPTIONS.USE_WAKE_WORD":
+            return True
+        return default
+
+
+@pytest.mark.asyncio
+async def test_hot_reload_swaps_model_without_stopping_detection(monkeypatch):
+    monkeypatch.setattr(wake_word_detect, "get_config", lambda: _DefaultsConfig())
+    pool = PcmFramePool()
+    det = WakeWordDetector()
+    det.enabled = True
+    det._model_loaded = True
+    old = _FakeSpotter()
+    det._keyword_spotter = old
+    det._loaded_signature = ("old",)
+
+    building = threading.Event()
+    release_build = threading.Event()
+    new = _FakeSpotter()
+
+    def build(model_dir):
+        building.set()
+        release_build.wait(2.0)
+        return new
+
+    monkeypatch.setattr(det, "_build_spotter", build)
+    monkeypatch.setattr(det, "_model_signature", lambda model_dir: ("new",))
+
+    def feed(n):
+        for _ in range(n):
+            frame = pool.acquire(np.full(320, 0.1, dtype=np.float32))
+            det.on_audio_data(frame)
+            frame.release()
+
+    async def drained():
+        while det._audio_queue.qsize():
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+
+    assert await det.start(_FakeCodec())
+    thread = det._thread
+    old_stream = det._stream
+    try:
+        reload_task = asyncio.create_task(det.reload("models/zh"))
+        await asyncio.to_thread(building.wait, 2.0)
+
+        # 新模型构建期间，旧模型照常处理
+        feed(3)
+        await drained()
+        assert old.decoded == 3
+
+        release_build.set()
+        assert await reload_task is True
+        assert det._keyword_spotter is new
+        assert det._stream is not old_stream
+        assert det._thread is thread and thread.is_alive()
+
+        feed(2)
+        await drained()
+        assert new.decoded == 2
+        assert old.decoded == 3
+
+        # 签名未变：不再构建
+        building.clear()
+        assert await det.reload("models/zh") is True
+        assert not building.is_set()
+    finally:
+        await det.stop()
+    assert pool.free_count == pool.allocated
+
+
+class _GateConfig:
+    def __init__(self, open_db=-45):
+        self.values = {
+            "WAKE_WORD_OPTIONS.USE_WAKE_WORD": True,
+            "WAKE_WORD_OPTIONS.ENERGY_GATE": True,
+            "WAKE_WORD_OPTIONS.GATE_OPEN_DB": open_db,
+        }
+
+    def get_config(self, key, default=None):
+        return self.values.get(key, default)
+
+
+@pytest.mark.asyncio
+async def test_hot_reload_keeps_gate_state_unless_gate_options_change(monkeypatch):
+    config = _GateConfig()
+    monkeypatch.setattr(wake_word_detect, "get_config", lambda: config)
+    det = WakeWordDetector()
+    det.enabled = True
+    det._model_loaded = True
+    det._keyword_spotter = _FakeSpotter()
+    det._loaded_signature = ("old",)
+    det._load_config(config)
+    signature = ["old"]
+    monkeypatch.setattr(det, "_model_signature", lambda model_dir: (signature[0],))
+    monkeypatch.setattr(det, "_build_spotter", lambda model_dir: None)
+
+    assert await det.start(_FakeCodec())
+    try:
+        gate = det._gate
+        assert isinstance(gate, EnergyGate)
+
+        # 签名未变：不重建门
+        assert await det.reload("models/zh") is True
+        assert det._gate is gate
+
+        # 构建失败：旧模型与旧门都保留
+        signature[0] = "new"
+        assert await det.reload("models/zh") is False
+        assert det._gate is gate
+
+        # 门参数变化：即使模型未变也替换门
+        signature[0] = "old"
+        config.values["WAKE_WORD_OPTIONS.GATE_OPEN_DB"] = -40
+        assert await det.reload("models/zh") is True
+        assert det._gate is not gate
+        assert det._gate_options["open_db"] == -40.0
+    finally:
+        await det.stop()
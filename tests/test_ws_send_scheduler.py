@@ -0,0 +1,157 @@
+"""WsSendScheduler 回归测试.
+
+覆盖：音频/控制消息同序写出、拥塞时只丢最旧音频帧（JSON 永不丢弃）、
+写出失败回调与挂起控制消息的释放；以及对接本地限速读取的 websockets 服务端，
+验证慢上行下积压有界、控制消息全部按序送达。
+"""
+
+import asyncio
+import json
+
+import pytest
+import websockets
+
+from src.protocols.ws_send_scheduler import WsSendScheduler
+
+
+class _SlowSink:
+    """可暂停的假发送端."""
+
+    def __init__(self):
+        self.sent = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def send(self, payload):
+        await self.gate.wait()
+        self.sent.append(payload)
+
+
+def test_low_water_above_high_rejected():
+    with pytest.raises(ValueError):
+        WsSendScheduler(lambda _: None, high_water=10, low_water=20)
+
+
+def test_fifo_order_between_audio_and_control():
+    async def run():
+        sink = _SlowSink()
+        sched = WsSendScheduler(sink.send)
+        sched.start()
+        sched.enqueue_audio(b"a1")
+        sched.enqueue_audio(b"a2")
+        ok = await sched.send_control('{"type":"listen"}')
+        sched.enqueue_audio(b"a3")
+        await asyncio.sleep(0.01)
+        await sched.stop()
+        return ok, sink.sent, sched.stats()
+
+    ok, sent, stats = asyncio.run(run())
+    assert ok is True
+    assert sent == [b"a1", b"a2", '{"type":"listen"}', b"a3"]
+    assert stats["sent_audio"] == 3 and stats["sent_control"] == 1
+    assert stats["dropped_audio"] == 0
+
+
+def test_congestion_drops_oldest_audio_never_control():
+    async def run():
+        sink = _SlowSink()
+        sink.gate.clear()  # 模拟上行完全阻塞
+        sched = WsSendScheduler(sink.send, high_water=1000, low_water=500)
+        sched.start()
+        await asyncio.sleep(0)
+        control = asyncio.create_task(sched.send_control("ctrl"))
+        for i in range(40):
+            sched.enqueue_audio(bytes([i]) * 100)
+        assert sched.queued_bytes <= 1000 + len("ctrl")
+        stats = sched.stats()
+        sink.gate.set()
+        assert await control is True
+        await asyncio.sleep(0.01)
+        await sched.stop()
+        return sink.sent, stats
+
+    sent, stats = asyncio.run(run())
+    assert "ctrl" in sent
+    assert stats["congestion_events"] >= 1
+    assert stats["dropped_audio"] > 0
+    audio = [p for p in sent if isinstance(p, bytes)]
+    # 保留的是最新的帧，且顺序不变
+    assert audio[-1] == bytes([39]) * 100
+    assert [p[0] for p in audio] == sorted(p[0] for p in audio)
+
+
+def test_send_error_releases_pending_control():
+    errors = []
+
+    async def failing_send(_payload):
+        raise ConnectionResetError("boom")
+
+    async def on_error(exc, is_text):
+        errors.append((type(exc), is_text))
+
+    async def run():
+        sched = WsSendScheduler(failing_send, on_error=on_error)
+        sched.start()
+        sched.enqueue_audio(b"x")
+        result = await sched.send_control("ctrl")
+        await sched.stop()
+        return result, sched.enqueue_audio(b"y")
+
+    result, accepted = asyncio.run(run())
+    assert result is False
+    assert accepted is False
+    assert errors == [(ConnectionResetError, False)]
+
+
+def test_throttled_websocket_server():
+    """服务端暂停读取 → 内核缓冲与传输层写缓冲填满 → 调度器丢最旧音频."""
+    frame = b"\x00" * 2048
+    n_frames = 6000
+
+    async def run():
+        received = []
+        resume = asyncio.Event()
+
+        async def handler(ws):
+            ws.transport.pause_reading()
+            await resume.wait()
+            ws.transport.resume_reading()
+            async for message in ws:
+                received.append(message)
+                if message == '{"type":"done"}':
+                    break
+
+        async with websockets.serve(handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            async with websockets.connect(
+                f"ws://127.0.0.1:{port}", compression=None, proxy=None
+            ) as ws:
+                sched = WsSendScheduler(
+                    ws.send,
+                    buffer_size=ws.transport.get_write_buffer_size,
+                    high_water=256 * 1024,
+                    low_water=128 * 1024,
+                )
+                sched.start()
+                await sched.send_control('{"type":"start"}')
+                for i in range(n_frames):
+                    sched.enqueue_audio(frame)
+                    if i % 100 == 0:
+                        await asyncio.sleep(0)
+                control = asyncio.create_task(sched.send_control('{"type":"done"}'))
+                await asyncio.sleep(0.1)
+                stats = sched.stats()
+                resume.set()
+                assert await asyncio.wait_for(control, 10) is True
+                await asyncio.sleep(0.05)
+                await sched.stop()
+        return received, stats
+
+    received, stats = asyncio.run(run())
+    texts = [m for m in received if isinstance(m, str)]
+    assert texts == ['{"type":"start"}', '{"type":"done"}']
+    assert json.loads(received[-1])["type"] == "done"
+    assert stats["dropped_audio"] > 0
+    assert stats["congestion_events"] >= 1
+    assert stats["queued_bytes"] <= 256 * 1024 + len('{"type":"done"}')
+    assert len(received) - 2 == n_frames - stats["dropped_audio"]